@@ -0,0 +1,82 @@
+"""Compare le chargement des images fichier par fichier avec l'atlas de textures et la carte compilée en cache.
+
+Lancer depuis la racine du dépôt :
+    python benchmarks/bench_atlas.py [repetitions]
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+RACINE = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(RACINE, "src"))
+os.chdir(RACINE)
+
+import pygame
+import pytmx
+
+from atlas import charger_atlas, construire_atlas, finaliser_atlas
+from carte import CHEMIN_CARTE, charger_carte
+from ressources import SPRITES, charger_sprites
+
+
+def chargement_fichiers():
+    """Chargement d'avant l'atlas : un PNG par sprite, tileset entier découpé par pytmx"""
+    charger_sprites()
+    pytmx.load_pygame(CHEMIN_CARTE)
+
+
+def chargement_atlas():
+    """Pages de l'atlas, puis carte compilée dont les tuiles sont prises dans l'atlas"""
+    charger_carte(atlas=charger_atlas())
+
+
+def mesurer(fonction, repetitions):
+    """Temps moyen (ms) et nombre d'images décodées par appel"""
+    chargement_original = pygame.image.load
+    decodages = 0
+
+    def compter(*args, **kwargs):
+        nonlocal decodages
+        decodages += 1
+        return chargement_original(*args, **kwargs)
+
+    pygame.image.load = compter
+    try:
+        debut = time.perf_counter()
+        for _ in range(repetitions):
+            fonction()
+        duree = (time.perf_counter() - debut) * 1000 / repetitions
+    finally:
+        pygame.image.load = chargement_original
+    return duree, decodages // repetitions
+
+
+def main():
+    repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+    pygame.init()
+    pygame.display.set_mode((1280, 960))
+
+    debut = time.perf_counter()
+    atlas = finaliser_atlas(construire_atlas())
+    charger_carte(atlas=atlas)
+    temps_construction = (time.perf_counter() - debut) * 1000
+
+    temps_fichiers, images_fichiers = mesurer(chargement_fichiers, repetitions)
+    temps_atlas, images_atlas = mesurer(chargement_atlas, repetitions)
+
+    print(f"Sprites du jeu              : {len(SPRITES)}")
+    print(f"Images dans l'atlas         : {len(atlas.regions)} sur {len(atlas.pages)} page(s)")
+    print(f"Construction (une fois)     : {temps_construction:.1f} ms")
+    print(f"Fichier par fichier         : {temps_fichiers:.1f} ms, {images_fichiers} images décodées")
+    print(f"Atlas et carte compilée     : {temps_atlas:.1f} ms, {images_atlas} images décodées")
+    print(f"Accélération                : x{temps_fichiers / temps_atlas:.1f}")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Compare le rendu de la carte tuile par tuile avec le fond pré-rendu.
+
+Lancer depuis la racine du dépôt :
+    python benchmarks/bench_carte.py [nombre_de_frames]
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+RACINE = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(RACINE, "src"))
+os.chdir(RACINE)
+
+import pygame
+import pytmx
+
+from carte import FondCarte, dessiner_carte_tuiles
+
+
+def chronometrer(fonction, frames):
+    """Retourne le temps moyen (en ms) d'un appel à fonction"""
+    debut = time.perf_counter()
+    for _ in range(frames):
+        fonction()
+    return (time.perf_counter() - debut) * 1000 / frames
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+
+    pygame.init()
+    ecran = pygame.display.set_mode((1280, 960))
+    carte_tmx = pytmx.load_pygame("assets/maps/niveau1.tmx")
+
+    nb_tuiles = sum(
+        1 for couche in carte_tmx.visible_layers
+        if isinstance(couche, pytmx.TiledTileLayer)
+        for _ in couche.tiles()
+    )
+
+    fond = FondCarte(carte_tmx)
+    debut = time.perf_counter()
+    fond.cuire()
+    temps_cuisson = (time.perf_counter() - debut) * 1000
+
+    temps_tuiles = chronometrer(lambda: dessiner_carte_tuiles(ecran, carte_tmx), frames)
+    temps_fond = chronometrer(lambda: fond.dessiner(ecran), frames)
+
+    print(f"Tuiles dessinées par frame : {nb_tuiles}")
+    print(f"Cuisson du fond (une fois) : {temps_cuisson:.2f} ms")
+    print(f"Tuile par tuile            : {temps_tuiles:.3f} ms/frame")
+    print(f"Fond pré-rendu             : {temps_fond:.3f} ms/frame")
+    print(f"Accélération               : x{temps_tuiles / temps_fond:.1f}")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""Mesure les allocations, la mémoire et les pauses du ramasse-miettes sous une vague à fort renouvellement,
+avec et sans recyclage des entités (pools).
+
+Par défaut le scénario « tempete_particules » de bench_scenarios : 1 000 monstres fragiles tués en
+masse, puis renvoyés, soit des centaines de monstres, projectiles, effets et textes créés et
+détruits chaque seconde.
+
+Lancer depuis la racine du dépôt :
+    python benchmarks/bench_memoire.py [nombre_de_ticks] [scénario]
+"""
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+RACINE = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(RACINE, "src"))
+os.chdir(RACINE)
+
+from carte import charger_carte_logique
+
+from bench_scenarios import SCENARIOS
+
+
+def preparer(scenario, carte_tmx, recyclage):
+    """Partie du scénario, avec ou sans réserves d'entités"""
+    etat = scenario.preparer(carte_tmx)
+    if not recyclage:
+        # Réserves de taille nulle : chaque entité est une nouvelle allocation
+        for pool in pools(etat):
+            pool.capacite = 0
+            pool.vider()
+    return etat
+
+
+def pools(etat):
+    return (etat.pool_monstres, etat.pool_projectiles, etat.pool_effets, etat.pool_textes)
+
+
+def simuler(etat, scenario, ticks):
+    """Fait avancer la partie en relançant les vagues ; retourne les entités allouées à chaque tick"""
+    allocations = np.zeros(ticks, dtype=np.int64)
+    crees = sum(pool.crees for pool in pools(etat))
+    for tick in range(ticks):
+        if not etat.vague_en_cours:
+            scenario.relancer(etat)
+        etat.avancer()
+        total = sum(pool.crees for pool in pools(etat))
+        allocations[tick] = total - crees
+        crees = total
+    return allocations
+
+
+def mesurer(scenario, carte_tmx, recyclage, ticks):
+    """Allocations par tick, temps, pauses du ramasse-miettes et mémoire pour un mode"""
+    # 1. Temps, allocations et pauses du ramasse-miettes
+    etat = preparer(scenario, carte_tmx, recyclage)
+    pauses = []
+    collectes = [0, 0, 0]
+    debut_pause = [0.0]
+
+    def suivre(phase, info):
+        if phase == "start":
+            debut_pause[0] = time.perf_counter()
+        else:
+            pauses.append(time.perf_counter() - debut_pause[0])
+            collectes[info["generation"]] += 1
+
+    gc.collect()
+    gc.callbacks.append(suivre)
+    debut = time.perf_counter()
+    allocations = simuler(etat, scenario, ticks)
+    duree = time.perf_counter() - debut
+    gc.callbacks.remove(suivre)
+
+    # 2. Mémoire (tracemalloc ralentit beaucoup : mesure séparée). La différence entre deux
+    # instantanés, premier et dernier quart de la partie, montre ce qui reste alloué par ligne.
+    etat = preparer(scenario, carte_tmx, recyclage)
+    tracemalloc.start()
+    simuler(etat, scenario, ticks // 4)
+    avant = tracemalloc.take_snapshot()
+    simuler(etat, scenario, ticks - ticks // 4)
+    apres = tracemalloc.take_snapshot()
+    _, pic = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    filtre = [tracemalloc.Filter(True, os.path.join(RACINE, "src", "*"))]
+    ecarts = apres.filter_traces(filtre).compare_to(avant.filter_traces(filtre), 'lineno')
+
+    return {
+        'ticks_par_seconde': ticks / duree,
+        'allocations': allocations,
+        'collectes': collectes,
+        'pause_totale_ms': sum(pauses) * 1000,
+        'pause_max_ms': max(pauses, default=0.0) * 1000,
+        'pic_ko': pic / 1024,
+        'ecarts': [e for e in ecarts if e.count_diff][:5],
+        'reutilises': sum(pool.reutilises for pool in pools(etat)),
+        'kills': etat.kills_total,
+    }
+
+
+def main():
+    ticks = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    nom = sys.argv[2] if len(sys.argv) > 2 else 'tempete_particules'
+    scenario = next(s for s in SCENARIOS if s.nom == nom)
+    carte_tmx = charger_carte_logique()
+
+    for recyclage in (False, True):
+        r = mesurer(scenario, carte_tmx, recyclage, ticks)
+        allocations = r['allocations']
+        print(f"{'Avec pools' if recyclage else 'Sans pools'} ({nom}, {ticks} ticks, {r['kills']} kills)")
+        print(f"  Ticks / seconde      : {r['ticks_par_seconde']:,.0f}")
+        print(f"  Entités allouées     : {allocations.sum()} ({allocations.mean():.2f} par tick, "
+              f"{allocations.max()} max, {np.mean(allocations > 0):.0%} des ticks) ; recyclées : {r['reutilises']}")
+        print(f"  Collectes gen 0/1/2  : {r['collectes'][0]} / {r['collectes'][1]} / {r['collectes'][2]}")
+        print(f"  Pauses GC            : {r['pause_totale_ms']:.2f} ms au total, {r['pause_max_ms']:.3f} ms max")
+        print(f"  Pic mémoire          : {r['pic_ko']:,.0f} Ko")
+        print("  Blocs encore alloués, dernier quart - premier quart :")
+        for ecart in r['ecarts']:
+            cadre = ecart.traceback[0]
+            print(f"    {os.path.basename(cadre.filename)}:{cadre.lineno:<5} {ecart.count_diff:+7} blocs "
+                  f"{ecart.size_diff / 1024:+9.1f} Ko")
+
+
+if __name__ == "__main__":
+    main()
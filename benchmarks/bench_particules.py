@@ -0,0 +1,63 @@
+"""Mesure le coût par frame du système de particules (mise à jour + dessin).
+
+Lancer depuis la racine du dépôt :
+    python benchmarks/bench_particules.py [nombre_de_frames]
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+RACINE = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(RACINE, "src"))
+os.chdir(RACINE)
+
+import pygame
+
+from particules import CacheSpritesParticules, SystemeParticules
+
+DT = 1 / 60
+
+
+def mesurer(ecran, cache, population, frames):
+    """Maintient environ `population` particules vivantes et retourne les ms par frame"""
+    systeme = SystemeParticules(capacite=population * 2, graine=0)
+    # Une gerbe de 20 particules vit ~0.55 s en moyenne : on émet de quoi tenir la population
+    gerbes_par_frame = max(1, round(population * DT / 0.55 / 20))
+
+    for _ in range(60):
+        for _ in range(gerbes_par_frame):
+            systeme.emettre(640, 480, 20)
+        systeme.mettre_a_jour(DT)
+
+    vivantes = 0
+    debut = time.perf_counter()
+    for _ in range(frames):
+        for _ in range(gerbes_par_frame):
+            systeme.emettre(640, 480, 20)
+        systeme.mettre_a_jour(DT)
+        cache.dessiner(ecran, systeme)
+        vivantes += len(systeme)
+    duree = (time.perf_counter() - debut) * 1000 / frames
+    return duree, vivantes // frames
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+
+    pygame.init()
+    ecran = pygame.display.set_mode((1280, 960))
+    cache = CacheSpritesParticules()
+
+    print(f"{'Population':>10} | {'Vivantes':>8} | {'ms/frame':>8}")
+    for population in (500, 2000, 5000, 10000):
+        duree, vivantes = mesurer(ecran, cache, population, frames)
+        print(f"{population:>10} | {vivantes:>8} | {duree:>8.3f}")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
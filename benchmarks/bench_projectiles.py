@@ -0,0 +1,119 @@
+"""Compare la poursuite tick par tick et les impacts planifiés avec plus de 1 000 projectiles en vol.
+
+Les mêmes tirs sont lancés dans les deux modes (2 000 monstres increvables, des tireurs répartis
+sur la carte) : on compare le temps de la phase projectiles et le tick d'impact de chaque tir.
+
+Lancer depuis la racine du dépôt :
+    python benchmarks/bench_projectiles.py [ticks] [tirs par tick]
+"""
+import math
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+RACINE = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(RACINE, "src"))
+os.chdir(RACINE)
+
+from carte import charger_carte_logique
+from chrono import Chronometre, PHASES_SIMULATION
+from simulation import EtatJeu, HAUTEUR, LARGEUR
+
+from bench_scenarios import ajouter_monstres
+
+
+class Tireur:
+    """Source d'un seul tir : note le tick où ses dégâts sont comptés (son impact)"""
+
+    def __init__(self, etat, impacts, numero):
+        self.etat = etat
+        self.impacts = impacts
+        self.numero = numero
+
+    @property
+    def degats_infliges(self):
+        return 0
+
+    @degats_infliges.setter
+    def degats_infliges(self, valeur):
+        self.impacts[self.numero] = self.etat.tick
+
+
+class Batterie:
+    """Fausse tour qui lance `tirs_par_tick` projectiles par tick, depuis des points tirés au hasard"""
+
+    def __init__(self, impacts, tirs_par_tick):
+        self.impacts = impacts
+        self.tirs_par_tick = tirs_par_tick
+        self.rng = random.Random(2)
+        self.tirs = 0
+        self.x, self.y = 0, 0
+        self.dernier_tir = -math.inf
+        self.cadence = 0  # Toujours prête : mettre_a_jour() ne retourne jamais True, elle n'est jamais rendormie
+
+    def mettre_a_jour(self, etat):
+        """Phase des tours : les tirs partent après le déplacement des monstres, comme ceux des vraies tours"""
+        monstres = etat.index_chemin.monstres
+        for _ in range(self.tirs_par_tick):
+            x, y = self.rng.uniform(40, LARGEUR - 40), self.rng.uniform(40, HAUTEUR - 40)
+            projectile = etat.pool_projectiles.acquerir(
+                x, y, self.rng.choice(monstres), 'projectile', 1, source=Tireur(etat, self.impacts, self.tirs))
+            etat.lancer_projectile(projectile)
+            self.tirs += 1
+
+
+def jouer(carte_tmx, impacts_planifies, ticks, tirs_par_tick):
+    """Lance les mêmes tirs que l'autre mode ; retourne (impacts {tir: tick}, chrono, projectiles en vol max, durée)"""
+    etat = EtatJeu(carte_tmx, graine=1, impacts_planifies=impacts_planifies)
+    etat.vie_base = 10 ** 9
+    etat.hero.portee = 0  # Le héros ne tire pas : seuls les tirs du benchmark sont en vol
+    etat.hero.x, etat.hero.y = 100, 800
+    ajouter_monstres(etat, 2000, vie=10 ** 9, vitesse=60)
+    impacts = {}
+    etat.ajouter_tour(Batterie(impacts, tirs_par_tick))
+
+    chrono = Chronometre(PHASES_SIMULATION, capacite=ticks)
+    etat.chrono = chrono
+    en_vol_max = 0
+    debut = time.perf_counter()
+    for _ in range(ticks):
+        etat.avancer()
+        chrono.terminer_frame()
+        en_vol_max = max(en_vol_max, len(etat.liste_projectiles))
+    return impacts, chrono, en_vol_max, time.perf_counter() - debut
+
+
+def main():
+    ticks = int(sys.argv[1]) if len(sys.argv) > 1 else 1200
+    tirs_par_tick = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+
+    carte_tmx = charger_carte_logique()
+    resultats = {}
+    for nom, impacts_planifies in (('poursuite', False), ('planifiés', True)):
+        impacts, chrono, en_vol_max, duree = jouer(carte_tmx, impacts_planifies, ticks, tirs_par_tick)
+        resultats[nom] = impacts
+        projectiles = chrono.statistiques()['projectiles']
+        print(f"▶ {nom:<10} {en_vol_max} projectiles en vol au maximum, {len(impacts)} impacts, "
+              f"{ticks / duree:,.0f} ticks/s")
+        print(f"  phase projectiles : p50 {projectiles['p50']:.3f} ms | p95 {projectiles['p95']:.3f} ms"
+              f" | p99 {projectiles['p99']:.3f} ms")
+
+    # Mêmes tirs, mêmes cibles : seuls les ticks d'impact peuvent différer
+    poursuite, planifies = resultats['poursuite'], resultats['planifiés']
+    communs = sorted(poursuite.keys() & planifies.keys())
+    ecarts = np.array([planifies[tir] - poursuite[tir] for tir in communs])
+    print(f"\nTirs arrivés dans un seul mode : {len(poursuite.keys() ^ planifies.keys())} "
+          f"(en vol à la fin du benchmark)")
+    print(f"Écart de tick d'impact (planifié - poursuite) sur {len(communs)} tirs : "
+          f"moyen {ecarts.mean():+.2f}, min {ecarts.min():+d}, max {ecarts.max():+d}, "
+          f"|écart| <= 1 tick pour {np.mean(np.abs(ecarts) <= 1):.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Enregistre une partie scriptée, la rejoue sans fenêtre et vérifie qu'elle ne diverge pas.
+
+Vérifie aussi un rejeu dont la dernière entrée est notée après le dernier tick (tour posée
+puis fenêtre fermée dans la même frame).
+
+Lancer depuis la racine du dépôt :
+    python benchmarks/bench_rejeu.py [vague max] [graine]
+"""
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+RACINE = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(RACINE, "src"))
+os.chdir(RACINE)
+
+from carte import charger_carte_logique
+from rejeu import Enregistreur, Rejeu, rejouer
+from simulation import EtatJeu
+
+from bench_scenarios import emplacements_tours
+
+
+def jouer(carte_tmx, graine, vague_max):
+    """Partie enregistrée d'un joueur scripté qui pose des tours, lance les vagues et déplace le héros"""
+    rng = random.Random(graine)
+    etat = EtatJeu(carte_tmx, graine=graine)
+    etat.enregistreur = Enregistreur(graine)
+    emplacements = emplacements_tours(etat, 40)
+    direction = (0, 0)
+    while not etat.game_over and etat.vague_actuelle <= vague_max:
+        if etat.argent >= 100 and emplacements:
+            x, y = emplacements.pop(rng.randrange(min(4, len(emplacements))))
+            etat.placer_tour(x, y, rng.choice(['canon', 'laser']))
+        if not etat.vague_en_cours:
+            etat.demarrer_vague()
+        if rng.random() < 0.02:
+            direction = (rng.choice((-1, 0, 1)), rng.choice((-1, 0, 1)))
+        etat.avancer(direction)
+    return etat
+
+
+def verifier(nom, etat, carte_tmx):
+    """Encode le rejeu, le rejoue et affiche le résultat ; retourne True s'il ne diverge pas"""
+    donnees = etat.enregistreur.encoder(etat)
+    rejeu = Rejeu(donnees)
+    debut = time.perf_counter()
+    _, divergence = rejouer(rejeu, carte_tmx)
+    duree = time.perf_counter() - debut
+    resultat = "identique" if divergence is None else f"diverge au tick {divergence}"
+    print(f"{nom:<30} {rejeu.ticks:>7} ticks {len(donnees):>7} octets "
+          f"rejoué en {duree:6.2f} s (x{rejeu.ticks / 60 / duree:,.0f}) : {resultat}")
+    return divergence is None
+
+
+def main():
+    vague_max = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    graine = int(sys.argv[2]) if len(sys.argv) > 2 else 1234
+
+    carte_tmx = charger_carte_logique()
+    debut = time.perf_counter()
+    etat = jouer(carte_tmx, graine, vague_max)
+    print(f"Partie enregistrée en {time.perf_counter() - debut:.2f} s (vague {etat.vague_actuelle})")
+    valides = verifier("partie complète", etat, carte_tmx)
+
+    # Entrées notées après le dernier tick, avant l'encodage
+    etat = EtatJeu(carte_tmx, graine=graine)
+    etat.enregistreur = Enregistreur(graine)
+    (x1, y1), (x2, y2) = emplacements_tours(etat, 2)
+    etat.placer_tour(x1, y1, 'canon')
+    etat.demarrer_vague()
+    for _ in range(300):
+        etat.avancer()
+    etat.placer_tour(x2, y2, 'laser')
+    etat.changer_priorite()
+    valides &= verifier("entrées après le dernier tick", etat, carte_tmx)
+
+    if not valides:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
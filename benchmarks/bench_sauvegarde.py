@@ -0,0 +1,68 @@
+"""Mesure la sauvegarde et le rechargement de l'état complet sur les scénarios de charge.
+
+Lancer depuis la racine du dépôt :
+    python benchmarks/bench_sauvegarde.py [ticks avant la sauvegarde] [répétitions]
+"""
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+RACINE = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(RACINE, "src"))
+os.chdir(RACINE)
+
+from carte import charger_carte_logique
+from rejeu import empreinte_etat
+from sauvegarde import capturer, compresser, ecrire, lire, restaurer
+from simulation import EtatJeu
+
+from bench_scenarios import SCENARIOS
+
+
+def mesurer(fonction, repetitions):
+    """Meilleur temps d'exécution (ms) sur `repetitions` appels, et le dernier résultat"""
+    meilleur = float('inf')
+    for _ in range(repetitions):
+        debut = time.perf_counter()
+        resultat = fonction()
+        meilleur = min(meilleur, time.perf_counter() - debut)
+    return meilleur * 1000, resultat
+
+
+def main():
+    ticks = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    repetitions = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    carte_tmx = charger_carte_logique()
+    chemin = os.path.join(tempfile.mkdtemp(), "bench.sav")
+    print(f"{'scénario':<26} {'entités':>8} {'brut':>9} {'fichier':>9} {'capture':>9} {'écriture':>9} {'chargement':>11}")
+
+    for scenario in SCENARIOS:
+        etat = scenario.preparer(carte_tmx)
+        for _ in range(ticks):
+            if not etat.vague_en_cours:
+                scenario.relancer(etat)
+            etat.avancer()
+        entites = (len(etat.liste_monstres) + len(etat.liste_tours) + len(etat.liste_projectiles)
+                   + len(etat.liste_effets) + len(etat.liste_textes_flottants) + etat.particules.nombre)
+
+        # Thread principal : capture de l'état ; thread d'écriture : compression et disque
+        duree_capture, corps = mesurer(lambda: capturer(etat), repetitions)
+        duree_ecriture, _ = mesurer(lambda: ecrire(chemin, compresser(corps)), repetitions)
+
+        # Rechargement complet depuis le fichier, dans un autre EtatJeu
+        copie = EtatJeu(carte_tmx)
+        duree_chargement, _ = mesurer(lambda: restaurer(copie, lire(chemin)), repetitions)
+        if empreinte_etat(copie) != empreinte_etat(etat):
+            raise AssertionError(f"{scenario.nom} : l'état rechargé diffère de l'état sauvegardé")
+
+        print(f"{scenario.nom:<26} {entites:>8} {len(corps) / 1024:>7.1f}Ko {os.path.getsize(chemin) / 1024:>7.1f}Ko "
+              f"{duree_capture:>7.2f}ms {duree_ecriture:>7.2f}ms {duree_chargement:>9.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
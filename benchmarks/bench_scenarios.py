@@ -0,0 +1,241 @@
+"""Scénarios de charge sur niveau1.tmx : temps par phase (p50/p95/p99) de la simulation et du dessin.
+
+Les résultats sont enregistrés en JSON pour comparer les commits entre eux.
+
+Lancer depuis la racine du dépôt :
+    python benchmarks/bench_scenarios.py [--ticks N] [--scenario NOM] [--sans-rendu]
+                                         [--sortie fichier.json] [--comparer ancien.json]
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+RACINE = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(RACINE, "src"))
+os.chdir(RACINE)
+
+import pygame
+
+from atlas import charger_atlas
+from carte import charger_carte, charger_carte_logique
+from ciblage import intervalles_portee
+from chrono import Chronometre, PHASES_SIMULATION
+from rendu import Rendu
+from simulation import EtatJeu, HAUTEUR, LARGEUR, TYPES_TOURS
+
+from bench_simulation import EMPLACEMENTS_TOURS
+
+PHASES = PHASES_SIMULATION + ('dessin',)
+
+# ========================================
+# PRÉPARATION DES PARTIES
+# ========================================
+
+def emplacements_tours(etat, nombre, pas=28):
+    """Les `nombre` emplacements valides qui couvrent le plus de chemin (grille régulière, hors bandeaux)"""
+    if nombre == 0:
+        return []
+
+    portee = TYPES_TOURS['laser'][1]
+    candidats = []
+    for y in range(100, HAUTEUR - 100, pas):
+        for x in range(40, LARGEUR - 40, pas):
+            if etat.verifier_position_valide(x, y):
+                couverture = sum(fin - debut for debut, fin in intervalles_portee(etat.chemin, x, y, portee))
+                if couverture > 0:
+                    candidats.append((-couverture, x, y))
+    candidats.sort()
+
+    emplacements = []
+    for _, x, y in candidats:
+        # Même règle d'espacement que le jeu (60 px entre deux tours)
+        if all((x - ex) ** 2 + (y - ey) ** 2 >= 60 ** 2 for ex, ey in emplacements):
+            emplacements.append((x, y))
+            if len(emplacements) == nombre:
+                break
+    return emplacements
+
+
+def placer_tours(etat, emplacements):
+    """Place des tours en alternant canon et laser"""
+    for i, (x, y) in enumerate(emplacements):
+        etat.placer_tour(x, y, 'laser' if i % 2 else 'canon')
+
+
+def ajouter_monstres(etat, nombre, vie, vitesse, sprite='monstre_1'):
+    """Ajoute d'un coup `nombre` monstres répartis sur les 9 premiers dixièmes du chemin"""
+    chemin = etat.chemin
+    for i in range(nombre):
+        monstre = etat.pool_monstres.acquerir(chemin, sprite, vitesse, vie)
+        monstre.progres = chemin.longueur * 0.9 * i / nombre
+        monstre.x, monstre.y = chemin.position(monstre.progres)
+        etat.liste_monstres.append(monstre)
+
+    # Vague sans apparition : elle se termine quand tous ces monstres ont disparu
+    etat.monstres_vivants += nombre
+    etat.monstres_par_vague = etat.monstres_envoyes = 0
+    etat.vague_en_cours = True
+
+
+class Scenario:
+    """Partie scriptée : preparer() une fois, relancer() à chaque fin de vague"""
+
+    def __init__(self, nom, description, nb_tours, relancer):
+        self.nom = nom
+        self.description = description
+        self.nb_tours = nb_tours
+        self.relancer = relancer
+
+    def preparer(self, carte_tmx):
+        """Nouvelle partie avec les tours placées, une base inépuisable et le héros hors du chemin"""
+        etat = EtatJeu(carte_tmx, graine=1)
+        etat.argent = 10 ** 9
+        if self.nb_tours == len(EMPLACEMENTS_TOURS):
+            emplacements = EMPLACEMENTS_TOURS
+        else:
+            emplacements = emplacements_tours(etat, self.nb_tours)
+        placer_tours(etat, emplacements)
+        etat.vie_base = 10 ** 9
+        etat.hero.x, etat.hero.y = 100, 800
+        self.relancer(etat)
+        return etat
+
+
+SCENARIOS = [
+    Scenario('reference', "10 tours, vagues normales depuis la vague 1", 10,
+             lambda etat: etat.demarrer_vague()),
+    Scenario('tours_50_monstres_2000', "50 tours contre 2 000 monstres résistants", 50,
+             lambda etat: ajouter_monstres(etat, 2000, vie=3000, vitesse=60)),
+    Scenario('tempete_particules', "30 tours, 1 000 monstres fragiles tués en masse", 30,
+             lambda etat: ajouter_monstres(etat, 1000, vie=1, vitesse=120, sprite='monstre_2')),
+    Scenario('foule_5000', "5 000 monstres sans aucune tour (déplacement et index)", 0,
+             lambda etat: ajouter_monstres(etat, 5000, vie=100, vitesse=90)),
+]
+
+# ========================================
+# MESURE
+# ========================================
+
+def executer(scenario, carte_tmx, rendu, ticks):
+    """Joue le scénario tick par tick (une frame dessinée par tick) et retourne ses statistiques"""
+    etat = scenario.preparer(carte_tmx)
+    chrono = Chronometre(PHASES, capacite=ticks)
+    etat.chrono = chrono
+
+    monstres_max = 0
+    particules_max = 0
+    debut = time.perf_counter()
+    for _ in range(ticks):
+        if not etat.vague_en_cours:
+            scenario.relancer(etat)
+        etat.avancer()
+
+        if rendu is not None:
+            chrono.reprendre()
+            rendu.dessiner_carte()
+            rendu.dessiner_entites(etat, False)
+            rendu.dessiner_interface(etat)
+            pygame.display.flip()
+            chrono.marquer('dessin')
+
+        chrono.terminer_frame()
+        monstres_max = max(monstres_max, len(etat.liste_monstres))
+        particules_max = max(particules_max, len(etat.particules))
+    duree = time.perf_counter() - debut
+
+    return {
+        'description': scenario.description,
+        'ticks': ticks,
+        'duree_s': duree,
+        'tours': len(etat.liste_tours),
+        'monstres_max': monstres_max,
+        'particules_max': particules_max,
+        'kills': etat.kills_total,
+        'phases_ms': chrono.statistiques(),
+    }
+
+
+def version_code():
+    """Commit courant (pour comparer les résultats entre commits)"""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "inconnu"
+
+
+def afficher(nom, resultat, reference=None):
+    """Tableau des phases d'un scénario (avec l'écart au fichier de comparaison s'il y en a un)"""
+    print(f"\n▶ {nom} : {resultat['description']}")
+    print(f"  {resultat['tours']} tours, jusqu'à {resultat['monstres_max']} monstres et "
+          f"{resultat['particules_max']} particules, {resultat['kills']} kills")
+    print(f"  {'phase':<12} {'p50':>8} {'p95':>8} {'p99':>8}  (ms)")
+    for phase, stats in resultat['phases_ms'].items():
+        ligne = f"  {phase:<12} {stats['p50']:8.3f} {stats['p95']:8.3f} {stats['p99']:8.3f}"
+        if reference is not None and phase in reference['phases_ms']:
+            ancien = reference['phases_ms'][phase]['p95']
+            if ancien > 0:
+                ligne += f"   p95 {100 * (stats['p95'] - ancien) / ancien:+.0f}%"
+        print(ligne)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ticks", type=int, default=1200, help="ticks (et frames) par scénario")
+    parser.add_argument("--scenario", action="append", choices=[s.nom for s in SCENARIOS],
+                        help="scénario à lancer (plusieurs fois possible, tous par défaut)")
+    parser.add_argument("--sans-rendu", action="store_true", help="mesurer la simulation seule")
+    parser.add_argument("--sortie", help="fichier JSON (par défaut benchmarks/resultats/<commit>.json)")
+    parser.add_argument("--comparer", help="résultats JSON d'un autre commit à comparer")
+    args = parser.parse_args()
+
+    pygame.init()
+    ecran = pygame.display.set_mode((LARGEUR, HAUTEUR))
+    if args.sans_rendu:
+        carte_tmx = charger_carte_logique()
+        rendu = None
+    else:
+        atlas = charger_atlas()
+        carte_tmx = charger_carte(atlas=atlas)
+        rendu = Rendu(ecran, atlas, carte_tmx)
+
+    reference = None
+    if args.comparer:
+        with open(args.comparer, encoding="utf-8") as fichier:
+            reference = json.load(fichier)['scenarios']
+
+    commit = version_code()
+    rapport = {
+        'commit': commit,
+        'date': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'python': platform.python_version(),
+        'pygame': pygame.version.ver,
+        'rendu': not args.sans_rendu,
+        'scenarios': {},
+    }
+
+    for scenario in SCENARIOS:
+        if args.scenario and scenario.nom not in args.scenario:
+            continue
+        resultat = executer(scenario, carte_tmx, rendu, args.ticks)
+        rapport['scenarios'][scenario.nom] = resultat
+        afficher(scenario.nom, resultat, reference.get(scenario.nom) if reference else None)
+
+    sortie = args.sortie or os.path.join("benchmarks", "resultats", f"{commit}.json")
+    os.makedirs(os.path.dirname(sortie) or ".", exist_ok=True)
+    with open(sortie, "w", encoding="utf-8") as fichier:
+        json.dump(rapport, fichier, indent=2, ensure_ascii=False)
+    print(f"\n💾 Résultats enregistrés dans {sortie}")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
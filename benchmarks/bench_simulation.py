@@ -0,0 +1,50 @@
+"""Mesure la vitesse de la simulation sans fenêtre ni son.
+
+Lancer depuis la racine du dépôt :
+    python benchmarks/bench_simulation.py [nombre_de_ticks]
+"""
+import os
+import sys
+import time
+
+RACINE = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(RACINE, "src"))
+os.chdir(RACINE)
+
+from simulation import EtatJeu
+
+# Emplacements de tours le long du chemin (hors de la route)
+EMPLACEMENTS_TOURS = [
+    (250, 320), (400, 320), (560, 60), (770, 300), (510, 400),
+    (770, 500), (510, 600), (860, 630), (1050, 630), (870, 900),
+]
+
+
+def main():
+    ticks = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+    etat = EtatJeu(graine=1)
+    etat.argent = 10000
+    for x, y in EMPLACEMENTS_TOURS:
+        if etat.verifier_position_valide(x, y):
+            etat.placer_tour(x, y, 'laser')
+
+    # Éloigner le héros du chemin pour qu'il survive
+    etat.hero.x, etat.hero.y = 100, 800
+
+    debut = time.perf_counter()
+    for _ in range(ticks):
+        if not etat.vague_en_cours:
+            etat.demarrer_vague()
+        etat.avancer()
+        if etat.game_over:
+            break
+    duree = time.perf_counter() - debut
+
+    print(f"Ticks simulés   : {etat.tick}")
+    print(f"Ticks / seconde : {etat.tick / duree:,.0f}")
+    print(f"Vague atteinte  : {etat.vague_actuelle} | Kills : {etat.kills_total} | Vie base : {etat.vie_base}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Compare un Sound.play() par événement avec le gestionnaire de voix, sur une partie chargée jouée en temps réel.
+
+Scénario « tempete_particules » : tirs, impacts et morts en masse, donc des explosions. Le coût du
+mixage suit le nombre de voix qui jouent en même temps : on compte à chaque frame les canaux du
+mixer occupés, à côté des demandes fusionnées et abandonnées.
+
+Lancer depuis la racine du dépôt :
+    python benchmarks/bench_sons.py [secondes]
+"""
+import os
+import sys
+
+import numpy as np
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+RACINE = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(RACINE, "src"))
+os.chdir(RACINE)
+
+import pygame
+
+from carte import charger_carte_logique
+from sons import GROUPES, SONS, GestionnaireSons, lire_sons
+
+from bench_scenarios import SCENARIOS
+
+# Canaux laissés au chemin direct : assez pour qu'il ne soit presque jamais à court de voix
+CANAUX_DIRECT = 64
+
+
+def voix_actives():
+    """Nombre de canaux du mixer qui jouent un son en ce moment"""
+    return sum(pygame.mixer.Channel(i).get_busy() for i in range(pygame.mixer.get_num_channels()))
+
+
+def jouer_partie(carte_tmx, secondes, jouer):
+    """Joue le scénario à 60 FPS ; retourne (voix actives à chaque frame, kills)"""
+    scenario = next(s for s in SCENARIOS if s.nom == 'tempete_particules')
+    etat = scenario.preparer(carte_tmx)
+    horloge = pygame.time.Clock()
+    frames = int(secondes * 60)
+    voix = np.zeros(frames, dtype=np.int32)
+    for frame in range(frames):
+        if not etat.vague_en_cours:
+            scenario.relancer(etat)
+        etat.avancer()
+        jouer(etat.sons)
+        voix[frame] = voix_actives()
+        horloge.tick(60)
+    return voix, etat.kills_total
+
+
+def afficher_voix(titre, voix, kills):
+    print(f"{titre} ({kills} kills) : voix simultanées p50 {np.median(voix):.0f}, "
+          f"moyenne {voix.mean():.1f}, max {voix.max()}")
+
+
+def main():
+    secondes = float(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    pygame.mixer.init()
+    carte_tmx = charger_carte_logique()
+    decodes = lire_sons()
+
+    # Avant : un Sound.play() par événement, sur n'importe quel canal libre
+    pygame.mixer.set_num_channels(CANAUX_DIRECT)
+    for nom, (_, volume, _, _, _) in SONS.items():
+        decodes[nom].set_volume(volume)
+    demandes = dict.fromkeys(decodes, 0)
+    joues = dict.fromkeys(decodes, 0)
+
+    def jouer_direct(noms):
+        for nom in noms:
+            demandes[nom] += 1
+            if decodes[nom].play() is not None:
+                joues[nom] += 1
+
+    voix_direct, kills = jouer_partie(carte_tmx, secondes, jouer_direct)
+    pygame.mixer.stop()
+    for son in decodes.values():
+        son.set_volume(1.0)  # Le gestionnaire règle le volume par canal
+
+    gestionnaire = GestionnaireSons(decodes=decodes)
+    voix_gestionnaire, kills_gestionnaire = jouer_partie(
+        carte_tmx, secondes, lambda noms: gestionnaire.jouer(noms, pygame.time.get_ticks() / 1000))
+
+    afficher_voix(f"Un play() par événement ({CANAUX_DIRECT} canaux)", voix_direct, kills)
+    for nom in decodes:
+        print(f"  {nom:<10} {demandes[nom]:6d} demandes, {joues[nom]:6d} joués, "
+              f"{demandes[nom] - joues[nom]:6d} sans canal libre")
+    afficher_voix(f"Gestionnaire de voix ({sum(GROUPES.values())} canaux réservés)", voix_gestionnaire, kills_gestionnaire)
+    for nom, stats in gestionnaire.statistiques().items():
+        print(f"  {nom:<10} {stats['demandes']:6d} demandes, {stats['joues']:6d} joués, "
+              f"{stats['fusionnes']:6d} fusionnés, {stats['abandonnes']:6d} abandonnés")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
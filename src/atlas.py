@@ -0,0 +1,203 @@
+import json
+import os
+
+import pygame
+import pytmx
+
+from carte import CHEMIN_CARTE
+from carte_compilee import chargeur_pixels
+from ressources import SPRITES, charger_sprite
+
+# ========================================
+# ATLAS DE TEXTURES
+# ========================================
+
+DOSSIER_ATLAS = os.path.join("cache", "atlas")
+FICHIER_INDEX = "atlas.json"
+VERSION_ATLAS = 1  # À incrémenter quand le format de l'index change
+
+TAILLE_PAGE = 2048
+MARGE = 1  # Pixels vides entre deux images
+
+
+def empaqueter(tailles, largeur=TAILLE_PAGE, hauteur=TAILLE_PAGE, marge=MARGE):
+    """Range les images par étagères, les plus hautes d'abord
+
+    tailles : {nom: (largeur, hauteur)} ; retourne ({nom: (page, x, y)}, nombre de pages).
+    """
+    placements = {}
+    page, x, y, hauteur_etagere = 0, 0, 0, 0
+    for nom, (l, h) in sorted(tailles.items(), key=lambda item: (-item[1][1], -item[1][0], item[0])):
+        if l > largeur or h > hauteur:
+            raise ValueError(f"{nom} ({l}x{h}) ne tient pas dans une page de {largeur}x{hauteur}")
+        if x + l > largeur:
+            # Étagère suivante
+            x, y, hauteur_etagere = 0, y + hauteur_etagere + marge, 0
+        if y + h > hauteur:
+            # Page suivante
+            page, x, y, hauteur_etagere = page + 1, 0, 0, 0
+        placements[nom] = (page, x, y)
+        x += l + marge
+        hauteur_etagere = max(hauteur_etagere, h)
+    return placements, (page + 1 if placements else 0)
+
+
+class Atlas:
+    """Sprites et tuiles rangés dans quelques grandes surfaces : nom -> (page, zone source)"""
+
+    def __init__(self, pages, zones):
+        self.pages = pages
+        # Nom -> (surface de la page, zone) : on blitte la page avec la zone comme rect source
+        self.regions = {nom: (pages[page], pygame.Rect(zone)) for nom, (page, zone) in zones.items()}
+        # Nom -> sous-surface (sans copie) pour ce qui veut une vraie surface : fondus, tailles
+        self.sprites = {nom: page.subsurface(zone) for nom, (page, zone) in self.regions.items()}
+
+    def __contains__(self, nom):
+        return nom in self.regions
+
+    def __getitem__(self, nom):
+        return self.sprites[nom]
+
+    def dessiner(self, ecran, nom, centre):
+        """Blitte l'image centrée sur `centre` ; retourne la zone de l'écran couverte"""
+        page, zone = self.regions[nom]
+        rect = zone.copy()
+        rect.center = centre
+        ecran.blit(page, rect, zone)
+        return rect
+
+
+# ========================================
+# CONSTRUCTION ET CACHE SUR DISQUE
+# ========================================
+
+def fichier_sprite(fichier):
+    return os.path.join("assets", "sprites", fichier)
+
+
+def signature_sources(fichiers):
+    """Date de modification et taille de chaque source (un stat par fichier, aucune lecture)"""
+    signature = []
+    for fichier in fichiers:
+        try:
+            infos = os.stat(fichier)
+            signature.append([fichier, infos.st_mtime_ns, infos.st_size])
+        except FileNotFoundError:
+            signature.append([fichier, None, None])
+    return signature
+
+
+def description_sprites():
+    """Sprites attendus (nom, fichier, taille) : un sprite ajouté ou redimensionné refait l'atlas"""
+    return [[nom, fichier, list(taille) if taille else None] for nom, (fichier, taille) in sorted(SPRITES.items())]
+
+
+def rgba(image):
+    """Copie 32 bits RGBA de l'image, sans passer par le format d'affichage"""
+    return pygame.image.frombytes(pygame.image.tobytes(image, "RGBA"), image.get_size(), "RGBA")
+
+
+def copier(page, image, position):
+    """Copie une image telle quelle (alpha compris) dans une page transparente"""
+    page.blit(rgba(image), position, special_flags=pygame.BLEND_RGBA_MAX)
+
+
+def construire_atlas(chemin_carte=CHEMIN_CARTE, dossier=DOSSIER_ATLAS):
+    """Charge chaque sprite et chaque tuile utilisée par la carte, les range en pages et les enregistre
+
+    Aucune conversion au format d'affichage : possible dans le thread de chargement.
+    Retourne (pages, zones) comme lire_atlas.
+    """
+    images = {nom: charger_sprite(fichier, taille, convertir=False) for nom, (fichier, taille) in SPRITES.items()}
+    sources = [fichier_sprite(fichier) for fichier, _ in SPRITES.values()]
+
+    # Tuiles : pytmx ne demande que celles que la carte utilise, on les enregistre au passage
+    def enregistreur(fichier, colorkey, **kwargs):
+        chargeur = chargeur_pixels(fichier, colorkey, **kwargs)
+        sources.append(os.path.normpath(fichier))
+
+        def charger(rect=None, flags=None):
+            resultat = chargeur(rect, None)
+            if rect:
+                nom, pixels = resultat
+                images[nom] = pygame.image.frombuffer(pixels, pixels.shape[1::-1], "RGBA").copy()
+            return chargeur(rect, flags) if flags else resultat
+
+        return charger
+
+    pytmx.TiledMap(chemin_carte, image_loader=enregistreur)
+    sources.append(chemin_carte)
+
+    placements, nb_pages = empaqueter({nom: image.get_size() for nom, image in images.items()})
+    pages = [pygame.Surface((TAILLE_PAGE, TAILLE_PAGE), pygame.SRCALPHA) for _ in range(nb_pages)]
+    zones = {}
+    for nom, (page, x, y) in placements.items():
+        copier(pages[page], images[nom], (x, y))
+        zones[nom] = (page, (x, y) + images[nom].get_size())
+
+    # Pages recadrées sur leur contenu pour des fichiers plus petits
+    for i, page in enumerate(pages):
+        bas = max(y + h for p, (x, y, l, h) in zones.values() if p == i)
+        pages[i] = page.subsurface((0, 0, TAILLE_PAGE, bas)).copy()
+
+    os.makedirs(dossier, exist_ok=True)
+    fichiers_pages = []
+    for i, page in enumerate(pages):
+        fichier_page = f"page_{i}.png"
+        pygame.image.save(page, os.path.join(dossier, fichier_page))
+        fichiers_pages.append(fichier_page)
+
+    index = {
+        'version': VERSION_ATLAS,
+        'sprites': description_sprites(),
+        'sources': signature_sources(sources),
+        'pages': fichiers_pages,
+        'zones': zones,
+    }
+    with open(os.path.join(dossier, FICHIER_INDEX), "w", encoding="utf-8") as fichier:
+        json.dump(index, fichier)
+
+    return pages, zones
+
+
+def lire_index(dossier):
+    """Index de l'atlas enregistré, ou None s'il manque, est illisible ou n'est plus à jour"""
+    try:
+        with open(os.path.join(dossier, FICHIER_INDEX), encoding="utf-8") as fichier:
+            index = json.load(fichier)
+    except (OSError, ValueError):
+        return None
+
+    if index.get('version') != VERSION_ATLAS or index.get('sprites') != description_sprites():
+        return None
+    fichiers = [source for source, _, _ in index['sources']]
+    if signature_sources(fichiers) != index['sources']:
+        return None
+    return index
+
+
+def lire_atlas(chemin_carte=CHEMIN_CARTE, dossier=DOSSIER_ATLAS):
+    """Lit et décode les pages du cache sans les convertir (possible hors du thread principal)
+
+    Reconstruit l'atlas si le cache manque ou n'est plus à jour. Retourne (pages, zones).
+    """
+    index = lire_index(dossier)
+    if index is not None:
+        try:
+            pages = [pygame.image.load(os.path.join(dossier, fichier)) for fichier in index['pages']]
+            return pages, index['zones']
+        except (OSError, pygame.error):
+            pass
+    print("🧩 Construction de l'atlas de textures...")
+    return construire_atlas(chemin_carte, dossier)
+
+
+def finaliser_atlas(lu):
+    """Convertit au format d'affichage les pages lues par lire_atlas (thread principal)"""
+    pages, zones = lu
+    return Atlas([page.convert_alpha() for page in pages], zones)
+
+
+def charger_atlas(chemin_carte=CHEMIN_CARTE, dossier=DOSSIER_ATLAS):
+    """Atlas depuis le cache (un fichier par page), reconstruit si une source a changé"""
+    return finaliser_atlas(lire_atlas(chemin_carte, dossier))
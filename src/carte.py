@@ -0,0 +1,109 @@
+import pygame
+import pytmx
+
+from carte_compilee import CoucheTuiles, charger_carte_compilee
+
+# ========================================
+# RENDU DE LA CARTE
+# ========================================
+
+def couches_tuiles(carte_tmx):
+    """Couches de tuiles visibles (carte pytmx ou carte compilée)"""
+    return [couche for couche in carte_tmx.visible_layers if isinstance(couche, (pytmx.TiledTileLayer, CoucheTuiles))]
+
+
+def dessiner_carte_tuiles(ecran, carte_tmx):
+    """Dessine toutes les couches de la carte tuile par tuile (lent, une blit par tuile)"""
+    for couche in couches_tuiles(carte_tmx):
+        for x, y, image in couche.tiles():
+            pos_x = x * carte_tmx.tilewidth
+            pos_y = y * carte_tmx.tileheight
+            ecran.blit(image, (pos_x, pos_y))
+
+
+class FondCarte:
+    """Fond de carte pré-rendu : toutes les couches de tuiles cuites dans une seule surface"""
+
+    def __init__(self, carte_tmx):
+        self.carte_tmx = carte_tmx
+        self.surface = None
+        self.signature = None
+
+    def signature_couches(self):
+        """Résumé des couches visibles (détecte l'ajout, le retrait ou le masquage d'une couche)"""
+        return tuple(
+            (id(couche), couche.name, getattr(couche, 'opacity', 1.0))
+            for couche in couches_tuiles(self.carte_tmx)
+        )
+
+    def cuire(self):
+        """Dessine une seule fois toutes les couches dans une surface au format de l'écran"""
+        largeur = self.carte_tmx.width * self.carte_tmx.tilewidth
+        hauteur = self.carte_tmx.height * self.carte_tmx.tileheight
+        surface = pygame.Surface((largeur, hauteur))
+        dessiner_carte_tuiles(surface, self.carte_tmx)
+
+        # Conversion au format de l'écran pour des blits rapides
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+
+        self.surface = surface
+        self.signature = self.signature_couches()
+        return surface
+
+    def obtenir_surface(self):
+        """Retourne le fond cuit, en le reconstruisant si une couche a changé"""
+        if self.surface is None or self.signature != self.signature_couches():
+            self.cuire()
+        return self.surface
+
+    def dessiner(self, ecran):
+        """Dessine la carte entière en une seule blit"""
+        ecran.blit(self.obtenir_surface(), (0, 0))
+
+
+# ========================================
+# DONNÉES DE LA CARTE
+# ========================================
+
+CHEMIN_CARTE = "assets/maps/niveau1.tmx"
+
+
+def charger_carte(chemin=CHEMIN_CARTE, atlas=None):
+    """Charge la carte depuis son cache compilé, tuiles comprises (la fenêtre doit exister)"""
+    return charger_carte_compilee(chemin, atlas=atlas)
+
+
+def charger_carte_logique(chemin=CHEMIN_CARTE):
+    """Charge la carte sans ses images (utilisable sans fenêtre)"""
+    return charger_carte_compilee(chemin, images=False)
+
+
+def obtenir_points_speciaux(carte_tmx):
+    """Récupère les points d'entrée et de sortie"""
+    points = {}
+    for obj in carte_tmx.objects:
+        if hasattr(obj, 'properties') and 'point_type' in obj.properties:
+            if obj.properties['point_type'] == "entree":
+                points['entree'] = (obj.x, obj.y)
+            elif obj.properties['point_type'] == "sortie":
+                points['sortie'] = (obj.x, obj.y)
+    return points
+
+
+def creer_chemin_manuel(carte_tmx):
+    """Définit le chemin que suivront les monstres"""
+    pts = obtenir_points_speciaux(carte_tmx)
+    chemin = [
+        pts['entree'],
+        (250, 190),
+        (520, 190),
+        (650, 280),
+        (650, 500),
+        (650, 700),
+        (750, 760),
+        (980, 760),
+        (1110, 760),
+        pts['sortie']
+    ]
+    return chemin
@@ -0,0 +1,274 @@
+import hashlib
+import io
+import json
+import os
+import xml.etree.ElementTree as ElementTree
+
+import numpy as np
+import pygame
+import pytmx
+
+# ========================================
+# CARTE COMPILÉE
+# ========================================
+
+DOSSIER_CARTES = os.path.join("cache", "cartes")
+VERSION_CARTE = 1  # À incrémenter quand le format du fichier compilé change
+
+
+def nom_tuile(fichier_image, rect):
+    """Nom d'une tuile Tiled : image du tileset et position dans cette image"""
+    x, y = rect[0], rect[1]
+    return f"tuile:{os.path.basename(fichier_image)}:{x},{y}"
+
+
+class CoucheTuiles:
+    """Couche de tuiles compilée : grille d'indices (-1 : case vide) vers les images de la carte"""
+
+    def __init__(self, name, visible, opacity, grille, images):
+        self.name = name
+        self.visible = visible
+        self.opacity = opacity
+        self.grille = grille
+        # Cases non vides précalculées : tiles() ne parcourt pas la grille à chaque appel
+        lignes, colonnes = np.nonzero(grille >= 0)
+        self.cases = [(x, y, images[i]) for y, x, i in zip(lignes.tolist(), colonnes.tolist(), grille[lignes, colonnes].tolist())]
+
+    def tiles(self):
+        """(x, y, image) de chaque case non vide, comme pytmx.TiledTileLayer.tiles()"""
+        return iter(self.cases)
+
+
+class ObjetCarte:
+    """Objet d'un calque d'objets Tiled (points d'entrée/sortie...)"""
+
+    def __init__(self, name, type, x, y, width, height, properties):
+        self.name = name
+        self.type = type
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.properties = properties
+
+
+class CarteCompilee:
+    """Carte chargée depuis le cache compilé, avec la partie de l'interface de pytmx.TiledMap utilisée par le jeu"""
+
+    def __init__(self, meta, grilles, images, routes=None):
+        self.filename = meta['source']
+        self.width = meta['largeur']
+        self.height = meta['hauteur']
+        self.tilewidth = meta['largeur_tuile']
+        self.tileheight = meta['hauteur_tuile']
+        self.images = images
+        self.routes = routes  # Pixels occupés de chaque tuile (placement des tours)
+        self.layers = [
+            CoucheTuiles(couche['nom'], couche['visible'], couche['opacite'], grille, images)
+            for couche, grille in zip(meta['couches'], grilles)
+        ]
+        self.objects = [ObjetCarte(**objet) for objet in meta['objets']]
+
+    @property
+    def visible_layers(self):
+        return (couche for couche in self.layers if couche.visible)
+
+# ========================================
+# COMPILATION
+# ========================================
+
+def chargeur_pixels(fichier, colorkey, **kwargs):
+    """Chargeur d'images pour pytmx qui rend des tableaux RGBA (aucune fenêtre nécessaire)
+
+    Même résultat que le chargeur pygame de pytmx : avec une couleur transparente, l'alpha du
+    PNG est ignoré et seuls les pixels de cette couleur deviennent transparents.
+    """
+    image = pygame.image.load(fichier)
+    pixels = np.frombuffer(pygame.image.tobytes(image, "RGBA"), np.uint8).reshape(image.get_height(), image.get_width(), 4)
+    cle = tuple(pygame.Color(f"#{colorkey}"))[:3] if colorkey else None
+
+    def charger(rect=None, flags=None):
+        x, y, largeur, hauteur = rect or (0, 0, image.get_width(), image.get_height())
+        tuile = pixels[y:y + hauteur, x:x + largeur].copy()
+        if cle is not None:
+            tuile[..., 3] = np.where((tuile[..., :3] == cle).all(axis=2), 0, 255)
+        nom = nom_tuile(fichier, (x, y))
+        # Mêmes transformations que pytmx.util_pygame.handle_transformation
+        if flags and flags.flipped_diagonally:
+            tuile = tuile.transpose(1, 0, 2)
+        if flags and flags.flipped_horizontally:
+            tuile = tuile[:, ::-1]
+        if flags and flags.flipped_vertically:
+            tuile = tuile[::-1]
+        if flags and (flags.flipped_diagonally or flags.flipped_horizontally or flags.flipped_vertically):
+            nom = None  # Tuile retournée : elle n'existe pas telle quelle dans l'atlas
+        return nom, np.ascontiguousarray(tuile)
+
+    return charger
+
+
+def fichiers_sources(chemin):
+    """La carte et ses tilesets externes (.tsx) ; les images sont ajoutées à la compilation"""
+    sources = [chemin]
+    for tileset in ElementTree.parse(chemin).getroot().iter('tileset'):
+        if 'source' in tileset.attrib:
+            sources.append(os.path.normpath(os.path.join(os.path.dirname(chemin), tileset.attrib['source'])))
+    return sources
+
+
+def empreinte(fichier):
+    """Date de modification, taille et SHA-1 du fichier"""
+    infos = os.stat(fichier)
+    with open(fichier, "rb") as contenu:
+        return [fichier, infos.st_mtime_ns, infos.st_size, hashlib.sha1(contenu.read()).hexdigest()]
+
+
+def compiler_carte(chemin):
+    """Lit la carte Tiled et ne garde que les grilles d'indices, les objets et les tuiles utilisées"""
+    carte = pytmx.TiledMap(chemin, image_loader=chargeur_pixels)
+
+    sources = fichiers_sources(chemin)
+    for tileset in carte.tilesets:
+        if tileset.source is not None:
+            image = os.path.normpath(os.path.join(os.path.dirname(chemin), tileset.source))
+            if image not in sources:
+                sources.append(image)
+
+    # Numérotation locale des seules tuiles présentes dans les couches
+    couches = [couche for couche in carte.layers if isinstance(couche, pytmx.TiledTileLayer)]
+    gids = sorted({gid for couche in couches for ligne in couche.data for gid in ligne if gid})
+    rang = {gid: i for i, gid in enumerate(gids)}
+    grilles = np.array(
+        [[[rang[gid] if gid else -1 for gid in ligne] for ligne in couche.data] for couche in couches],
+        dtype=np.int16,
+    ).reshape(len(couches), carte.height, carte.width)
+
+    noms = [carte.images[gid][0] for gid in gids]
+    tuiles = np.array([carte.images[gid][1] for gid in gids], dtype=np.uint8).reshape(len(gids), carte.tileheight, carte.tilewidth, 4)
+
+    objets = [
+        {'name': objet.name, 'type': objet.type, 'x': objet.x, 'y': objet.y,
+         'width': objet.width, 'height': objet.height, 'properties': dict(objet.properties)}
+        for objet in carte.objects
+    ]
+
+    meta = {
+        'version': VERSION_CARTE,
+        'source': chemin,
+        'sources': [empreinte(fichier) for fichier in sources],
+        'largeur': carte.width,
+        'hauteur': carte.height,
+        'largeur_tuile': carte.tilewidth,
+        'hauteur_tuile': carte.tileheight,
+        'couches': [{'nom': couche.name, 'visible': bool(couche.visible), 'opacite': couche.opacity} for couche in couches],
+        'objets': objets,
+        'noms_tuiles': noms,
+    }
+    return meta, grilles, tuiles
+
+# ========================================
+# CACHE SUR DISQUE
+# ========================================
+
+def fichier_cache(chemin, dossier=DOSSIER_CARTES):
+    return os.path.join(dossier, os.path.splitext(os.path.basename(chemin))[0] + ".carte")
+
+
+def enregistrer(fichier, meta, grilles, tuiles):
+    """Écrit la carte compilée (format .npz non compressé), de façon atomique"""
+    os.makedirs(os.path.dirname(fichier) or ".", exist_ok=True)
+    tampon = io.BytesIO()
+    np.savez(tampon, meta=np.frombuffer(json.dumps(meta).encode("utf-8"), np.uint8), grilles=grilles, tuiles=tuiles)
+    temporaire = f"{fichier}.{os.getpid()}.tmp"
+    with open(temporaire, "wb") as sortie:
+        sortie.write(tampon.getvalue())
+    # Plusieurs processus peuvent compiler en même temps : le dernier remplace le fichier en entier
+    os.replace(temporaire, fichier)
+
+
+def lire(fichier):
+    """(meta, grilles, tuiles) du fichier compilé, ou None s'il manque ou est illisible"""
+    try:
+        with np.load(fichier) as contenu:
+            meta = json.loads(contenu['meta'].tobytes().decode("utf-8"))
+            return meta, contenu['grilles'], contenu['tuiles']
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def sources_a_jour(meta):
+    """Compare chaque source à son empreinte : date et taille d'abord, SHA-1 seulement si la date a changé
+
+    Retourne (à jour, empreintes changées de date mais pas de contenu).
+    """
+    retouchees = False
+    for fichier, mtime, taille, sha1 in meta['sources']:
+        try:
+            infos = os.stat(fichier)
+        except FileNotFoundError:
+            return False, False
+        if infos.st_mtime_ns == mtime and infos.st_size == taille:
+            continue
+        if infos.st_size != taille or empreinte(fichier)[3] != sha1:
+            return False, False
+        retouchees = True
+    return True, retouchees
+
+
+def creer_images(meta, tuiles, atlas=None):
+    """Surfaces des tuiles : prises dans l'atlas quand il les contient, sinon créées depuis les pixels"""
+    convertir = pygame.display.get_surface() is not None
+    images = []
+    for nom, pixels in zip(meta['noms_tuiles'], tuiles):
+        if atlas is not None and nom in atlas:
+            images.append(atlas[nom])
+            continue
+        image = pygame.image.frombuffer(pixels.tobytes(), (pixels.shape[1], pixels.shape[0]), "RGBA")
+        images.append(image.convert_alpha() if convertir else image.copy())
+    return images
+
+
+def lire_carte_compilee(chemin, dossier=DOSSIER_CARTES):
+    """(meta, grilles, tuiles) depuis le cache, recompilé si la carte ou un tileset a changé
+
+    Aucune surface n'est créée : utilisable hors du thread principal et sans fenêtre.
+    """
+    fichier = fichier_cache(chemin, dossier)
+    compilee = lire(fichier)
+    if compilee is not None and compilee[0].get('version') == VERSION_CARTE and compilee[0].get('source') == chemin:
+        a_jour, retouchees = sources_a_jour(compilee[0])
+        if not a_jour:
+            compilee = None
+        elif retouchees:
+            # Fichier enregistré à nouveau sans changement : on retient les nouvelles dates
+            meta = compilee[0]
+            meta['sources'] = [empreinte(source) for source, _, _, _ in meta['sources']]
+            enregistrer(fichier, *compilee)
+    else:
+        compilee = None
+
+    if compilee is None:
+        print(f"🗺️ Compilation de la carte {chemin}...")
+        compilee = compiler_carte(chemin)
+        enregistrer(fichier, *compilee)
+    return compilee
+
+
+def pixels_route(tuiles):
+    """Pixels occupés de chaque tuile (alpha non nul) : toute tuile de la couche « chemin » est inconstructible"""
+    return tuiles[..., 3] > 0
+
+
+def finaliser_carte(compilee, images=True, atlas=None):
+    """Carte à partir de ce qu'a rendu lire_carte_compilee (thread principal si images=True)"""
+    meta, grilles, tuiles = compilee
+    surfaces = creer_images(meta, tuiles, atlas) if images else [None] * len(tuiles)
+    return CarteCompilee(meta, grilles, surfaces, pixels_route(tuiles))
+
+
+def charger_carte_compilee(chemin, images=True, atlas=None, dossier=DOSSIER_CARTES):
+    """Carte depuis le cache compilé, recompilée si la carte ou un tileset a changé
+
+    images=False charge seulement les grilles et les objets (simulation sans fenêtre).
+    """
+    return finaliser_carte(lire_carte_compilee(chemin, dossier), images, atlas)
@@ -0,0 +1,95 @@
+import queue
+import threading
+import time
+
+# ========================================
+# CHARGEMENT EN ARRIÈRE-PLAN
+# ========================================
+
+class Tache:
+    """Une ressource à charger : lecture et décodage en arrière-plan, finalisation sur le thread principal
+
+    lire() ne doit ni créer de surface au format d'affichage ni toucher à la fenêtre ;
+    finaliser(donnees, ressources) reçoit son résultat et les ressources déjà prêtes.
+    """
+
+    def __init__(self, nom, lire, finaliser=None):
+        self.nom = nom
+        self.lire = lire
+        self.finaliser = finaliser
+        self.duree_lecture = 0.0
+        self.duree_finalisation = 0.0
+
+
+class Chargement:
+    """Exécute les lectures des tâches dans un thread, dans l'ordre, pendant que le menu s'affiche
+
+    Le thread principal appelle finaliser_prets() à chaque frame : les ressources lues sont
+    finalisées (conversion au format d'affichage) dans l'ordre des tâches et rangées dans `ressources`.
+    """
+
+    def __init__(self, taches):
+        self.taches = list(taches)
+        self.ressources = {}  # Nom -> ressource prête
+        self.lues = queue.Queue()  # (tâche, données lues ou exception)
+        self.finalisees = 0
+        self.fil = threading.Thread(target=self.executer, name="chargement", daemon=True)
+        self.debut = None
+        self.fin = None
+
+    def demarrer(self):
+        self.debut = time.perf_counter()
+        self.fil.start()
+
+    def executer(self):
+        """Thread de chargement : lectures disque et décodages, une tâche après l'autre"""
+        for tache in self.taches:
+            debut = time.perf_counter()
+            try:
+                donnees = tache.lire()
+            except Exception as erreur:
+                donnees = erreur
+            tache.duree_lecture = time.perf_counter() - debut
+            self.lues.put((tache, donnees))
+
+    def finaliser_prets(self):
+        """Finalise les ressources lues depuis le dernier appel (thread principal) ; retourne True quand tout est prêt"""
+        while True:
+            try:
+                tache, donnees = self.lues.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(donnees, Exception):
+                raise RuntimeError(f"Chargement de « {tache.nom} » impossible") from donnees
+
+            debut = time.perf_counter()
+            if tache.finaliser is not None:
+                donnees = tache.finaliser(donnees, self.ressources)
+            tache.duree_finalisation = time.perf_counter() - debut
+            self.ressources[tache.nom] = donnees
+            self.finalisees += 1
+
+        if self.termine and self.fin is None:
+            self.fin = time.perf_counter()
+        return self.termine
+
+    @property
+    def termine(self):
+        return self.finalisees == len(self.taches)
+
+    @property
+    def progression(self):
+        """Part des tâches finalisées (entre 0 et 1)"""
+        return self.finalisees / len(self.taches) if self.taches else 1.0
+
+    @property
+    def etape(self):
+        """Nom de la prochaine ressource attendue"""
+        return self.taches[self.finalisees].nom if not self.termine else None
+
+    def resume(self):
+        """Temps de lecture (arrière-plan) et de finalisation (thread principal) de chaque tâche, en ms"""
+        return {
+            tache.nom: {'lecture': tache.duree_lecture * 1000, 'finalisation': tache.duree_finalisation * 1000}
+            for tache in self.taches
+        }
@@ -0,0 +1,98 @@
+import math
+from bisect import bisect_right
+
+import numpy as np
+
+# ========================================
+# CHEMIN PARAMÉTRÉ PAR ABSCISSE CURVILIGNE
+# ========================================
+
+class Chemin:
+    """Chemin des monstres compilé une fois en tables de longueurs cumulées
+
+    Un monstre n'a plus qu'à stocker la distance parcourue (progres) : sa position et
+    sa distance à la sortie s'en déduisent directement.
+    """
+
+    def __init__(self, points):
+        self.points = [(float(x), float(y)) for x, y in points]
+        self.xs = np.array([x for x, _ in self.points])
+        self.ys = np.array([y for _, y in self.points])
+
+        # Longueur cumulée au début de chaque point
+        longueurs = np.hypot(np.diff(self.xs), np.diff(self.ys))
+        self.cumul = np.concatenate(([0.0], np.cumsum(longueurs)))
+        self.cumul_liste = self.cumul.tolist()  # Pour bisect sans passer par NumPy
+        self.longueur = float(self.cumul[-1])
+
+        # Direction unitaire de chaque segment (segments de longueur nulle : direction nulle)
+        longueurs_sures = np.where(longueurs > 0, longueurs, 1.0)
+        self.directions = list(zip((np.diff(self.xs) / longueurs_sures).tolist(),
+                                   (np.diff(self.ys) / longueurs_sures).tolist()))
+
+    def __len__(self):
+        return len(self.points)
+
+    def segment(self, progres):
+        """Index du segment contenant cette distance parcourue"""
+        return min(max(bisect_right(self.cumul_liste, progres) - 1, 0), len(self.points) - 2)
+
+    def position(self, progres):
+        """Position (x, y) après avoir parcouru progres pixels depuis l'entrée"""
+        if progres >= self.longueur:
+            return self.points[-1]
+        if progres <= 0:
+            return self.points[0]
+        i = self.segment(progres)
+        reste = progres - self.cumul_liste[i]
+        x, y = self.points[i]
+        dx, dy = self.directions[i]
+        return x + dx * reste, y + dy * reste
+
+    def positions(self, progres):
+        """Positions de plusieurs monstres à la fois (tableau de distances parcourues -> xs, ys)"""
+        progres = np.clip(progres, 0.0, self.longueur)
+        return np.interp(progres, self.cumul, self.xs), np.interp(progres, self.cumul, self.ys)
+
+    def distance_sortie(self, progres):
+        """Distance restant à parcourir jusqu'à la sortie"""
+        return max(self.longueur - progres, 0.0)
+
+    def interception(self, progres, vitesse, x, y, vitesse_tir, rayon):
+        """Temps au bout duquel un tir parti de (x, y) arrive à `rayon` d'un monstre qui avance sur le chemin
+
+        Le monstre part de `progres` à vitesse constante ; sur chaque segment sa position est affine
+        en t, et |position(t) - départ| <= vitesse_tir * t + rayon se résout comme un polynôme du
+        second degré. None si le monstre atteint la sortie avant d'être rattrapé.
+        """
+        if progres >= self.longueur:
+            return None
+        for i in range(self.segment(progres), len(self.points) - 1):
+            t0 = max(self.cumul_liste[i] - progres, 0.0) / vitesse
+            t1 = (self.cumul_liste[i + 1] - progres) / vitesse
+
+            # Position relative au départ du tir : a + b * t
+            px, py = self.points[i]
+            dx, dy = self.directions[i]
+            reste = progres - self.cumul_liste[i]
+            ax, ay = px + dx * reste - x, py + dy * reste - y
+            bx, by = dx * vitesse, dy * vitesse
+
+            # f(t) = |a + b t|² - (vitesse_tir t + rayon)², on cherche le premier t de [t0, t1] où f(t) <= 0
+            qa = bx * bx + by * by - vitesse_tir * vitesse_tir
+            qb = 2 * (ax * bx + ay * by - vitesse_tir * rayon)
+            qc = ax * ax + ay * ay - rayon * rayon
+            if qa * t0 * t0 + qb * t0 + qc <= 0:
+                return t0
+            if qa == 0:
+                racines = [-qc / qb] if qb != 0 else []
+            else:
+                discriminant = qb * qb - 4 * qa * qc
+                if discriminant < 0:
+                    continue
+                racine = math.sqrt(discriminant)
+                racines = sorted(((-qb - racine) / (2 * qa), (-qb + racine) / (2 * qa)))
+            for t in racines:
+                if t0 < t <= t1:
+                    return t
+        return None
@@ -0,0 +1,88 @@
+import time
+
+import numpy as np
+
+# ========================================
+# CHRONOMÈTRE PAR PHASE
+# ========================================
+
+# Phases d'un tick de simulation (EtatJeu.avancer), dans l'ordre
+PHASES_SIMULATION = ('vagues', 'hero', 'monstres', 'tours', 'projectiles', 'effets', 'particules', 'textes')
+
+
+class Chronometre:
+    """Temps passé dans chaque phase, frame par frame, gardé dans un tampon circulaire
+
+    marquer(phase) attribue à la phase le temps écoulé depuis la marque précédente :
+    une seule lecture d'horloge par phase, et rien du tout quand aucun chronomètre n'est branché.
+    """
+
+    def __init__(self, phases, capacite=600):
+        self.phases = tuple(phases)
+        self.rangs = {phase: i for i, phase in enumerate(self.phases)}
+        self.capacite = capacite
+        self.durees = np.zeros((capacite, len(self.phases)))  # Secondes, une ligne par frame
+        self.debuts = np.zeros(capacite)  # Instant de début de chaque frame (perf_counter)
+        self.frames = 0  # Nombre de frames terminées depuis le début
+        self.courante = [0.0] * len(self.phases)
+        self.top = time.perf_counter()
+        self.debut_frame = self.top
+
+    def commencer_frame(self):
+        """Début d'une frame : le temps d'ici la prochaine marque est compté pour la première phase"""
+        self.top = self.debut_frame = time.perf_counter()
+
+    def reprendre(self):
+        """Repart de maintenant (le temps écoulé depuis la dernière marque n'est compté nulle part)"""
+        self.top = time.perf_counter()
+
+    def marquer(self, phase):
+        """Ajoute à la phase le temps écoulé depuis la marque précédente"""
+        maintenant = time.perf_counter()
+        self.courante[self.rangs[phase]] += maintenant - self.top
+        self.top = maintenant
+
+    def terminer_frame(self):
+        """Range les temps de la frame dans le tampon et repart à zéro"""
+        self.durees[self.frames % self.capacite] = self.courante
+        self.debuts[self.frames % self.capacite] = self.debut_frame
+        self.courante = [0.0] * len(self.phases)
+        self.frames += 1
+
+    def ordonner(self, tableau):
+        """Lignes gardées du tampon, de la plus ancienne à la plus récente"""
+        if self.frames <= self.capacite:
+            return tableau[:self.frames]
+        debut = self.frames % self.capacite
+        return np.concatenate((tableau[debut:], tableau[:debut]))
+
+    def historique(self):
+        """Temps des frames gardées, de la plus ancienne à la plus récente (tableau frames x phases)"""
+        return self.ordonner(self.durees)
+
+    def historique_debuts(self):
+        """Instants de début des frames gardées, dans le même ordre que historique()"""
+        return self.ordonner(self.debuts)
+
+    def derniere_frame(self):
+        """Temps de chaque phase pendant la dernière frame terminée"""
+        if self.frames == 0:
+            return dict.fromkeys(self.phases, 0.0)
+        ligne = self.durees[(self.frames - 1) % self.capacite]
+        return dict(zip(self.phases, ligne.tolist()))
+
+    def statistiques(self, centiles=(50, 95, 99)):
+        """Moyenne et centiles (en ms) de chaque phase et du total de la frame"""
+        historique = self.historique() * 1000
+        if len(historique) == 0:
+            return {}
+        colonnes = dict(zip(self.phases, historique.T))
+        colonnes['total'] = historique.sum(axis=1)
+
+        resultats = {}
+        for phase, valeurs in colonnes.items():
+            stats = {'moyenne': float(valeurs.mean())}
+            for centile in centiles:
+                stats[f'p{centile}'] = float(np.percentile(valeurs, centile))
+            resultats[phase] = stats
+        return resultats
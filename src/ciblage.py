@@ -0,0 +1,119 @@
+from bisect import bisect_left, bisect_right
+from operator import attrgetter
+
+# ========================================
+# CIBLAGE LE LONG DU CHEMIN
+# ========================================
+
+# Priorités de ciblage des tours, dans l'ordre du cycle
+PRIORITES = ('proche', 'premier', 'dernier', 'fort')
+
+NOMS_PRIORITES = {
+    'proche': "le plus proche",
+    'premier': "le premier (plus près de la sortie)",
+    'dernier': "le dernier (plus près de l'entrée)",
+    'fort': "le plus résistant",
+}
+
+
+def intervalles_portee(chemin, x, y, rayon):
+    """Parties du chemin à moins de rayon du point (x, y), en intervalles d'abscisse curviligne triés"""
+    intervalles = []
+    for i, (px, py) in enumerate(chemin.points[:-1]):
+        debut = chemin.cumul_liste[i]
+        longueur = chemin.cumul_liste[i + 1] - debut
+        if longueur <= 0:
+            continue
+
+        # |P + t.d - C|² <= r² pour t dans [0, longueur] (d unitaire)
+        dx, dy = chemin.directions[i]
+        ox = px - x
+        oy = py - y
+        b = dx * ox + dy * oy
+        c = ox * ox + oy * oy - rayon * rayon
+        discriminant = b * b - c
+        if discriminant < 0:
+            continue
+        racine = discriminant ** 0.5
+        t1 = max(-b - racine, 0.0)
+        t2 = min(-b + racine, longueur)
+        if t1 > t2:
+            continue
+
+        # Fusion avec l'intervalle précédent s'ils se touchent (sommet du chemin dans la portée)
+        if intervalles and intervalles[-1][1] >= debut + t1:
+            intervalles[-1] = (intervalles[-1][0], debut + t2)
+        else:
+            intervalles.append((debut + t1, debut + t2))
+    return intervalles
+
+
+class IndexChemin:
+    """Monstres actifs triés par distance parcourue, reconstruit une fois par tick
+
+    Les tours ne bougent pas : leur portée est un ensemble fixe d'intervalles du chemin,
+    et chercher une cible revient à quelques recherches dichotomiques dans cet index.
+    """
+
+    def __init__(self):
+        self.monstres = []
+        self.progres = []
+
+    def reconstruire(self, monstres):
+        """Trie les monstres actifs par progression (presque triés d'un tick à l'autre)"""
+        actifs = [monstre for monstre in monstres if monstre.actif]
+        actifs.sort(key=attrgetter('progres'))
+        self.monstres = actifs
+        self.progres = [monstre.progres for monstre in actifs]
+
+    def plage(self, debut, fin):
+        """Indices [i, j) des monstres dont la progression est dans [debut, fin]"""
+        return bisect_left(self.progres, debut), bisect_right(self.progres, fin)
+
+    def dans_intervalles(self, intervalles):
+        """Monstres actifs situés dans les intervalles, dans l'ordre du chemin"""
+        monstres = self.monstres
+        for debut, fin in intervalles:
+            i, j = self.plage(debut, fin)
+            for k in range(i, j):
+                if monstres[k].actif:
+                    yield monstres[k]
+
+    def cibler(self, intervalles, priorite, x, y):
+        """Cible selon la priorité parmi les monstres des intervalles (None s'il n'y en a aucun)"""
+        monstres = self.monstres
+
+        if priorite == 'premier':
+            # Le plus avancé : on part de la fin du dernier intervalle
+            for debut, fin in reversed(intervalles):
+                i, j = self.plage(debut, fin)
+                for k in range(j - 1, i - 1, -1):
+                    if monstres[k].actif:
+                        return monstres[k]
+            return None
+
+        if priorite == 'dernier':
+            for debut, fin in intervalles:
+                i, j = self.plage(debut, fin)
+                for k in range(i, j):
+                    if monstres[k].actif:
+                        return monstres[k]
+            return None
+
+        meilleur = None
+        if priorite == 'fort':
+            for monstre in self.dans_intervalles(intervalles):
+                if meilleur is None or monstre.vie > meilleur.vie:
+                    meilleur = monstre
+            return meilleur
+
+        # 'proche'
+        meilleure_distance = None
+        for monstre in self.dans_intervalles(intervalles):
+            dx = monstre.x - x
+            dy = monstre.y - y
+            distance = dx * dx + dy * dy
+            if meilleure_distance is None or distance < meilleure_distance:
+                meilleur = monstre
+                meilleure_distance = distance
+        return meilleur
@@ -0,0 +1,269 @@
+"""Équilibrage Monte Carlo : des milliers de parties headless jouées en parallèle par des stratégies scriptées.
+
+Lancer depuis la racine du dépôt :
+    python src/equilibrage.py [--parties N] [--processus P] [--strategie NOM] [--sortie rapport.json]
+"""
+import argparse
+import json
+import os
+import random
+import time
+from multiprocessing import Pool as PoolProcessus
+
+import numpy as np
+
+from carte import charger_carte_logique
+from ciblage import intervalles_portee
+from simulation import EtatJeu, HAUTEUR, LARGEUR, PRIX_TOUR_CANON, PRIX_TOUR_LASER, TYPES_TOURS
+
+VAGUE_MAX = 30  # Par défaut, une partie qui atteint cette vague est arrêtée (victoire)
+TICKS_MAX = 60 * 60 * 60  # Une heure de jeu simulée au plus
+
+PRIX = {'canon': PRIX_TOUR_CANON, 'laser': PRIX_TOUR_LASER}
+
+# ========================================
+# STRATÉGIES SCRIPTÉES
+# ========================================
+
+def achat_canons(numero_tour):
+    """Que des canons"""
+    return 'canon'
+
+
+def achat_lasers(numero_tour):
+    """Que des lasers"""
+    return 'laser'
+
+
+def achat_mixte(numero_tour):
+    """Canons et lasers en alternance"""
+    return 'canon' if numero_tour % 2 == 0 else 'laser'
+
+
+def achat_aucun(numero_tour):
+    """Aucune tour : le héros seul"""
+    return None
+
+
+STRATEGIES = {
+    'canons': achat_canons,
+    'lasers': achat_lasers,
+    'mixte': achat_mixte,
+    'heros_seul': achat_aucun,
+}
+
+# ========================================
+# UNE PARTIE
+# ========================================
+
+# Préparé une fois par processus (initialiser_processus)
+carte_logique = None
+emplacements = None
+poste_hero = None
+
+
+def preparer_emplacements(etat, pas=40):
+    """Emplacements de tours valides triés par longueur de chemin couverte, et poste de tir du héros"""
+    portee = TYPES_TOURS['canon'][1]
+    candidats = []
+    poste = None
+    meilleure_couverture_hero = 0.0
+    for y in range(100, HAUTEUR - 100, pas):
+        for x in range(40, LARGEUR - 40, pas):
+            if etat.verifier_position_valide(x, y):
+                couverture = sum(fin - debut for debut, fin in intervalles_portee(etat.chemin, x, y, portee))
+                if couverture > 0:
+                    candidats.append((-couverture, x, y))
+
+            # Le héros (qui peut marcher sur la route) se poste hors de portée de contact des monstres mais en portée de tir
+            if not intervalles_portee(etat.chemin, x, y, 70):
+                couverture_hero = sum(fin - debut for debut, fin in intervalles_portee(etat.chemin, x, y, etat.hero.portee))
+                if couverture_hero > meilleure_couverture_hero:
+                    meilleure_couverture_hero = couverture_hero
+                    poste = (x, y)
+    candidats.sort()
+    return [(x, y) for _, x, y in candidats], poste
+
+
+def initialiser_processus():
+    """Charge la carte et précalcule les emplacements une seule fois par processus"""
+    global carte_logique, emplacements, poste_hero
+    carte_logique = charger_carte_logique()
+    emplacements, poste_hero = preparer_emplacements(EtatJeu(carte_logique))
+
+
+def direction_vers(hero, cible):
+    """Direction (-1, 0, 1) par axe pour rejoindre la cible"""
+    dx = cible[0] - hero.x
+    dy = cible[1] - hero.y
+    return (0 if abs(dx) < 4 else (1 if dx > 0 else -1),
+            0 if abs(dy) < 4 else (1 if dy > 0 else -1))
+
+
+def jouer_partie(tache):
+    """Joue une partie complète et retourne ses statistiques (tache : (graine, stratégie, vague max, impacts planifiés))"""
+    graine, nom_strategie, vague_max, impacts_planifies = tache
+    if carte_logique is None:
+        initialiser_processus()
+
+    acheter = STRATEGIES[nom_strategie]
+    rng = random.Random(graine)
+    etat = EtatJeu(carte_logique, graine=graine, impacts_planifies=impacts_planifies)
+
+    # Un joueur n'utilise pas toujours le meilleur emplacement : choix parmi les meilleurs restants
+    restants = list(emplacements)
+    attente_vague = 0.0  # Hésitation avant de lancer la vague suivante (secondes)
+
+    argent_par_vague = []
+    fuites_par_vague = []
+    vie_debut_vague = etat.vie_base
+    vague = etat.vague_actuelle
+
+    while not etat.game_over and etat.vague_actuelle <= vague_max and etat.tick < TICKS_MAX:
+        # Acheter dès que possible
+        type_tour = acheter(len(etat.liste_tours))
+        if type_tour is not None and etat.argent >= PRIX[type_tour]:
+            while restants:
+                x, y = restants.pop(rng.randrange(min(4, len(restants))))
+                if etat.verifier_position_valide(x, y):
+                    etat.placer_tour(x, y, type_tour)
+                    break
+
+        # Lancer la vague suivante après une courte hésitation
+        if not etat.vague_en_cours:
+            if attente_vague <= 0:
+                argent_par_vague.append(etat.argent)
+                vie_debut_vague = etat.vie_base
+                etat.demarrer_vague()
+                attente_vague = rng.uniform(0.0, 3.0)
+            else:
+                attente_vague -= etat.horloge.pas
+
+        etat.avancer(direction_vers(etat.hero, poste_hero))
+
+        if etat.vague_actuelle != vague:
+            fuites_par_vague.append(vie_debut_vague - etat.vie_base)
+            vague = etat.vague_actuelle
+
+    # Vague en cours au moment de la défaite
+    if etat.vague_en_cours:
+        fuites_par_vague.append(vie_debut_vague - etat.vie_base)
+
+    return {
+        'graine': graine,
+        'strategie': nom_strategie,
+        'vague_atteinte': min(etat.vague_actuelle, vague_max),
+        'victoire': etat.vague_actuelle > vague_max,
+        'hero_mort': not etat.hero.actif,
+        'kills': etat.kills_total,
+        'ticks': etat.tick,
+        'argent_par_vague': argent_par_vague,
+        'fuites_par_vague': fuites_par_vague,
+        'tours': [(tour.sprite, tour.degats_infliges) for tour in etat.liste_tours],
+        'degats_hero': etat.hero.degats_infliges,
+    }
+
+# ========================================
+# AGRÉGATION
+# ========================================
+
+def moyenne_par_vague(series):
+    """Moyenne vague par vague de séries de longueurs différentes (parties encore en vie seulement)"""
+    longueur = max((len(serie) for serie in series), default=0)
+    resultat = []
+    for i in range(longueur):
+        valeurs = [serie[i] for serie in series if len(serie) > i]
+        resultat.append({'vague': i + 1, 'moyenne': float(np.mean(valeurs)), 'parties': len(valeurs)})
+    return resultat
+
+
+def agreger(parties):
+    """Distributions par stratégie : vague atteinte, fuites et argent par vague, efficacité des tours"""
+    rapport = {}
+    for nom in sorted({partie['strategie'] for partie in parties}):
+        groupe = [partie for partie in parties if partie['strategie'] == nom]
+        vagues = np.array([partie['vague_atteinte'] for partie in groupe])
+
+        # Dégâts utiles par dollar dépensé, par type de tour
+        efficacite = {}
+        for type_tour, prix in PRIX.items():
+            degats = [degats for partie in groupe for sprite, degats in partie['tours'] if sprite == TYPES_TOURS[type_tour][0]]
+            if degats:
+                efficacite[type_tour] = {
+                    'tours': len(degats),
+                    'degats_moyens': float(np.mean(degats)),
+                    'degats_par_dollar': float(np.mean(degats)) / prix,
+                }
+
+        rapport[nom] = {
+            'parties': len(groupe),
+            'vague_atteinte': {
+                'moyenne': float(vagues.mean()),
+                'p10': float(np.percentile(vagues, 10)),
+                'p50': float(np.percentile(vagues, 50)),
+                'p90': float(np.percentile(vagues, 90)),
+                'histogramme': {int(v): int(n) for v, n in zip(*np.unique(vagues, return_counts=True))},
+            },
+            'victoires': sum(partie['victoire'] for partie in groupe) / len(groupe),
+            'hero_mort': sum(partie['hero_mort'] for partie in groupe) / len(groupe),
+            'fuites_par_vague': moyenne_par_vague([partie['fuites_par_vague'] for partie in groupe]),
+            'argent_par_vague': moyenne_par_vague([partie['argent_par_vague'] for partie in groupe]),
+            'efficacite_tours': efficacite,
+            'degats_hero_moyens': float(np.mean([partie['degats_hero'] for partie in groupe])),
+        }
+    return rapport
+
+
+def afficher(rapport):
+    """Résumé lisible du rapport"""
+    for nom, stats in rapport.items():
+        vagues = stats['vague_atteinte']
+        print(f"\n▶ {nom} ({stats['parties']} parties)")
+        print(f"  Vague atteinte : moyenne {vagues['moyenne']:.1f} | p10 {vagues['p10']:.0f} | "
+              f"p50 {vagues['p50']:.0f} | p90 {vagues['p90']:.0f}")
+        print(f"  Victoires : {stats['victoires']:.0%} | défaites par mort du héros : {stats['hero_mort']:.0%}")
+        print("  Histogramme : " + "  ".join(f"v{v}:{n}" for v, n in vagues['histogramme'].items()))
+        fuites = " ".join(f"{v['moyenne']:.1f}" for v in stats['fuites_par_vague'][:15])
+        argent = " ".join(f"{v['moyenne']:.0f}" for v in stats['argent_par_vague'][:15])
+        print(f"  Fuites par vague (v1..) : {fuites}")
+        print(f"  Argent en début de vague : {argent}")
+        for type_tour, eff in stats['efficacite_tours'].items():
+            print(f"  {type_tour:<6} : {eff['tours']} tours, {eff['degats_moyens']:.0f} dégâts chacune, "
+                  f"{eff['degats_par_dollar']:.1f} dégâts/$")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--parties", type=int, default=200, help="parties par stratégie")
+    parser.add_argument("--processus", type=int, default=os.cpu_count(), help="processus en parallèle")
+    parser.add_argument("--strategie", action="append", choices=list(STRATEGIES),
+                        help="stratégie à jouer (plusieurs fois possible, toutes par défaut)")
+    parser.add_argument("--vague-max", type=int, default=VAGUE_MAX, help="vague à tenir pour gagner")
+    parser.add_argument("--graine", type=int, default=0, help="première graine")
+    parser.add_argument("--sortie", help="rapport JSON")
+    parser.add_argument("--impacts-planifies", action="store_true",
+                        help="impacts des projectiles calculés au tir au lieu de la poursuite")
+    args = parser.parse_args()
+
+    strategies = args.strategie or list(STRATEGIES)
+    taches = [(args.graine + i, nom, args.vague_max, args.impacts_planifies) for nom in strategies for i in range(args.parties)]
+
+    debut = time.perf_counter()
+    with PoolProcessus(args.processus, initializer=initialiser_processus) as processus:
+        parties = list(processus.imap_unordered(jouer_partie, taches, chunksize=4))
+    duree = time.perf_counter() - debut
+
+    print(f"🎲 {len(parties)} parties en {duree:.1f} s sur {args.processus} processus "
+          f"({len(parties) / duree:.1f} parties/s)")
+    rapport = agreger(parties)
+    afficher(rapport)
+
+    if args.sortie:
+        with open(args.sortie, "w", encoding="utf-8") as fichier:
+            json.dump({'parties_par_strategie': args.parties, 'duree_s': duree, 'strategies': rapport},
+                      fichier, indent=2, ensure_ascii=False)
+        print(f"\n💾 Rapport enregistré dans {args.sortie}")
+
+
+if __name__ == "__main__":
+    main()
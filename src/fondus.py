@@ -0,0 +1,49 @@
+from collections import OrderedDict
+
+# ========================================
+# CACHE DE FONDUS
+# ========================================
+
+class CacheFondus:
+    """Variantes pré-rendues d'une surface à chaque palier d'opacité, partagées par toutes les instances
+
+    Les effets et textes flottants qui s'estompent n'allouent plus de surface par frame :
+    la séquence complète est calculée une fois par surface source, puis on ne fait qu'un accès par index.
+    """
+
+    def __init__(self, paliers=32, capacite=256):
+        self.paliers = paliers
+        self.capacite = capacite  # Nombre de surfaces sources gardées (LRU)
+        self.sequences = OrderedDict()  # surface source -> liste des variantes par palier
+
+    def palier(self, alpha):
+        """Palier d'opacité correspondant à un alpha 0-255"""
+        return min(max(alpha, 0) * self.paliers // 256, self.paliers - 1)
+
+    def sequence(self, surface):
+        """Toutes les variantes d'opacité de la surface (calculées au premier appel)"""
+        variantes = self.sequences.get(surface)
+        if variantes is not None:
+            self.sequences.move_to_end(surface)
+            return variantes
+
+        variantes = []
+        for palier in range(self.paliers):
+            variante = surface.copy()
+            variante.set_alpha(round(255 * (palier + 1) / self.paliers))
+            variantes.append(variante)
+        self.sequences[surface] = variantes
+
+        # La surface source est gardée en clé : son identité ne peut pas être réutilisée tant qu'elle est en cache
+        while len(self.sequences) > self.capacite:
+            self.sequences.popitem(last=False)
+
+        return variantes
+
+    def obtenir(self, surface, alpha):
+        """Variante de la surface à l'opacité demandée (arrondie au palier)"""
+        return self.sequence(surface)[self.palier(alpha)]
+
+    def vider(self):
+        """Oublie toutes les séquences"""
+        self.sequences.clear()
@@ -0,0 +1,75 @@
+# ========================================
+# GRILLE SPATIALE
+# ========================================
+
+class GrilleSpatiale:
+    """Index spatial en grille uniforme pour les requêtes de proximité (portées, contact)"""
+
+    def __init__(self, taille_cellule=128):
+        self.taille_cellule = taille_cellule
+        self.cellules = {}
+        self.compteur = 0  # Rang d'insertion, pour départager les égalités comme un parcours de liste
+
+    def vider(self):
+        """Retire tous les objets de la grille"""
+        self.cellules.clear()
+        self.compteur = 0
+
+    def inserer(self, objet):
+        """Ajoute un objet dans la cellule correspondant à sa position actuelle"""
+        cle = (int(objet.x // self.taille_cellule), int(objet.y // self.taille_cellule))
+        cellule = self.cellules.get(cle)
+        if cellule is None:
+            cellule = self.cellules[cle] = []
+        cellule.append((self.compteur, objet))
+        self.compteur += 1
+
+    def reconstruire(self, objets):
+        """Reconstruit la grille à partir des positions actuelles (une fois par tick)"""
+        self.vider()
+        for objet in objets:
+            if objet.actif:
+                self.inserer(objet)
+
+    def candidats(self, x, y, rayon):
+        """Parcourt les entrées (rang, objet) des cellules qui recouvrent le cercle"""
+        taille = self.taille_cellule
+        cx_min = int((x - rayon) // taille)
+        cx_max = int((x + rayon) // taille)
+        cy_min = int((y - rayon) // taille)
+        cy_max = int((y + rayon) // taille)
+
+        for cx in range(cx_min, cx_max + 1):
+            for cy in range(cy_min, cy_max + 1):
+                cellule = self.cellules.get((cx, cy))
+                if cellule:
+                    yield from cellule
+
+    def dans_rayon(self, x, y, rayon):
+        """Retourne les objets actifs strictement dans le rayon, dans leur ordre d'insertion"""
+        rayon_carre = rayon * rayon
+        trouves = []
+        for rang, objet in self.candidats(x, y, rayon):
+            if not objet.actif:
+                continue
+            dx = objet.x - x
+            dy = objet.y - y
+            if dx * dx + dy * dy < rayon_carre:
+                trouves.append((rang, objet))
+        trouves.sort(key=lambda entree: entree[0])
+        return [objet for _, objet in trouves]
+
+    def plus_proche(self, x, y, rayon):
+        """Retourne l'objet actif le plus proche dans le rayon (le premier inséré en cas d'égalité)"""
+        meilleur = None
+        meilleure_cle = (rayon * rayon, -1)
+        for rang, objet in self.candidats(x, y, rayon):
+            if not objet.actif:
+                continue
+            dx = objet.x - x
+            dy = objet.y - y
+            cle = (dx * dx + dy * dy, rang)
+            if cle < meilleure_cle:
+                meilleur = objet
+                meilleure_cle = cle
+        return meilleur
@@ -0,0 +1,54 @@
+# ========================================
+# HORLOGE DE SIMULATION
+# ========================================
+
+# Durée d'un pas de simulation (la boucle graphique tourne à 60 FPS)
+PAS_PAR_DEFAUT = 1 / 60
+
+# Vitesses proposées par l'accélération (touche F)
+ECHELLES_TEMPS = (1, 2, 4, 16)
+
+
+class HorlogeSimulation:
+    """Horloge à pas fixe : accumule le temps réel et le découpe en pas de simulation identiques"""
+
+    def __init__(self, pas=PAS_PAR_DEFAUT, echelle=1, max_pas_par_frame=64):
+        self.pas = pas
+        self.echelle = echelle  # Accélération (1 = temps réel, 4 = quatre fois plus vite)
+        self.max_pas_par_frame = max_pas_par_frame  # Évite la spirale de la mort si une frame rame
+        self.reinitialiser()
+
+    def reinitialiser(self):
+        """Remet le temps de simulation à zéro (le pas et l'échelle sont conservés)"""
+        self.tick = 0
+        self.temps = 0.0
+        self.accumulateur = 0.0
+
+    def avancer(self):
+        """Avance d'un pas de simulation"""
+        self.tick += 1
+        # Calculé depuis le numéro de tick pour ne pas accumuler d'erreurs d'arrondi
+        self.temps = self.tick * self.pas
+
+    def accumuler(self, dt_reel):
+        """Ajoute le temps réel écoulé et retourne le nombre de pas à simuler pour le rattraper"""
+        self.accumulateur += dt_reel * self.echelle
+        nombre_pas = int(self.accumulateur // self.pas)
+
+        if nombre_pas > self.max_pas_par_frame:
+            # Trop de retard : on abandonne le temps qui ne peut pas être rattrapé
+            nombre_pas = self.max_pas_par_frame
+            self.accumulateur = 0.0
+        else:
+            self.accumulateur -= nombre_pas * self.pas
+
+        return nombre_pas
+
+    def changer_echelle(self):
+        """Passe à la vitesse suivante (x1, x2, x4, x16) et la retourne"""
+        if self.echelle in ECHELLES_TEMPS:
+            index = (ECHELLES_TEMPS.index(self.echelle) + 1) % len(ECHELLES_TEMPS)
+        else:
+            index = 0
+        self.echelle = ECHELLES_TEMPS[index]
+        return self.echelle
@@ -0,0 +1,219 @@
+import pygame
+
+from simulation import LARGEUR, HAUTEUR, PRIX_TOUR_CANON, PRIX_TOUR_LASER
+
+# ========================================
+# INTERFACE EN MODE RETENU
+# ========================================
+
+class Widget:
+    """Élément d'interface lié à une valeur : sa surface n'est recomposée que si la valeur change"""
+
+    def __init__(self, lire, composer, largeur, y, separateur=True, marge=20):
+        self.lire = lire  # etat -> valeur liée (None si le widget est masqué)
+        self.composer = composer  # valeur -> surface
+        self.largeur = largeur  # Place occupée dans le bandeau
+        self.y = y
+        self.separateur = separateur  # Trait vertical avant le widget
+        self.marge = marge  # Espace entre le trait et le widget
+        self.valeur = object()  # Aucune valeur lue pour l'instant
+        self.surface = None
+
+    def mettre_a_jour(self, etat):
+        """Relit la valeur liée ; retourne True si la surface a été recomposée"""
+        valeur = self.lire(etat)
+        if valeur == self.valeur:
+            return False
+        self.valeur = valeur
+        self.surface = None if valeur is None else self.composer(valeur)
+        return True
+
+
+class Bandeau:
+    """Bandeau semi-transparent composé une seule fois, puis seulement quand un widget change"""
+
+    def __init__(self, position, taille, dessiner_fond, widgets):
+        self.position = position
+        self.taille = taille
+        self.dessiner_fond = dessiner_fond
+        self.widgets = widgets
+        self.surface = None
+        self.compositions = 0  # Nombre de recompositions (pour vérifier qu'elles restent rares)
+
+    def mettre_a_jour(self, etat):
+        """Recompose le bandeau si au moins un widget a changé"""
+        changements = [widget.mettre_a_jour(etat) for widget in self.widgets]
+        if any(changements) or self.surface is None:
+            self.composer()
+
+    def composer(self):
+        """Dessine le fond, les séparateurs et les widgets visibles dans la surface du bandeau"""
+        surface = pygame.Surface(self.taille, pygame.SRCALPHA)
+        self.dessiner_fond(surface)
+
+        x_pos = 20
+        premier = True
+        for widget in self.widgets:
+            if widget.surface is None:
+                continue
+
+            # Séparateur vertical
+            if widget.separateur and not premier:
+                pygame.draw.line(surface, (100, 100, 100), (x_pos, 10), (x_pos, 50), 1)
+                x_pos += widget.marge
+
+            surface.blit(widget.surface, (x_pos, widget.y))
+            x_pos += widget.largeur
+            premier = False
+
+        self.surface = surface
+        self.compositions += 1
+
+    def dessiner(self, ecran):
+        """Une seule blit par frame"""
+        ecran.blit(self.surface, self.position)
+
+
+class Hud:
+    """Bandeaux du haut (informations) et du bas (contrôles) de l'écran de jeu"""
+
+    def __init__(self, textes):
+        self.textes = textes
+
+        self.bandeau_haut = Bandeau((0, 0), (LARGEUR, 62), self.fond_haut, [
+            # 1. Vague
+            Widget(lambda etat: etat.vague_actuelle,
+                   lambda vague: self.texte(f"Vague {vague}", 32, (255, 255, 255)),
+                   150, 15),
+            # 2. Argent
+            Widget(lambda etat: etat.argent,
+                   lambda argent: self.texte(f"💰 {argent}$", 32, (255, 215, 0)),
+                   140, 15),
+            # 3. Vie de la base
+            Widget(lambda etat: etat.vie_base,
+                   self.composer_vie_base,
+                   100, 15),
+            # 4. Kills
+            Widget(lambda etat: etat.kills_total,
+                   lambda kills: self.texte(f"💀 {kills}", 32, (255, 150, 150)),
+                   120, 15),
+            # Compteur de monstres restants (pendant la vague)
+            Widget(self.lire_restants,
+                   lambda restants: self.texte(f"Restants: {restants}", 26, (200, 200, 200)),
+                   150, 18),
+            # 5. Barre de vie du héros (compacte, horizontale)
+            Widget(self.lire_vie_hero,
+                   self.composer_vie_hero,
+                   280, 18, marge=30),
+        ])
+
+        self.bandeau_bas = Bandeau((0, HAUTEUR - 51), (LARGEUR, 51), self.fond_bas, [
+            # Icône de contrôles
+            self.widget_fixe("⌨️", (200, 200, 200), 40),
+            # ZQSD
+            self.widget_fixe("ZQSD-Héros", (100, 200, 255), 150),
+            self.widget_fixe("|", (100, 100, 100), 20),
+            # Tour Canon
+            Widget(lambda etat: etat.argent >= PRIX_TOUR_CANON,
+                   lambda abordable: self.texte(f"1-Canon ({PRIX_TOUR_CANON}$)", 26,
+                                                (150, 200, 255) if abordable else (100, 100, 100)),
+                   160, 16, separateur=False),
+            self.widget_fixe("|", (100, 100, 100), 20),
+            # Tour Laser
+            Widget(lambda etat: etat.argent >= PRIX_TOUR_LASER,
+                   lambda abordable: self.texte(f"2-Laser ({PRIX_TOUR_LASER}$)", 26,
+                                                (255, 150, 150) if abordable else (100, 100, 100)),
+                   160, 16, separateur=False),
+            self.widget_fixe("|", (100, 100, 100), 20),
+            # Espace pour vague
+            self.widget_fixe("ESPACE-Vague", (255, 255, 100), 140),
+            self.widget_fixe("|", (100, 100, 100), 20),
+            # Vitesse de simulation
+            Widget(lambda etat: etat.horloge.echelle,
+                   lambda echelle: self.texte(f"F-Vitesse x{echelle}", 26,
+                                              (255, 255, 255) if echelle == 1 else (255, 150, 0)),
+                   160, 16, separateur=False),
+        ])
+
+    def texte(self, texte, taille, couleur):
+        """Surface de texte (via le cache partagé)"""
+        return self.textes.rendre(texte, taille, couleur)
+
+    def widget_fixe(self, texte, couleur, largeur):
+        """Widget dont le contenu ne change jamais"""
+        return Widget(lambda etat: True,
+                      lambda _: self.texte(texte, 26, couleur),
+                      largeur, 16, separateur=False)
+
+    # ----------------------------------------
+    # Fonds des bandeaux
+    # ----------------------------------------
+
+    @staticmethod
+    def fond_haut(surface):
+        """Fond du bandeau supérieur et sa ligne de séparation"""
+        surface.fill((0, 0, 0, 200), (0, 0, LARGEUR, 60))
+        pygame.draw.line(surface, (100, 100, 100), (0, 60), (LARGEUR, 60), 2)
+
+    @staticmethod
+    def fond_bas(surface):
+        """Fond du bandeau inférieur et sa ligne de séparation"""
+        surface.fill((0, 0, 0, 200), (0, 1, LARGEUR, 50))
+        pygame.draw.line(surface, (100, 100, 100), (0, 1), (LARGEUR, 1), 2)
+
+    # ----------------------------------------
+    # Valeurs liées et compositions
+    # ----------------------------------------
+
+    @staticmethod
+    def lire_restants(etat):
+        """Monstres encore à venir ou vivants (None hors vague : widget masqué)"""
+        if not etat.vague_en_cours:
+            return None
+        return etat.monstres_par_vague - etat.monstres_envoyes + etat.monstres_vivants
+
+    @staticmethod
+    def lire_vie_hero(etat):
+        """Ce qui est visible de la vie du héros : largeur de barre et texte"""
+        hero = etat.hero
+        vie_proportion = hero.vie / hero.vie_max
+        couleur_vie_hero = (0, 255, 0) if vie_proportion > 0.5 else (255, 150, 0) if vie_proportion > 0.25 else (255, 0, 0)
+        return int(200 * vie_proportion), couleur_vie_hero, int(hero.vie), int(hero.vie_max)
+
+    def composer_vie_base(self, vie_base):
+        """Vie de la base, en rouge vif quand elle devient critique"""
+        couleur_vie = (255, 0, 0) if vie_base <= 5 else (255, 100, 100)
+        return self.texte(f"❤️ {vie_base}", 32, couleur_vie)
+
+    def composer_vie_hero(self, valeur):
+        """Libellé et barre de vie du héros"""
+        largeur_vie, couleur_vie_hero, vie, vie_max = valeur
+        surface = pygame.Surface((280, 24), pygame.SRCALPHA)
+
+        surface.blit(self.texte("Héros:", 26, (200, 200, 200)), (0, 0))
+
+        barre_x = 80
+        barre_y = 2
+        barre_largeur = 200
+        barre_hauteur = 20
+
+        # Fond de la barre
+        pygame.draw.rect(surface, (100, 0, 0), (barre_x, barre_y, barre_largeur, barre_hauteur))
+
+        # Vie actuelle
+        pygame.draw.rect(surface, couleur_vie_hero, (barre_x, barre_y, largeur_vie, barre_hauteur))
+
+        # Texte sur la barre
+        surface.blit(self.texte(f"{vie}/{vie_max}", 26, (255, 255, 255)), (barre_x + 65, barre_y + 2))
+
+        # Bordure de la barre
+        pygame.draw.rect(surface, (255, 255, 255), (barre_x, barre_y, barre_largeur, barre_hauteur), 2)
+
+        return surface
+
+    def dessiner(self, ecran, etat):
+        """Met à jour les widgets liés et dessine les deux bandeaux (deux blits en régime établi)"""
+        self.bandeau_haut.mettre_a_jour(etat)
+        self.bandeau_bas.mettre_a_jour(etat)
+        self.bandeau_haut.dessiner(ecran)
+        self.bandeau_bas.dessiner(ecran)
@@ -0,0 +1,152 @@
+import numpy as np
+import pygame
+
+# ========================================
+# SYSTÈME DE PARTICULES
+# ========================================
+
+# Couleurs disponibles (index stocké pour chaque particule)
+PALETTE = [
+    (255, 150, 0),   # Orange
+    (255, 100, 0),   # Orange foncé
+    (255, 200, 0),   # Jaune
+    (200, 50, 0),    # Rouge-orange
+    (255, 255, 100), # Jaune clair
+    (255, 0, 0),     # Rouge (dégâts du héros)
+]
+NB_COULEURS_EXPLOSION = 5  # Les couleurs tirées au hasard pour une explosion
+COULEUR_ROUGE = 5
+
+TAILLE_MIN = 3
+TAILLE_MAX = 8
+
+GRAVITE = 720  # Accélération vers le bas (px/s²)
+FROTTEMENT = 0.98 ** 60  # Fraction de vitesse conservée après une seconde
+
+
+class SystemeParticules:
+    """Particules stockées dans des tableaux NumPy préalloués, mises à jour en une seule passe vectorisée"""
+
+    def __init__(self, capacite=4096, graine=None):
+        self.capacite = capacite
+        self.rng = np.random.default_rng(graine)
+        self.nombre = 0  # Les particules vivantes occupent les indices [0, nombre)
+
+        self.x = np.zeros(capacite)
+        self.y = np.zeros(capacite)
+        self.vx = np.zeros(capacite)
+        self.vy = np.zeros(capacite)
+        self.taille = np.zeros(capacite, dtype=np.int16)
+        self.couleur = np.zeros(capacite, dtype=np.uint8)
+        self.age = np.zeros(capacite)
+        self.duree = np.ones(capacite)
+
+        self.tableaux = (self.x, self.y, self.vx, self.vy, self.taille, self.couleur, self.age, self.duree)
+
+    def __len__(self):
+        return self.nombre
+
+    def vider(self):
+        """Supprime toutes les particules"""
+        self.nombre = 0
+
+    def emettre(self, x, y, nombre, couleur=None):
+        """Crée une gerbe de particules au point (x, y) ; l'excédent est ignoré si le système est plein"""
+        debut = self.nombre
+        fin = min(debut + nombre, self.capacite)
+        n = fin - debut
+        if n <= 0:
+            return
+
+        rng = self.rng
+        # Vitesse aléatoire dans toutes les directions (pixels par seconde)
+        angle = rng.uniform(0, 6.28, n)
+        vitesse = rng.uniform(60, 240, n)
+
+        self.x[debut:fin] = x
+        self.y[debut:fin] = y
+        self.vx[debut:fin] = vitesse * np.cos(angle)
+        self.vy[debut:fin] = vitesse * np.sin(angle)
+        self.taille[debut:fin] = rng.integers(TAILLE_MIN, TAILLE_MAX + 1, n)
+        if couleur is None:
+            self.couleur[debut:fin] = rng.integers(0, NB_COULEURS_EXPLOSION, n)
+        else:
+            self.couleur[debut:fin] = couleur
+        self.age[debut:fin] = 0.0
+        self.duree[debut:fin] = rng.uniform(0.3, 0.8, n)
+
+        self.nombre = fin
+
+    def mettre_a_jour(self, dt):
+        """Vieillit, déplace et ralentit toutes les particules, puis retire les mortes"""
+        n = self.nombre
+        if n == 0:
+            return
+
+        age = self.age[:n]
+        age += dt
+
+        # Compactage : les survivantes sont recopiées au début des tableaux
+        vivantes = age < self.duree[:n]
+        if not vivantes.all():
+            n = int(np.count_nonzero(vivantes))
+            for tableau in self.tableaux:
+                tableau[:n] = tableau[:self.nombre][vivantes]
+            self.nombre = n
+
+        vx = self.vx[:n]
+        vy = self.vy[:n]
+
+        # Déplacement
+        self.x[:n] += vx * dt
+        self.y[:n] += vy * dt
+
+        # Gravité légère
+        vy += GRAVITE * dt
+
+        # Ralentissement
+        frottement = FROTTEMENT ** dt
+        vx *= frottement
+        vy *= frottement
+
+    def alphas(self):
+        """Opacité (0-1) de chaque particule vivante, décroissante avec l'âge"""
+        n = self.nombre
+        return 1.0 - self.age[:n] / self.duree[:n]
+
+
+class CacheSpritesParticules:
+    """Cercles pré-rendus pour chaque (taille, couleur, palier d'opacité)"""
+
+    def __init__(self, paliers_alpha=16):
+        self.paliers_alpha = paliers_alpha
+        self.nb_tailles = TAILLE_MAX - TAILLE_MIN + 1
+        self.sprites = []
+
+        # Index à plat : ((taille - TAILLE_MIN) * nb_couleurs + couleur) * paliers + palier
+        for taille in range(TAILLE_MIN, TAILLE_MAX + 1):
+            for couleur in PALETTE:
+                for palier in range(paliers_alpha):
+                    alpha = round(255 * (palier + 1) / paliers_alpha)
+                    surface = pygame.Surface((taille * 2, taille * 2), pygame.SRCALPHA)
+                    pygame.draw.circle(surface, (*couleur, alpha), (taille, taille), taille)
+                    self.sprites.append(surface)
+
+    def dessiner(self, ecran, systeme):
+        """Dessine toutes les particules en un seul appel à blits()"""
+        n = systeme.nombre
+        if n == 0:
+            return
+
+        taille = systeme.taille[:n]
+        paliers = np.clip((systeme.alphas() * self.paliers_alpha).astype(np.int32), 0, self.paliers_alpha - 1)
+        cles = ((taille - TAILLE_MIN) * len(PALETTE) + systeme.couleur[:n]) * self.paliers_alpha + paliers
+
+        pos_x = (systeme.x[:n] - taille).astype(np.int32)
+        pos_y = (systeme.y[:n] - taille).astype(np.int32)
+
+        sprites = self.sprites
+        ecran.blits(
+            [(sprites[cle], (x, y)) for cle, x, y in zip(cles.tolist(), pos_x.tolist(), pos_y.tolist())],
+            doreturn=False
+        )
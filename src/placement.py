@@ -0,0 +1,102 @@
+import numpy as np
+
+# ========================================
+# GRILLE D'OCCUPATION POUR LE PLACEMENT DES TOURS
+# ========================================
+
+COUCHE_CHEMIN = "chemin"  # Couche Tiled dont toutes les tuiles sont inconstructibles
+MARGE_CHEMIN = 40  # Distance minimale entre une tour et le tracé des monstres
+ECART_TOURS = 60  # Distance minimale entre deux tours
+
+
+def masque_couche(carte_tmx, nom, largeur, hauteur):
+    """Pixels occupés par les tuiles de la couche `nom` (carte compilée), ou None si la carte ne les fournit pas"""
+    routes = getattr(carte_tmx, 'routes', None)
+    couche = next((c for c in getattr(carte_tmx, 'layers', ()) if c.name == nom), None)
+    if routes is None or couche is None:
+        return None
+
+    # Masque de chaque case de la grille, puis cases remises à plat en pixels
+    grille = couche.grille
+    vides = np.zeros((1,) + routes.shape[1:], dtype=bool)
+    masques = np.concatenate((routes, vides))[grille]  # L'indice -1 (case vide) tombe sur le masque vide
+    lignes, colonnes, hauteur_tuile, largeur_tuile = masques.shape
+    masque = masques.transpose(0, 2, 1, 3).reshape(lignes * hauteur_tuile, colonnes * largeur_tuile)
+
+    resultat = np.zeros((hauteur, largeur), dtype=bool)
+    h, l = min(hauteur, masque.shape[0]), min(largeur, masque.shape[1])
+    resultat[:h, :l] = masque[:h, :l]
+    return resultat
+
+
+class GrilleOccupation:
+    """Bitmap au pixel des positions où le centre d'une tour est interdit
+
+    Tuiles de la couche « chemin », bande autour de chaque segment du tracé et disque autour
+    de chaque tour posée : vérifier une position revient à lire un pixel.
+    """
+
+    def __init__(self, largeur, hauteur, points_chemin, carte_tmx=None):
+        self.largeur = largeur
+        self.hauteur = hauteur
+
+        # Partie fixe (carte et tracé), calculée une fois
+        route = masque_couche(carte_tmx, COUCHE_CHEMIN, largeur, hauteur) if carte_tmx is not None else None
+        self.fixe = route if route is not None else np.zeros((hauteur, largeur), dtype=bool)
+        for debut, fin in zip(points_chemin, points_chemin[1:]):
+            self.marquer_segment(self.fixe, debut, fin, MARGE_CHEMIN)
+
+        self.interdit = self.fixe.copy()
+
+    def zone(self, x_min, y_min, x_max, y_max):
+        """Tranches et coordonnées des pixels du rectangle, limité à la carte (None s'il est en dehors)"""
+        x0, y0 = max(int(np.floor(x_min)), 0), max(int(np.floor(y_min)), 0)
+        x1, y1 = min(int(np.ceil(x_max)) + 1, self.largeur), min(int(np.ceil(y_max)) + 1, self.hauteur)
+        if x0 >= x1 or y0 >= y1:
+            return None
+        xs = np.arange(x0, x1, dtype=float)[None, :]
+        ys = np.arange(y0, y1, dtype=float)[:, None]
+        return (slice(y0, y1), slice(x0, x1)), xs, ys
+
+    def marquer_segment(self, bitmap, debut, fin, rayon):
+        """Interdit les pixels à moins de `rayon` du segment [debut, fin]"""
+        (ax, ay), (bx, by) = debut, fin
+        zone = self.zone(min(ax, bx) - rayon, min(ay, by) - rayon, max(ax, bx) + rayon, max(ay, by) + rayon)
+        if zone is None:
+            return
+        tranches, xs, ys = zone
+
+        # Projection de chaque pixel sur le segment, bornée à ses extrémités
+        dx, dy = bx - ax, by - ay
+        longueur_carre = dx * dx + dy * dy
+        if longueur_carre > 0:
+            t = np.clip(((xs - ax) * dx + (ys - ay) * dy) / longueur_carre, 0.0, 1.0)
+        else:
+            t = 0.0
+        ex = xs - (ax + t * dx)
+        ey = ys - (ay + t * dy)
+        bitmap[tranches] |= ex * ex + ey * ey < rayon * rayon
+
+    def marquer_disque(self, x, y, rayon):
+        """Interdit les pixels à moins de `rayon` de (x, y)"""
+        zone = self.zone(x - rayon, y - rayon, x + rayon, y + rayon)
+        if zone is None:
+            return
+        tranches, xs, ys = zone
+        self.interdit[tranches] |= (xs - x) ** 2 + (ys - y) ** 2 < rayon * rayon
+
+    def ajouter_tour(self, x, y):
+        """Mise à jour incrémentale après la pose d'une tour"""
+        self.marquer_disque(x, y, ECART_TOURS)
+
+    def reconstruire(self, tours):
+        """Repart de la carte seule et ajoute les tours (nouvelle partie, sauvegarde rechargée)"""
+        np.copyto(self.interdit, self.fixe)
+        for tour in tours:
+            self.ajouter_tour(tour.x, tour.y)
+
+    def valide(self, x, y):
+        """True si le centre d'une tour peut être posé en (x, y)"""
+        if not (0 <= x < self.largeur and 0 <= y < self.hauteur):
+            return False
+        return not self.interdit[int(y), int(x)]
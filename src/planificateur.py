@@ -0,0 +1,71 @@
+# ========================================
+# ROUE DE MINUTEURS HIÉRARCHIQUE
+# ========================================
+
+BITS_NIVEAU = 6
+CASES = 1 << BITS_NIVEAU  # Cases par niveau
+MASQUE = CASES - 1
+NIVEAUX = 4  # 64^4 ticks (plus de 77 h à 60 ticks/s) avant de devoir replanifier un événement
+PORTEE_MAX = 1 << (BITS_NIVEAU * NIVEAUX)
+
+
+class Planificateur:
+    """Événements rangés par tick de simulation dans une roue de minuteurs hiérarchique
+
+    Le niveau 0 a une case par tick pour les 64 prochains ticks, chaque niveau suivant couvre
+    64 fois plus de temps. Quand une case d'un niveau supérieur arrive, ses événements
+    redescendent d'un niveau : planifier ou récupérer un événement coûte O(1), quel que soit
+    le nombre d'événements en attente. L'ordre des événements d'un même tick n'est pas garanti.
+    """
+
+    def __init__(self, tick=0):
+        self.roues = [[[] for _ in range(CASES)] for _ in range(NIVEAUX)]
+        self.tick = tick  # Dernier tick dont les événements ont été récupérés
+        self.nombre = 0  # Événements en attente
+
+    def __len__(self):
+        return self.nombre
+
+    def ranger(self, tick, evenement):
+        """Place l'événement dans la case du niveau qui couvre son écart avec le tick courant"""
+        ecart = tick - self.tick
+        if ecart >= PORTEE_MAX:
+            # Trop loin : rangé au bout de la roue, il sera replacé quand cette case arrivera
+            ecart = PORTEE_MAX - 1
+            case = self.tick + ecart
+        else:
+            case = tick
+        niveau = 0
+        while ecart >= CASES << (BITS_NIVEAU * niveau):
+            niveau += 1
+        self.roues[niveau][(case >> (BITS_NIVEAU * niveau)) & MASQUE].append((tick, evenement))
+
+    def planifier(self, tick, evenement):
+        """Ajoute un événement pour le tick donné (au plus tôt le prochain tick récupéré)"""
+        self.ranger(max(tick, self.tick + 1), evenement)
+        self.nombre += 1
+
+    def echeances(self, tick):
+        """Retire et retourne les événements des ticks suivants jusqu'à `tick` inclus"""
+        echus = []
+        roue = self.roues[0]
+        while self.tick < tick:
+            self.tick += 1
+            courant = self.tick
+
+            # Début d'un tour d'un niveau : sa case courante redescend (niveaux hauts d'abord)
+            for niveau in range(NIVEAUX - 1, 0, -1):
+                if courant & ((1 << (BITS_NIVEAU * niveau)) - 1) == 0:
+                    case = self.roues[niveau][(courant >> (BITS_NIVEAU * niveau)) & MASQUE]
+                    if case:
+                        a_replacer = case[:]
+                        case.clear()
+                        for echeance, evenement in a_replacer:
+                            self.ranger(echeance, evenement)
+
+            case = roue[courant & MASQUE]
+            if case:
+                echus.extend(evenement for _, evenement in case)
+                self.nombre -= len(case)
+                case.clear()
+        return echus
@@ -0,0 +1,49 @@
+# ========================================
+# POOLS D'OBJETS
+# ========================================
+
+class Pool:
+    """Réserve d'objets réutilisables : acquerir() réinitialise un objet libre au lieu d'en allouer un nouveau
+
+    Les objets gérés exposent une méthode initialiser(...) qui prend les mêmes arguments que leur constructeur.
+    """
+
+    def __init__(self, classe, capacite=1024):
+        self.classe = classe
+        self.capacite = capacite  # Nombre maximum d'objets libres gardés en réserve
+        self.libres = []
+
+        # Compteurs pour vérifier que la réserve est bien dimensionnée
+        self.crees = 0
+        self.reutilises = 0
+
+    def acquerir(self, *args, **kwargs):
+        """Retourne un objet initialisé avec ces arguments (recyclé si possible)"""
+        if self.libres:
+            objet = self.libres.pop()
+            objet.initialiser(*args, **kwargs)
+            self.reutilises += 1
+            return objet
+        self.crees += 1
+        return self.classe(*args, **kwargs)
+
+    def liberer(self, objet):
+        """Rend un objet à la réserve ; il ne doit plus être référencé par la partie"""
+        if len(self.libres) < self.capacite:
+            self.libres.append(objet)
+
+    def vider(self):
+        """Oublie les objets libres"""
+        self.libres.clear()
+
+
+def compacter(liste, garder, pool=None):
+    """Retire sur place les objets que garder() rejette, en les rendant au pool (aucune nouvelle liste)"""
+    j = 0
+    for objet in liste:
+        if garder(objet):
+            liste[j] = objet
+            j += 1
+        elif pool is not None:
+            pool.liberer(objet)
+    del liste[j:]
@@ -0,0 +1,58 @@
+import pygame
+
+from simulation import LARGEUR, HAUTEUR
+
+# ========================================
+# CERCLES DE PORTÉE
+# ========================================
+
+class CachePortees:
+    """Cercles de portée rendus une seule fois par (rayon, couleur, épaisseur)"""
+
+    def __init__(self):
+        self.surfaces = {}
+
+    def obtenir(self, rayon, couleur, epaisseur=0):
+        """Surface carrée (2 x rayon) contenant le cercle centré ; épaisseur 0 = disque plein"""
+        cle = (rayon, couleur, epaisseur)
+        surface = self.surfaces.get(cle)
+        if surface is None:
+            surface = pygame.Surface((rayon * 2, rayon * 2), pygame.SRCALPHA)
+            pygame.draw.circle(surface, couleur, (rayon, rayon), rayon, epaisseur)
+            self.surfaces[cle] = surface
+        return surface
+
+    def dessiner(self, ecran, x, y, rayon, couleur, epaisseur=0):
+        """Dessine le cercle centré en (x, y)"""
+        ecran.blit(self.obtenir(rayon, couleur, epaisseur), (x - rayon, y - rayon))
+
+
+class CalquePortees:
+    """Toutes les portées des tours composées dans un seul calque, refait seulement quand les tours changent"""
+
+    def __init__(self, cache, couleur):
+        self.cache = cache
+        self.couleur = couleur
+        self.surface = None
+        self.rect = pygame.Rect(0, 0, 0, 0)  # Zone non transparente du calque
+        self.etat = None
+        self.version = None  # EtatJeu.version_tours au dernier rendu du calque
+        self.reconstructions = 0
+
+    def mettre_a_jour(self, etat):
+        """Recompose le calque si la liste des tours a changé depuis le dernier rendu"""
+        if etat is self.etat and etat.version_tours == self.version:
+            return
+        self.etat = etat
+        self.version = etat.version_tours
+
+        surface = pygame.Surface((LARGEUR, HAUTEUR), pygame.SRCALPHA)
+        for tour in etat.liste_tours:
+            self.cache.dessiner(surface, tour.x, tour.y, tour.portee, self.couleur)
+        self.surface = surface
+        self.rect = surface.get_bounding_rect()
+        self.reconstructions += 1
+
+    def dessiner(self, ecran):
+        """Une seule blit pour toutes les portées"""
+        ecran.blit(self.surface, self.rect, self.rect)
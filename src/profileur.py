@@ -0,0 +1,198 @@
+import cProfile
+import io
+import json
+import os
+import pstats
+import time
+
+import pygame
+
+from chrono import Chronometre, PHASES_SIMULATION
+from textes import obtenir_police
+
+# ========================================
+# PROFILEUR EN JEU
+# ========================================
+
+# Phases d'une frame de la boucle principale, dans l'ordre
+PHASES_FRAME = ('evenements',) + PHASES_SIMULATION + ('carte', 'entites', 'hud', 'profileur', 'flip')
+
+DOSSIER_PROFILS = "profils"
+
+BUDGET_FRAME = 1 / 60  # 16,7 ms
+
+COULEURS_PHASES = {
+    'evenements': (180, 180, 180),
+    'vagues': (255, 255, 120),
+    'hero': (100, 200, 255),
+    'monstres': (255, 120, 120),
+    'tours': (255, 170, 60),
+    'projectiles': (200, 120, 255),
+    'effets': (255, 120, 220),
+    'particules': (255, 200, 0),
+    'textes': (160, 255, 160),
+    'carte': (90, 160, 90),
+    'entites': (80, 200, 200),
+    'hud': (140, 140, 255),
+    'profileur': (120, 120, 120),
+    'flip': (230, 230, 230),
+}
+
+
+class Profileur:
+    """Temps par phase de chaque frame, affichés en surimpression et exportables en trace Chrome
+
+    Désactivé, il n'existe pas de chronomètre : la boucle ne fait qu'un test sur None par phase.
+    """
+
+    def __init__(self, capacite=600, largeur_graphe=240, rafraichissement=15):
+        self.capacite = capacite
+        self.chrono = None  # Chronometre quand le profileur est actif
+        self.largeur_graphe = largeur_graphe  # Frames affichées dans le graphe
+        self.rafraichissement = rafraichissement  # Les chiffres sont recalculés toutes les N frames
+        self.textes = None  # Surface des chiffres, refaite tous les `rafraichissement` frames
+        self.hauteur_graphe = 100
+        self.graphe = None  # Graphe défilant : une colonne ajoutée par frame
+        self.frames_graphe = 0  # Frames déjà tracées dans le graphe
+
+        # Profil cProfile sur un nombre fixe de frames
+        self.profil = None
+        self.frames_profil = 0
+
+    @property
+    def actif(self):
+        return self.chrono is not None
+
+    def basculer(self):
+        """Active (tampon vide) ou désactive le profileur ; retourne le nouvel état"""
+        if self.chrono is None:
+            self.chrono = Chronometre(PHASES_FRAME, self.capacite)
+            self.textes = None
+            self.graphe = pygame.Surface((self.largeur_graphe, self.hauteur_graphe))
+            self.frames_graphe = 0
+        else:
+            self.chrono = None
+        return self.actif
+
+    # ----------------------------------------
+    # Surimpression
+    # ----------------------------------------
+
+    def tracer_nouvelles_frames(self):
+        """Fait défiler le graphe et trace seulement les frames terminées depuis le dernier appel"""
+        chrono = self.chrono
+        nouvelles = min(chrono.frames - self.frames_graphe, self.largeur_graphe)
+        self.frames_graphe = chrono.frames
+        if nouvelles <= 0:
+            return
+
+        graphe = self.graphe
+        hauteur = self.hauteur_graphe
+        echelle = hauteur / (BUDGET_FRAME * 1000 * 2)  # Le haut du graphe vaut deux budgets
+        graphe.scroll(-nouvelles, 0)
+        graphe.fill((0, 0, 0), (self.largeur_graphe - nouvelles, 0, nouvelles, hauteur))
+
+        # Colonnes empilées : une couleur par phase
+        for decalage, ligne in enumerate(chrono.historique()[-nouvelles:] * 1000):
+            x = self.largeur_graphe - nouvelles + decalage
+            y = hauteur
+            for phase, duree in zip(PHASES_FRAME, ligne.tolist()):
+                hauteur_phase = duree * echelle
+                if hauteur_phase >= 0.5:
+                    y_haut = max(y - hauteur_phase, 0)
+                    pygame.draw.line(graphe, COULEURS_PHASES[phase], (x, y), (x, y_haut))
+                    y = y_haut
+
+        # Ligne du budget (60 FPS)
+        y_budget = hauteur - BUDGET_FRAME * 1000 * echelle
+        pygame.draw.line(graphe, (255, 60, 60), (0, y_budget), (self.largeur_graphe, y_budget))
+
+    def dessiner(self, ecran):
+        """Graphe défilant des dernières frames (empilé par phase) et temps moyens de chaque phase"""
+        chrono = self.chrono
+        panneau = pygame.Rect(10, 70, self.largeur_graphe + 20, self.hauteur_graphe + 30 + 16 * len(PHASES_FRAME))
+        ecran.fill((0, 0, 0), panneau)
+
+        self.tracer_nouvelles_frames()
+        ecran.blit(self.graphe, (panneau.left + 10, panneau.top + 10))
+
+        # Chiffres, recalculés de temps en temps pour rester lisibles et bon marché
+        if self.textes is None or chrono.frames % self.rafraichissement == 0:
+            self.textes = self.composer_textes(chrono.historique()[-60:] * 1000)
+        ecran.blit(self.textes, (panneau.left + 10, panneau.top + self.hauteur_graphe + 20))
+
+    def composer_textes(self, dernieres):
+        """Temps moyen de chaque phase sur les dernières frames"""
+        police = obtenir_police(18)
+        surface = pygame.Surface((self.largeur_graphe, 16 * len(PHASES_FRAME)), pygame.SRCALPHA)
+        moyennes = dernieres.mean(axis=0) if len(dernieres) else [0.0] * len(PHASES_FRAME)
+        for i, (phase, moyenne) in enumerate(zip(PHASES_FRAME, moyennes)):
+            texte = police.render(f"{phase:<12} {moyenne:6.2f} ms", True, COULEURS_PHASES[phase])
+            surface.blit(texte, (0, i * 16))
+        total = float(dernieres.sum(axis=1).mean()) if len(dernieres) else 0.0
+        titre = police.render(f"frame {total:.2f} ms", True, (255, 255, 255))
+        surface.blit(titre, (self.largeur_graphe - titre.get_width(), 0))
+        return surface
+
+    # ----------------------------------------
+    # Exports
+    # ----------------------------------------
+
+    def exporter_trace(self, chemin=None):
+        """Écrit les frames du tampon au format trace-event de Chrome (chrome://tracing, Perfetto)
+
+        Les phases d'une frame sont placées bout à bout à partir de son début ; les phases de
+        simulation de plusieurs ticks dans la même frame sont cumulées.
+        """
+        chrono = self.chrono
+        if chrono is None or chrono.frames == 0:
+            return None
+
+        evenements = []
+        for debut, ligne in zip(chrono.historique_debuts().tolist(), chrono.historique().tolist()):
+            ts = debut * 1e6
+            evenements.append({'name': "frame", 'ph': "X", 'ts': ts, 'dur': sum(ligne) * 1e6, 'pid': 1, 'tid': 1})
+            for phase, duree in zip(PHASES_FRAME, ligne):
+                if duree > 0:
+                    evenements.append({'name': phase, 'ph': "X", 'ts': ts, 'dur': duree * 1e6, 'pid': 1, 'tid': 1})
+                    ts += duree * 1e6
+
+        chemin = chemin or self.nouveau_fichier("trace", "json")
+        with open(chemin, "w", encoding="utf-8") as fichier:
+            json.dump({'traceEvents': evenements, 'displayTimeUnit': "ms"}, fichier)
+        return chemin
+
+    def demarrer_profil(self, frames=300):
+        """Lance cProfile pour les `frames` prochaines frames"""
+        if self.profil is not None:
+            return False
+        self.profil = cProfile.Profile()
+        self.frames_profil = frames
+        self.profil.enable()
+        return True
+
+    def fin_de_frame(self):
+        """À appeler après chaque frame : arrête le profil cProfile quand il a couvert ses frames
+
+        Retourne (fichier .prof, résumé) quand un profil vient de se terminer, sinon None.
+        """
+        if self.profil is None:
+            return None
+        self.frames_profil -= 1
+        if self.frames_profil > 0:
+            return None
+
+        self.profil.disable()
+        chemin = self.nouveau_fichier("profil", "prof")
+        self.profil.dump_stats(chemin)
+
+        resume = io.StringIO()
+        pstats.Stats(self.profil, stream=resume).sort_stats("cumulative").print_stats(20)
+        self.profil = None
+        return chemin, resume.getvalue()
+
+    @staticmethod
+    def nouveau_fichier(prefixe, extension):
+        """Chemin horodaté dans le dossier des profils"""
+        os.makedirs(DOSSIER_PROFILS, exist_ok=True)
+        return os.path.join(DOSSIER_PROFILS, f"{prefixe}_{time.strftime('%Y%m%d_%H%M%S')}.{extension}")
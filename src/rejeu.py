@@ -0,0 +1,273 @@
+"""Rejeux déterministes : graine et entrées du joueur tick par tick, rejoués sans fenêtre à vitesse maximale.
+
+Rejouer un fichier depuis la racine du dépôt :
+    python src/rejeu.py rejeux/rejeu_XXXX.rej
+"""
+import argparse
+import hashlib
+import os
+import struct
+import sys
+import time
+import zlib
+from array import array
+
+from carte import charger_carte_logique
+from simulation import EtatJeu, TYPES_TOURS
+
+DOSSIER_REJEUX = "rejeux"
+
+ENTETE = struct.Struct("<4sBIII?")  # Signature, version, graine, ticks, intervalle entre deux contrôles, impacts planifiés
+SIGNATURE = b"TDRJ"
+VERSION_REJEU = 2
+
+INTERVALLE_CONTROLE = 1800  # Une empreinte de l'état toutes les 30 s de jeu
+TAILLE_EMPREINTE = 8
+
+# Codes des événements
+DIRECTION = 0
+TOUR = 1
+VAGUE = 2
+PRIORITE = 3
+
+TYPES = list(TYPES_TOURS)  # Type de tour <-> octet
+
+# ========================================
+# EMPREINTE DE L'ÉTAT
+# ========================================
+
+def empreinte_etat(etat):
+    """Empreinte de l'état de la simulation (entités, ressources, héros, particules)"""
+    valeurs = array('d', [
+        etat.tick, etat.argent, etat.vie_base, etat.vague_actuelle, etat.kills_total,
+        etat.monstres_vivants, etat.monstres_envoyes, etat.hero.x, etat.hero.y, etat.hero.vie,
+    ])
+    for monstre in etat.liste_monstres:
+        if monstre.actif:
+            valeurs.extend((monstre.progres, monstre.vie))
+    for tour in etat.liste_tours:
+        valeurs.extend((tour.x, tour.y, tour.degats_infliges))
+    for projectile in etat.liste_projectiles:
+        if projectile.actif:
+            valeurs.extend((projectile.x, projectile.y))
+
+    condense = hashlib.blake2b(valeurs.tobytes(), digest_size=TAILLE_EMPREINTE)
+    particules = etat.particules
+    condense.update(particules.x[:particules.nombre].tobytes())
+    condense.update(particules.y[:particules.nombre].tobytes())
+    return condense.digest()
+
+# ========================================
+# ENCODAGE
+# ========================================
+
+def ecrire_entier(tampon, valeur):
+    """Entier positif en longueur variable (7 bits par octet)"""
+    while valeur >= 0x80:
+        tampon.append((valeur & 0x7F) | 0x80)
+        valeur >>= 7
+    tampon.append(valeur)
+
+
+def lire_entier(donnees, position):
+    """Lit un entier écrit par ecrire_entier ; retourne (valeur, position suivante)"""
+    valeur = 0
+    decalage = 0
+    while True:
+        octet = donnees[position]
+        position += 1
+        valeur |= (octet & 0x7F) << decalage
+        if octet < 0x80:
+            return valeur, position
+        decalage += 7
+
+
+class Enregistreur:
+    """Note les entrées du joueur pendant une partie (branché sur EtatJeu.enregistreur)
+
+    Chaque événement est stocké avec l'écart en ticks depuis le précédent ; la direction du
+    héros n'est notée que lorsqu'elle change.
+    """
+
+    def __init__(self, graine, intervalle_controle=INTERVALLE_CONTROLE):
+        self.graine = graine
+        self.intervalle_controle = intervalle_controle
+        self.evenements = bytearray()
+        self.dernier_tick = 0
+        self.direction = (0, 0)
+        self.controles = []  # Empreinte de l'état tous les `intervalle_controle` ticks
+
+    def noter(self, tick, code):
+        """Début d'un événement : écart depuis le précédent, puis son code"""
+        ecrire_entier(self.evenements, tick - self.dernier_tick)
+        self.evenements.append(code)
+        self.dernier_tick = tick
+
+    def noter_pas(self, etat, direction):
+        """Appelé au début de chaque tick, avant la mise à jour"""
+        tick = etat.tick
+        if tick % self.intervalle_controle == 0:
+            self.controles.append(empreinte_etat(etat))
+        direction = (int(direction[0]), int(direction[1]))
+        if direction != self.direction:
+            self.noter(tick, DIRECTION)
+            self.evenements.append((direction[0] + 1) * 3 + direction[1] + 1)
+            self.direction = direction
+
+    def noter_tour(self, tick, x, y, type_tour):
+        self.noter(tick, TOUR)
+        ecrire_entier(self.evenements, int(x))
+        ecrire_entier(self.evenements, int(y))
+        self.evenements.append(TYPES.index(type_tour))
+
+    def noter_vague(self, tick):
+        self.noter(tick, VAGUE)
+
+    def noter_priorite(self, tick):
+        self.noter(tick, PRIORITE)
+
+    def encoder(self, etat):
+        """Fichier de rejeu : entête, puis événements, empreintes et empreinte finale compressés"""
+        corps = bytearray()
+        ecrire_entier(corps, len(self.evenements))
+        corps += self.evenements
+        ecrire_entier(corps, len(self.controles))
+        for controle in self.controles:
+            corps += controle
+        corps += empreinte_etat(etat)
+        entete = ENTETE.pack(SIGNATURE, VERSION_REJEU, self.graine, etat.tick, self.intervalle_controle,
+                              etat.impacts_planifies)
+        return entete + zlib.compress(bytes(corps), 9)
+
+    def enregistrer(self, etat, chemin=None):
+        """Écrit le rejeu de la partie (état final compris) ; retourne le chemin du fichier"""
+        if chemin is None:
+            os.makedirs(DOSSIER_REJEUX, exist_ok=True)
+            chemin = os.path.join(DOSSIER_REJEUX, f"rejeu_{time.strftime('%Y%m%d_%H%M%S')}.rej")
+        with open(chemin, "wb") as fichier:
+            fichier.write(self.encoder(etat))
+        return chemin
+
+# ========================================
+# LECTURE ET LECTURE ACCÉLÉRÉE
+# ========================================
+
+class Rejeu:
+    """Contenu d'un fichier de rejeu décodé"""
+
+    def __init__(self, donnees):
+        (signature, version, self.graine, self.ticks, self.intervalle_controle,
+         self.impacts_planifies) = ENTETE.unpack_from(donnees)
+        if signature != SIGNATURE or version != VERSION_REJEU:
+            raise ValueError("Ce fichier n'est pas un rejeu de cette version du jeu")
+        self.taille = len(donnees)
+
+        corps = zlib.decompress(donnees[ENTETE.size:])
+        longueur, position = lire_entier(corps, 0)
+        fin = position + longueur
+
+        # Événements : (tick, code, arguments)
+        self.evenements = []
+        tick = 0
+        while position < fin:
+            ecart, position = lire_entier(corps, position)
+            tick += ecart
+            code = corps[position]
+            position += 1
+            if code == DIRECTION:
+                valeur = corps[position]
+                position += 1
+                arguments = (valeur // 3 - 1, valeur % 3 - 1)
+            elif code == TOUR:
+                x, position = lire_entier(corps, position)
+                y, position = lire_entier(corps, position)
+                arguments = (x, y, TYPES[corps[position]])
+                position += 1
+            else:
+                arguments = ()
+            self.evenements.append((tick, code, arguments))
+
+        nombre, position = lire_entier(corps, position)
+        self.controles = [corps[position + i * TAILLE_EMPREINTE:position + (i + 1) * TAILLE_EMPREINTE] for i in range(nombre)]
+        position += nombre * TAILLE_EMPREINTE
+        self.empreinte_finale = corps[position:position + TAILLE_EMPREINTE]
+
+    @classmethod
+    def lire(cls, chemin):
+        with open(chemin, "rb") as fichier:
+            return cls(fichier.read())
+
+
+def appliquer(etat, evenements, suivant, tick, direction):
+    """Applique les entrées du joueur notées au tick donné ; retourne (événement suivant, direction)"""
+    while suivant < len(evenements) and evenements[suivant][0] == tick:
+        _, code, arguments = evenements[suivant]
+        if code == DIRECTION:
+            direction = arguments
+        elif code == TOUR:
+            etat.placer_tour(*arguments)
+        elif code == VAGUE:
+            etat.demarrer_vague()
+        elif code == PRIORITE:
+            etat.changer_priorite()
+        suivant += 1
+    return suivant, direction
+
+
+def rejouer(rejeu, carte_tmx=None):
+    """Rejoue la partie sans fenêtre, aussi vite que possible, en vérifiant chaque empreinte
+
+    Retourne (état final, tick de la première divergence ou None).
+    """
+    etat = EtatJeu(carte_tmx if carte_tmx is not None else charger_carte_logique(), graine=rejeu.graine,
+                   impacts_planifies=rejeu.impacts_planifies)
+    evenements = rejeu.evenements
+    suivant = 0
+    direction = (0, 0)
+
+    for tick in range(rejeu.ticks):
+        # Entrées du joueur notées avant ce tick
+        suivant, direction = appliquer(etat, evenements, suivant, tick, direction)
+
+        # Même instant que l'enregistrement : après les commandes, avant la mise à jour
+        if tick % rejeu.intervalle_controle == 0:
+            if empreinte_etat(etat) != rejeu.controles[tick // rejeu.intervalle_controle]:
+                return etat, tick
+
+        etat.avancer(direction)
+
+    # Entrées notées après le dernier tick (tour posée puis fenêtre fermée dans la même frame) :
+    # elles font partie de l'état final enregistré
+    appliquer(etat, evenements, suivant, rejeu.ticks, direction)
+
+    if empreinte_etat(etat) != rejeu.empreinte_finale:
+        return etat, rejeu.ticks
+    return etat, None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("fichier", help="fichier .rej")
+    args = parser.parse_args()
+
+    rejeu = Rejeu.lire(args.fichier)
+    duree_jeu = rejeu.ticks / 60
+    print(f"🎬 {args.fichier} : {rejeu.taille} octets, graine {rejeu.graine}, "
+          f"{rejeu.ticks} ticks ({duree_jeu:.0f} s de jeu), {len(rejeu.evenements)} événements")
+
+    carte_tmx = charger_carte_logique()
+    debut = time.perf_counter()
+    etat, divergence = rejouer(rejeu, carte_tmx)
+    duree = time.perf_counter() - debut
+
+    print(f"⏩ Rejoué en {duree:.2f} s (x{duree_jeu / duree:.0f} par rapport au temps réel)")
+    print(f"   Vague {etat.vague_actuelle}, {etat.kills_total} kills, score {etat.score_final()}")
+    if divergence is None:
+        print(f"✅ {len(rejeu.controles)} contrôles et l'état final identiques")
+    else:
+        print(f"❌ L'état diverge au tick {divergence}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
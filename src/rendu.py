@@ -0,0 +1,493 @@
+import numpy as np
+import pygame
+
+from carte import FondCarte
+from fondus import CacheFondus
+from hud import Hud
+from particules import CacheSpritesParticules
+from portees import CachePortees, CalquePortees
+from textes import CacheTextes
+from simulation import LARGEUR, HAUTEUR, TYPES_TOURS
+from zones_sales import ZonesSales
+
+# Au-delà de cette part d'écran à redessiner, un flip complet coûte moins cher que des mises à jour partielles
+SEUIL_ZONES_SALES = 0.4
+
+COULEUR_PORTEE_TOUR = (255, 255, 255, 30)
+COULEUR_PORTEE_HERO = (100, 200, 255, 50)
+
+# Panneau affiché entre les vagues
+RECT_ATTENTE = pygame.Rect(LARGEUR // 2 - 350, HAUTEUR // 2 - 60, 700, 120)
+
+# ========================================
+# ÉCRAN DE DÉMARRAGE
+# ========================================
+
+def dessiner_ecran_menu(ecran, textes, progression=None, etape=None):
+    """Dessine l'écran de démarrage ; pendant le chargement (progression entre 0 et 1), une barre remplace l'invitation"""
+    # Fond semi-transparent
+    overlay = pygame.Surface((LARGEUR, HAUTEUR), pygame.SRCALPHA)
+    overlay.fill((0, 0, 0, 220))
+    ecran.blit(overlay, (0, 0))
+
+    # Titre
+    texte_titre = textes.rendre("TOWER DEFENSE", 96, (255, 215, 0))
+    ecran.blit(texte_titre, (LARGEUR // 2 - 350, HAUTEUR // 3 - 50))
+
+    if progression is None:
+        # Sous-titre
+        texte_start = textes.rendre("Appuie sur ESPACE pour commencer", 48, (255, 255, 255))
+        ecran.blit(texte_start, (LARGEUR // 2 - 320, HAUTEUR // 2))
+    else:
+        # Barre de chargement
+        barre = pygame.Rect(LARGEUR // 2 - 300, HAUTEUR // 2 + 10, 600, 24)
+        pygame.draw.rect(ecran, (60, 60, 60), barre)
+        pygame.draw.rect(ecran, (255, 215, 0), (barre.x, barre.y, int(barre.width * progression), barre.height))
+        pygame.draw.rect(ecran, (255, 255, 255), barre, 2)
+        libelle = f"Chargement : {etape}..." if etape else "Chargement..."
+        texte_chargement = textes.rendre(libelle, 32, (200, 200, 200))
+        ecran.blit(texte_chargement, (barre.x, barre.y - 36))
+
+    # Instructions
+    instructions = [
+        "ZQSD / Fleches - Contrôler le héros",
+        "1 - Placer une tour Canon (50$)",
+        "2 - Placer une tour Laser (100$)",
+        "P - Afficher/Masquer les portées",
+        "C - Priorité des tours (proche, premier, dernier, fort)",
+        "F - Accélérer le temps (x1, x2, x4, x16)",
+        "ESPACE - Démarrer la vague suivante"
+    ]
+
+    y_offset = HAUTEUR // 2 + 100
+    for instruction in instructions:
+        texte = textes.rendre(instruction, 32, (200, 200, 200))
+        ecran.blit(texte, (LARGEUR // 2 - 280, y_offset))
+        y_offset += 40
+
+    # Crédits
+    texte_credits = textes.rendre("Créé avec Pygame | Bon jeu !", 32, (150, 150, 150))
+    ecran.blit(texte_credits, (LARGEUR // 2 - 180, HAUTEUR - 80))
+
+
+# ========================================
+# RENDU
+# ========================================
+
+class Rendu:
+    """Dessine un EtatJeu dans la fenêtre (la simulation ne connaît pas pygame.display)"""
+
+    def __init__(self, ecran, atlas, carte_tmx, zones_sales=False, portees_groupees=False):
+        self.ecran = ecran
+        # Sprites rangés dans l'atlas : blits de la page avec une zone source
+        self.atlas = atlas
+        self.sprites = atlas.sprites
+        # Les couches de tuiles sont cuites une seule fois dans une surface de fond
+        self.fond_carte = FondCarte(carte_tmx)
+        # Cercles de particules pré-rendus (taille x couleur x palier d'opacité)
+        self.cache_particules = CacheSpritesParticules()
+        # Surfaces de texte rendues, partagées entre les frames
+        self.textes = CacheTextes()
+        # Variantes d'opacité des sprites et textes qui s'estompent
+        self.fondus = CacheFondus()
+        # Cercles de portée rendus une fois par (rayon, couleur, épaisseur)
+        self.portees = CachePortees()
+        # Option : toutes les portées des tours dans un seul calque, refait quand les tours changent
+        self.portees_groupees = portees_groupees
+        self.calque_portees = CalquePortees(self.portees, COULEUR_PORTEE_TOUR)
+        # Bandeaux d'interface, recomposés seulement quand une valeur affichée change
+        self.hud = Hud(self.textes)
+
+        # Mode zones sales : seules les zones qui ont changé sont restaurées, redessinées et envoyées
+        self.zones_sales_actives = zones_sales
+        self.zones = ZonesSales(LARGEUR, HAUTEUR)
+        self.masque_particules = np.zeros_like(self.zones.masque)  # Tuiles couvertes par les particules
+        self.rects_dynamiques = None  # Zones dessinées à la frame précédente (None : tout redessiner)
+        self.elements_statiques = {}  # Clé -> zone des éléments statiques de la frame précédente
+        self.pourcentage_sale = 100.0  # Part de l'écran envoyée à la dernière frame
+
+    # ----------------------------------------
+    # Carte et entités
+    # ----------------------------------------
+
+    def dessiner_carte(self):
+        """Dessine toutes les couches de la carte (une seule blit du fond pré-rendu)"""
+        self.fond_carte.dessiner(self.ecran)
+
+    def dessiner_monstre(self, monstre):
+        """Affiche le monstre et sa barre de vie"""
+        if not monstre.actif:
+            return
+
+        ecran = self.ecran
+        self.atlas.dessiner(ecran, monstre.sprite, (int(monstre.x), int(monstre.y)))
+
+        # Barre de vie
+        largeur_barre = 40
+        hauteur_barre = 5
+        barre_x = int(monstre.x - largeur_barre // 2)
+        barre_y = int(monstre.y - 30)
+
+        pygame.draw.rect(ecran, (255, 0, 0),
+                        (barre_x, barre_y, largeur_barre, hauteur_barre))
+
+        vie_largeur = int((monstre.vie / monstre.vie_max) * largeur_barre)
+        pygame.draw.rect(ecran, (0, 255, 0),
+                        (barre_x, barre_y, vie_largeur, hauteur_barre))
+
+    def dessiner_projectile(self, projectile, tick):
+        """Affiche le projectile"""
+        if not projectile.actif:
+            return
+        x, y = projectile.position_affichee(tick)
+        self.atlas.dessiner(self.ecran, projectile.sprite, (int(x), int(y)))
+
+    def dessiner_effet(self, effet, temps):
+        """Affiche l'effet avec transparence"""
+        if not effet.actif:
+            return
+
+        sprite_alpha = self.fondus.obtenir(self.sprites[effet.sprite], effet.opacite(temps))
+        rect = sprite_alpha.get_rect(center=(int(effet.x), int(effet.y)))
+        self.ecran.blit(sprite_alpha, rect)
+
+    def dessiner_texte_flottant(self, texte, temps):
+        """Affiche le texte avec transparence"""
+        if not texte.actif:
+            return
+
+        # La surface est partagée par tous les textes identiques ("-25", "+10$"...)
+        surface_texte = self.textes.rendre(texte.texte, texte.taille, texte.couleur)
+
+        # Variante pré-rendue à l'opacité voulue
+        surface_alpha = self.fondus.obtenir(surface_texte, texte.opacite(temps))
+        x, y = texte.position_affichee(temps)
+        rect = surface_alpha.get_rect(center=(int(x), int(y)))
+        self.ecran.blit(surface_alpha, rect)
+
+    def dessiner_tour(self, tour, afficher_portees):
+        """Affiche la tour et son rayon de portée"""
+        ecran = self.ecran
+        self.atlas.dessiner(ecran, tour.sprite, (int(tour.x), int(tour.y)))
+
+        # Dessiner la portée seulement si activé
+        if afficher_portees:
+            self.portees.dessiner(ecran, tour.x, tour.y, tour.portee, COULEUR_PORTEE_TOUR)
+
+    def dessiner_hero(self, hero):
+        """Affiche le héros et sa barre de vie"""
+        if not hero.actif:
+            return
+
+        ecran = self.ecran
+
+        # Dessiner le sprite
+        self.atlas.dessiner(ecran, hero.sprite, (int(hero.x), int(hero.y)))
+
+        # Dessiner le cercle de portée (transparent)
+        self.portees.dessiner(ecran, hero.x, hero.y, hero.portee, COULEUR_PORTEE_HERO)
+
+        # Barre de vie
+        largeur_barre = 60
+        hauteur_barre = 8
+        barre_x = int(hero.x - largeur_barre // 2)
+        barre_y = int(hero.y - 40)
+
+        # Fond rouge
+        pygame.draw.rect(ecran, (255, 0, 0),
+                        (barre_x, barre_y, largeur_barre, hauteur_barre))
+
+        # Vie verte
+        vie_largeur = int((hero.vie / hero.vie_max) * largeur_barre)
+        pygame.draw.rect(ecran, (0, 255, 0),
+                        (barre_x, barre_y, vie_largeur, hauteur_barre))
+
+        # Contour blanc
+        pygame.draw.rect(ecran, (255, 255, 255),
+                        (barre_x, barre_y, largeur_barre, hauteur_barre), 2)
+
+    def dessiner_entites(self, etat, afficher_portees):
+        """Dessine tous les éléments de la partie"""
+        for monstre in etat.liste_monstres:
+            self.dessiner_monstre(monstre)
+
+        portees_individuelles = afficher_portees and not self.portees_groupees
+        for tour in etat.liste_tours:
+            self.dessiner_tour(tour, portees_individuelles)
+
+        if afficher_portees and self.portees_groupees:
+            self.calque_portees.mettre_a_jour(etat)
+            self.calque_portees.dessiner(self.ecran)
+
+        for projectile in etat.liste_projectiles:
+            self.dessiner_projectile(projectile, etat.tick)
+
+        # Dessiner les effets visuels
+        for effet in etat.liste_effets:
+            self.dessiner_effet(effet, etat.temps)
+
+        # Dessiner les particules
+        self.cache_particules.dessiner(self.ecran, etat.particules)
+
+        # Dessiner les textes flottants
+        for texte in etat.liste_textes_flottants:
+            self.dessiner_texte_flottant(texte, etat.temps)
+
+        # Dessiner le héros
+        self.dessiner_hero(etat.hero)
+
+        # Points d'entrée/sortie
+        points = etat.points
+        if 'entree' in points:
+            pygame.draw.circle(self.ecran, (0, 255, 0),
+                             (int(points['entree'][0]), int(points['entree'][1])), 5)
+        if 'sortie' in points:
+            pygame.draw.circle(self.ecran, (255, 0, 0),
+                             (int(points['sortie'][0]), int(points['sortie'][1])), 5)
+
+    # ----------------------------------------
+    # Interface
+    # ----------------------------------------
+
+    def dessiner_interface(self, etat):
+        """Dessine une interface horizontale en haut et en bas de l'écran"""
+        self.hud.dessiner(self.ecran, etat)
+
+    def dessiner_menu(self):
+        """Dessine l'écran de démarrage"""
+        dessiner_ecran_menu(self.ecran, self.textes)
+        self.invalider()
+
+    def dessiner_apercu_placement(self, souris_x, souris_y, type_tour, valide):
+        """Dessine la tour à placer sous la souris avec sa portée"""
+        ecran = self.ecran
+        nom_sprite, portee, _, _ = TYPES_TOURS[type_tour]
+        couleur = (0, 255, 0, 100) if valide else (255, 0, 0, 100)
+
+        apercu_surface = self.fondus.obtenir(self.sprites[nom_sprite], 150)
+        rect = apercu_surface.get_rect(center=(souris_x, souris_y))
+        ecran.blit(apercu_surface, rect)
+
+        self.portees.dessiner(ecran, souris_x, souris_y, portee, couleur, 2)
+
+    def dessiner_attente_vague(self):
+        """Message entre les vagues"""
+        ecran = self.ecran
+
+        # Panneau central
+        panneau_vague = pygame.Surface(RECT_ATTENTE.size, pygame.SRCALPHA)
+        panneau_vague.fill((0, 0, 0, 200))
+        ecran.blit(panneau_vague, RECT_ATTENTE)
+        pygame.draw.rect(ecran, (255, 255, 100), RECT_ATTENTE, 3)
+
+        texte_attente = self.textes.rendre("Prêt pour la prochaine vague ?", 48, (255, 255, 0))
+        ecran.blit(texte_attente, (LARGEUR // 2 - 280, HAUTEUR // 2 - 40))
+
+        texte_espace = self.textes.rendre("Appuie sur ESPACE", 36, (200, 200, 200))
+        ecran.blit(texte_espace, (LARGEUR // 2 - 150, HAUTEUR // 2 + 20))
+
+    def dessiner_game_over(self, etat):
+        """Écran Game Over avec les statistiques de la partie"""
+        ecran = self.ecran
+
+        # Fond semi-transparent
+        overlay = pygame.Surface((LARGEUR, HAUTEUR), pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 180))
+        ecran.blit(overlay, (0, 0))
+
+        # Textes
+        texte_game_over = self.textes.rendre("GAME OVER", 72, (255, 0, 0))
+        ecran.blit(texte_game_over, (LARGEUR // 2 - 200, HAUTEUR // 2 - 150))
+
+        # Plus de statistiques
+        texte_vague = self.textes.rendre(f"Vague atteinte: {etat.vague_actuelle - 1}", 36, (255, 255, 255))
+        ecran.blit(texte_vague, (LARGEUR // 2 - 180, HAUTEUR // 2 - 50))
+
+        texte_kills = self.textes.rendre(f"Monstres éliminés: {etat.kills_total}", 36, (255, 215, 0))
+        ecran.blit(texte_kills, (LARGEUR // 2 - 180, HAUTEUR // 2))
+
+        texte_tours = self.textes.rendre(f"Tours construites: {len(etat.liste_tours)}", 36, (100, 200, 255))
+        ecran.blit(texte_tours, (LARGEUR // 2 - 180, HAUTEUR // 2 + 50))
+
+        # Score calculé
+        texte_score = self.textes.rendre(f"Score final: {etat.score_final()}", 36, (255, 150, 255))
+        ecran.blit(texte_score, (LARGEUR // 2 - 180, HAUTEUR // 2 + 100))
+
+        texte_rejouer = self.textes.rendre("Appuie sur R pour rejouer", 36, (255, 255, 0))
+        ecran.blit(texte_rejouer, (LARGEUR // 2 - 200, HAUTEUR // 2 + 170))
+
+        self.invalider()
+
+    # ----------------------------------------
+    # Rendu par zones sales
+    # ----------------------------------------
+
+    def invalider(self):
+        """Force un rendu complet à la prochaine frame partielle (après le menu ou le Game Over)"""
+        self.rects_dynamiques = None
+
+    def construire_elements(self, etat, afficher_portees, apercu):
+        """Liste d'affichage dans l'ordre de dessin : (zone, clé statique ou None, fonction de dessin)
+
+        Un élément dynamique (clé None) est redessiné à chaque frame ; un élément statique
+        ne salit l'écran que lorsque sa clé apparaît ou disparaît.
+        """
+        elements = []
+        ajouter = elements.append
+        sprites = self.sprites
+
+        for monstre in etat.liste_monstres:
+            if monstre.actif:
+                rect = sprites[monstre.sprite].get_rect(center=(int(monstre.x), int(monstre.y)))
+                rect.union_ip((int(monstre.x - 20), int(monstre.y - 30), 40, 5))
+                ajouter((rect, None, lambda m=monstre: self.dessiner_monstre(m)))
+
+        portees_individuelles = afficher_portees and not self.portees_groupees
+        for tour in etat.liste_tours:
+            rect = sprites[tour.sprite].get_rect(center=(int(tour.x), int(tour.y)))
+            if portees_individuelles:
+                rect.union_ip((int(tour.x - tour.portee), int(tour.y - tour.portee), tour.portee * 2 + 1, tour.portee * 2 + 1))
+            ajouter((rect, ('tour', id(tour), portees_individuelles), lambda t=tour: self.dessiner_tour(t, portees_individuelles)))
+
+        if afficher_portees and self.portees_groupees:
+            calque = self.calque_portees
+            calque.mettre_a_jour(etat)
+            ajouter((calque.rect.copy(), ('portees', calque.reconstructions), lambda: calque.dessiner(self.ecran)))
+
+        for projectile in etat.liste_projectiles:
+            if projectile.actif:
+                x, y = projectile.position_affichee(etat.tick)
+                rect = sprites[projectile.sprite].get_rect(center=(int(x), int(y)))
+                ajouter((rect, None, lambda p=projectile: self.dessiner_projectile(p, etat.tick)))
+
+        for effet in etat.liste_effets:
+            if effet.actif:
+                rect = sprites[effet.sprite].get_rect(center=(int(effet.x), int(effet.y)))
+                ajouter((rect, None, lambda e=effet: self.dessiner_effet(e, etat.temps)))
+
+        # Les particules n'ont pas de zone globale : leurs tuiles sont marquées une à une
+        if len(etat.particules):
+            ajouter((None, None, lambda: self.cache_particules.dessiner(self.ecran, etat.particules)))
+
+        for texte in etat.liste_textes_flottants:
+            if texte.actif:
+                surface_texte = self.textes.rendre(texte.texte, texte.taille, texte.couleur)
+                x, y = texte.position_affichee(etat.temps)
+                rect = surface_texte.get_rect(center=(int(x), int(y)))
+                ajouter((rect, None, lambda t=texte: self.dessiner_texte_flottant(t, etat.temps)))
+
+        hero = etat.hero
+        if hero.actif:
+            rect = pygame.Rect(int(hero.x - hero.portee), int(hero.y - hero.portee), hero.portee * 2 + 1, hero.portee * 2 + 1)
+            ajouter((rect, None, lambda: self.dessiner_hero(hero)))
+
+        # Points d'entrée/sortie
+        for nom, couleur in (('entree', (0, 255, 0)), ('sortie', (255, 0, 0))):
+            if nom in etat.points:
+                centre = (int(etat.points[nom][0]), int(etat.points[nom][1]))
+                rect = pygame.Rect(centre[0] - 5, centre[1] - 5, 11, 11)
+                ajouter((rect, ('point', nom), lambda c=couleur, p=centre: pygame.draw.circle(self.ecran, c, p, 5)))
+
+        # Bandeaux : statiques tant qu'ils ne sont pas recomposés
+        for bandeau in (self.hud.bandeau_haut, self.hud.bandeau_bas):
+            bandeau.mettre_a_jour(etat)
+            rect = bandeau.surface.get_rect(topleft=bandeau.position)
+            ajouter((rect, ('bandeau', id(bandeau), bandeau.compositions), lambda b=bandeau: b.dessiner(self.ecran)))
+
+        # Tour à placer sous la souris
+        if apercu is not None:
+            souris_x, souris_y, type_tour, valide = apercu
+            portee = TYPES_TOURS[type_tour][1]
+            rect = pygame.Rect(souris_x - portee, souris_y - portee, portee * 2, portee * 2)
+            rect.union_ip(sprites[TYPES_TOURS[type_tour][0]].get_rect(center=(souris_x, souris_y)))
+            ajouter((rect, None, lambda: self.dessiner_apercu_placement(*apercu)))
+
+        # Message entre les vagues
+        if not etat.vague_en_cours:
+            ajouter((RECT_ATTENTE, ('attente',), self.dessiner_attente_vague))
+
+        return elements
+
+    def marquer_particules(self, systeme):
+        """Recalcule le masque des tuiles couvertes par les particules vivantes"""
+        self.masque_particules[:] = False
+        n = systeme.nombre
+        if n == 0:
+            return
+
+        taille = systeme.taille[:n]
+        gauche = systeme.x[:n].astype(np.int32) - taille - 1
+        haut = systeme.y[:n].astype(np.int32) - taille - 1
+
+        # Les boîtes sont marquées dans le masque des particules, pas dans celui de la frame
+        zones = self.zones
+        masque = zones.masque
+        zones.masque = self.masque_particules
+        zones.marquer_boites(gauche, haut, gauche + taille * 2 + 2, haut + taille * 2 + 2)
+        zones.masque = masque
+
+    def memoriser(self, elements):
+        """Retient les zones dessinées pour les effacer à la frame suivante"""
+        self.rects_dynamiques = [rect for rect, cle, _ in elements if cle is None and rect is not None]
+        self.elements_statiques = {cle: rect for rect, cle, _ in elements if cle is not None}
+
+    def dessiner_jeu_partiel(self, etat, afficher_portees, apercu=None):
+        """Dessine et envoie une frame de jeu en ne touchant que les zones qui ont changé
+
+        apercu : (x, y, type de tour, position valide) pendant le placement, sinon None.
+        Retombe sur un flip complet au-delà de SEUIL_ZONES_SALES.
+        """
+        ecran = self.ecran
+        elements = self.construire_elements(etat, afficher_portees, apercu)
+
+        zones = self.zones
+        zones.effacer()
+        premiere_frame = self.rects_dynamiques is None
+        if not premiere_frame:
+            # Anciennes positions (à effacer) puis nouvelles positions (à dessiner)
+            for rect in self.rects_dynamiques:
+                zones.marquer(rect)
+            zones.masque |= self.masque_particules
+
+            statiques = {}
+            for rect, cle, _ in elements:
+                if cle is None:
+                    if rect is not None:
+                        zones.marquer(rect)
+                else:
+                    statiques[cle] = rect
+            # Éléments statiques apparus ou disparus
+            for cle in statiques.keys() ^ self.elements_statiques.keys():
+                zones.marquer(statiques.get(cle) or self.elements_statiques[cle])
+
+        self.marquer_particules(etat.particules)
+        zones.masque |= self.masque_particules
+        self.memoriser(elements)
+
+        if premiere_frame or zones.proportion() > SEUIL_ZONES_SALES:
+            self.dessiner_carte()
+            for _, _, dessiner in elements:
+                dessiner()
+            pygame.display.flip()
+            self.pourcentage_sale = 100.0
+            return
+
+        # Restaurer le fond dans les zones sales depuis la carte pré-rendue
+        rects = zones.rectangles()
+        fond = self.fond_carte.obtenir_surface()
+        for rect in rects:
+            ecran.blit(fond, rect, rect)
+
+        # Redessiner dans l'ordre tout ce qui touche ces zones
+        for rect_element, cle, dessiner in elements:
+            if cle is None or zones.contient(rect_element):
+                dessiner()
+                continue
+            # Élément statique à cheval sur une zone sale : découpé à chaque zone touchée
+            for index in rect_element.collidelistall(rects):
+                ecran.set_clip(rects[index])
+                dessiner()
+            ecran.set_clip(None)
+
+        pygame.display.update(rects)
+        self.pourcentage_sale = 100.0 * sum(rect.w * rect.h for rect in rects) / (LARGEUR * HAUTEUR)
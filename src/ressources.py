@@ -0,0 +1,41 @@
+import os
+
+import pygame
+
+# ========================================
+# CHARGEMENT DES SPRITES
+# ========================================
+
+# Nom du sprite -> (fichier dans assets/sprites, taille à l'écran)
+SPRITES = {
+    'tour_canon': ("tank_blue.png", (64, 64)),
+    'tour_laser': ("tank_red.png", (64, 64)),
+    'monstre_1': ("towerDefense_tile245.png", (48, 48)),
+    'monstre_2': ("towerDefense_tile246.png", (48, 48)),
+    'projectile': ("bulletBlue1.png", (16, 16)),
+    'explosion': ("explosion1.png", (64, 64)),
+    # Sprite du héros
+    'hero': ("towerDefense_tile271.png", (64, 64)),
+}
+
+
+def charger_sprite(nom_fichier, taille=None, convertir=True):
+    """Charge une image et la redimensionne si nécessaire (sans convertir : possible hors du thread principal)"""
+    chemin = os.path.join("assets", "sprites", nom_fichier)
+    try:
+        image = pygame.image.load(chemin)
+        if convertir:
+            image = image.convert_alpha()
+        if taille:
+            image = pygame.transform.scale(image, taille)
+        return image
+    except FileNotFoundError:
+        print(f"⚠️ Fichier introuvable : {chemin}")
+        image = pygame.Surface((64, 64))
+        image.fill((255, 0, 0))
+        return image
+
+
+def charger_sprites():
+    """Charge tous les sprites du jeu (la fenêtre doit déjà exister pour convert_alpha)"""
+    return {nom: charger_sprite(fichier, taille) for nom, (fichier, taille) in SPRITES.items()}
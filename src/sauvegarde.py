@@ -0,0 +1,391 @@
+"""Sauvegardes de l'état complet d'une partie dans un format binaire compact et versionné.
+
+Les entités sont rangées dans des tableaux NumPy à champs fixes ; les sprites et les textes
+sont des indices dans une table de chaînes. L'écriture (compression et disque) se fait dans
+un thread, la lecture reconstruit la partie dans un EtatJeu existant.
+"""
+import os
+import queue
+import struct
+import threading
+import zlib
+
+import numpy as np
+
+from ciblage import PRIORITES
+from simulation import Tour
+
+DOSSIER_SAUVEGARDES = "sauvegardes"
+SAUVEGARDE_RAPIDE = os.path.join(DOSSIER_SAUVEGARDES, "rapide.sav")
+SAUVEGARDE_AUTO = os.path.join(DOSSIER_SAUVEGARDES, "auto.sav")
+
+ENTETE = struct.Struct("<4sBI")  # Signature, version, taille du corps décompressé
+SIGNATURE = b"TDSV"
+VERSION_SAUVEGARDE = 3
+
+# Partie, vagues, héros, nombre d'entités par tableau et générateurs aléatoires
+SCALAIRES = struct.Struct(
+    "<q"        # Tick
+    "iiiii"     # Argent, vie de la base, vague, monstres par vague, kills
+    "ddii"      # Délai entre monstres, dernière apparition, monstres envoyés, monstres vivants
+    "??B?q?"    # Vague en cours, game over, priorité des tours, graine présente, graine, impacts planifiés
+    "dddddq?i"  # Héros : x, y, vie, vie max, dernier tir, dégâts infligés, actif, cible
+    "IIIIIII"   # Chaînes (octets), monstres, tours, projectiles, effets, textes, particules
+    "?d"        # random.Random : gauss en attente, sa valeur
+    "16s16sBI"  # Générateur NumPy des particules (PCG64) : état, incrément, has_uint32, uinteger
+)
+ETAT_MT = np.dtype('<u4')  # Les 625 mots de l'état de random.Random
+
+# Drapeaux des monstres
+ACTIF = 1
+ARRIVE = 2
+RECOMPENSE_DONNEE = 4
+
+MONSTRE = np.dtype([
+    ('sprite', '<u2'), ('vitesse', '<f8'), ('vie_max', '<i4'), ('vie', '<i4'),
+    ('progres', '<f8'), ('x', '<f8'), ('y', '<f8'), ('drapeaux', 'u1'),
+])
+TOUR = np.dtype([
+    ('sprite', '<u2'), ('x', '<f8'), ('y', '<f8'), ('portee', '<i4'), ('degats', '<i4'), ('cadence', '<f8'),
+    ('dernier_tir', '<f8'), ('degats_infliges', '<i8'), ('cible', '<i4'), ('priorite', 'u1'),
+])
+# Source d'un projectile : indice de la tour, ou l'une de ces valeurs
+SANS_SOURCE = -1
+SOURCE_HERO = -2
+SANS_IMPACT = -1  # Projectile qui poursuit sa cible (pas d'impact planifié)
+PROJECTILE = np.dtype([
+    ('x', '<f8'), ('y', '<f8'), ('cible', '<i4'), ('sprite', '<u2'), ('degats', '<i4'),
+    ('vitesse', '<f8'), ('source', '<i4'), ('actif', 'u1'),
+    ('tick_depart', '<i8'), ('tick_impact', '<i8'), ('impact_x', '<f8'), ('impact_y', '<f8'),
+])
+EFFET = np.dtype([
+    ('x', '<f8'), ('y', '<f8'), ('sprite', '<u2'), ('duree', '<f8'), ('temps_creation', '<f8'), ('actif', 'u1'),
+])
+TEXTE = np.dtype([
+    ('x', '<f8'), ('y', '<f8'), ('texte', '<u2'), ('couleur', 'u1', 3), ('taille', '<i2'), ('vitesse_y', '<f8'),
+    ('duree', '<f8'), ('temps_creation', '<f8'), ('actif', 'u1'),
+])
+
+# ========================================
+# ENCODAGE
+# ========================================
+
+class TableChaines:
+    """Noms de sprites et textes affichés : chaque chaîne distincte est stockée une fois"""
+
+    def __init__(self):
+        self.indices = {}
+
+    def __call__(self, chaine):
+        indice = self.indices.get(chaine)
+        if indice is None:
+            indice = self.indices[chaine] = len(self.indices)
+        return indice
+
+    def encoder(self):
+        return "\0".join(self.indices).encode("utf-8")
+
+
+def indice_cible(cible, indices_monstres):
+    """Indice du monstre visé, -1 si aucun (ou s'il n'est plus dans la partie)"""
+    return indices_monstres.get(id(cible), -1) if cible is not None else -1
+
+
+def capturer(etat):
+    """Fige l'état de la partie en octets non compressés (thread principal, entre deux ticks)"""
+    chaine = TableChaines()
+    indices_monstres = {id(monstre): i for i, monstre in enumerate(etat.liste_monstres)}
+    indices_tours = {id(tour): i for i, tour in enumerate(etat.liste_tours)}
+    hero = etat.hero
+
+    monstres = np.array([
+        (chaine(m.sprite), m.vitesse, m.vie_max, m.vie, m.progres, m.x, m.y,
+         m.actif * ACTIF | m.arrive * ARRIVE | m.recompense_donnee * RECOMPENSE_DONNEE)
+        for m in etat.liste_monstres
+    ], dtype=MONSTRE)
+    tours = np.array([
+        (chaine(t.sprite), t.x, t.y, t.portee, t.degats, t.cadence, t.dernier_tir, t.degats_infliges,
+         indice_cible(t.cible, indices_monstres), PRIORITES.index(t.priorite))
+        for t in etat.liste_tours
+    ], dtype=TOUR)
+
+    def source(projectile):
+        if projectile.source is hero:
+            return SOURCE_HERO
+        return indices_tours.get(id(projectile.source), SANS_SOURCE)
+
+    def impact(projectile):
+        if projectile.tick_impact is None:
+            return 0, SANS_IMPACT, 0.0, 0.0
+        return projectile.tick_depart, projectile.tick_impact, projectile.impact_x, projectile.impact_y
+
+    projectiles = np.array([
+        (p.x, p.y, indice_cible(p.cible, indices_monstres), chaine(p.sprite), p.degats, p.vitesse, source(p), p.actif)
+        + impact(p)
+        for p in etat.liste_projectiles
+    ], dtype=PROJECTILE)
+    effets = np.array([
+        (e.x, e.y, chaine(e.sprite), e.duree, e.temps_creation, e.actif)
+        for e in etat.liste_effets
+    ], dtype=EFFET)
+    textes = np.array([
+        (t.x, t.y, chaine(t.texte), t.couleur, t.taille, t.vitesse_y, t.duree, t.temps_creation, t.actif)
+        for t in etat.liste_textes_flottants
+    ], dtype=TEXTE)
+
+    particules = etat.particules
+    n = particules.nombre
+    tableaux_particules = b"".join(tableau[:n].tobytes() for tableau in particules.tableaux)
+
+    _, etat_mt, gauss = etat.rng.getstate()
+    generateur = particules.rng.bit_generator.state
+    chaines = chaine.encoder()
+
+    scalaires = SCALAIRES.pack(
+        etat.tick,
+        etat.argent, etat.vie_base, etat.vague_actuelle, etat.monstres_par_vague, etat.kills_total,
+        etat.delai_entre_monstres, etat.derniere_apparition, etat.monstres_envoyes, etat.monstres_vivants,
+        etat.vague_en_cours, etat.game_over, PRIORITES.index(etat.priorite_tours),
+        etat.graine is not None, etat.graine if etat.graine is not None else 0, etat.impacts_planifies,
+        hero.x, hero.y, hero.vie, hero.vie_max, hero.dernier_tir, hero.degats_infliges, hero.actif,
+        indice_cible(hero.cible, indices_monstres),
+        len(chaines), len(monstres), len(tours), len(projectiles), len(effets), len(textes), n,
+        gauss is not None, gauss if gauss is not None else 0.0,
+        generateur['state']['state'].to_bytes(16, "little"), generateur['state']['inc'].to_bytes(16, "little"),
+        generateur['has_uint32'], generateur['uinteger'],
+    )
+    return b"".join((
+        scalaires, np.array(etat_mt, dtype=ETAT_MT).tobytes(), chaines,
+        monstres.tobytes(), tours.tobytes(), projectiles.tobytes(), effets.tobytes(), textes.tobytes(),
+        tableaux_particules,
+    ))
+
+
+def compresser(corps):
+    """Fichier de sauvegarde : entête puis corps compressé"""
+    return ENTETE.pack(SIGNATURE, VERSION_SAUVEGARDE, len(corps)) + zlib.compress(corps, 6)
+
+
+def ecrire(chemin, donnees):
+    """Écrit le fichier de façon atomique : une sauvegarde interrompue ne remplace pas la précédente"""
+    os.makedirs(os.path.dirname(chemin) or ".", exist_ok=True)
+    temporaire = f"{chemin}.tmp"
+    with open(temporaire, "wb") as fichier:
+        fichier.write(donnees)
+    os.replace(temporaire, chemin)
+
+
+def sauvegarder(etat, chemin=SAUVEGARDE_RAPIDE):
+    """Sauvegarde immédiate, sans thread (outils, benchmarks)"""
+    ecrire(chemin, compresser(capturer(etat)))
+
+
+class EcrivainSauvegardes:
+    """Thread qui compresse et écrit les sauvegardes : le thread principal ne fait que capturer l'état"""
+
+    def __init__(self):
+        self.demandes = queue.Queue()  # (chemin, corps) ; None arrête le thread
+        self.ecrites = queue.Queue()  # (chemin, taille du fichier ou exception), lues par le thread principal
+        self.fil = threading.Thread(target=self.executer, name="sauvegardes", daemon=True)
+        self.fil.start()
+
+    def sauvegarder(self, etat, chemin=SAUVEGARDE_RAPIDE):
+        """Capture l'état maintenant ; la compression et l'écriture se feront en arrière-plan"""
+        self.demandes.put((chemin, capturer(etat)))
+
+    def executer(self):
+        while True:
+            demande = self.demandes.get()
+            if demande is None:
+                return
+            chemin, corps = demande
+            try:
+                donnees = compresser(corps)
+                ecrire(chemin, donnees)
+                self.ecrites.put((chemin, len(donnees)))
+            except OSError as erreur:
+                self.ecrites.put((chemin, erreur))
+
+    def terminees(self):
+        """Sauvegardes finies depuis le dernier appel : [(chemin, taille ou exception)]"""
+        terminees = []
+        while True:
+            try:
+                terminees.append(self.ecrites.get_nowait())
+            except queue.Empty:
+                return terminees
+
+    def fermer(self):
+        """Attend la fin des écritures en cours (à la fermeture du jeu)"""
+        self.demandes.put(None)
+        self.fil.join()
+
+# ========================================
+# LECTURE
+# ========================================
+
+def lire(chemin):
+    """Corps décompressé d'un fichier de sauvegarde"""
+    with open(chemin, "rb") as fichier:
+        donnees = fichier.read()
+    signature, version, taille = ENTETE.unpack_from(donnees)
+    if signature != SIGNATURE or version != VERSION_SAUVEGARDE:
+        raise ValueError("Ce fichier n'est pas une sauvegarde de cette version du jeu")
+    corps = zlib.decompress(donnees[ENTETE.size:])
+    if len(corps) != taille:
+        raise ValueError("Sauvegarde tronquée")
+    return corps
+
+
+def restaurer(etat, corps):
+    """Remplace la partie en cours de `etat` par celle du corps de sauvegarde
+
+    La carte, les pools et l'horloge (pas et accélération) de `etat` sont conservés.
+    """
+    (tick, argent, vie_base, vague, monstres_par_vague, kills, delai, derniere_apparition, envoyes, vivants,
+     vague_en_cours, game_over, priorite, avec_graine, graine, impacts_planifies,
+     hero_x, hero_y, hero_vie, hero_vie_max, hero_dernier_tir, hero_degats, hero_actif, hero_cible,
+     taille_chaines, nb_monstres, nb_tours, nb_projectiles, nb_effets, nb_textes, nb_particules,
+     avec_gauss, gauss, etat_pcg, inc_pcg, has_uint32, uinteger) = SCALAIRES.unpack_from(corps)
+
+    position = SCALAIRES.size
+
+    def tableau(dtype, nombre):
+        nonlocal position
+        valeurs = np.frombuffer(corps, dtype, nombre, position)
+        position += dtype.itemsize * nombre
+        return valeurs
+
+    etat_mt = tableau(ETAT_MT, 625)
+    chaines = corps[position:position + taille_chaines].decode("utf-8").split("\0")
+    position += taille_chaines
+    monstres = tableau(MONSTRE, nb_monstres)
+    tours = tableau(TOUR, nb_tours)
+    projectiles = tableau(PROJECTILE, nb_projectiles)
+    effets = tableau(EFFET, nb_effets)
+    textes = tableau(TEXTE, nb_textes)
+
+    # Les entités de la partie en cours retournent dans leurs pools
+    for liste, pool in ((etat.liste_monstres, etat.pool_monstres), (etat.liste_projectiles, etat.pool_projectiles),
+                        (etat.liste_effets, etat.pool_effets), (etat.liste_textes_flottants, etat.pool_textes)):
+        for objet in liste:
+            pool.liberer(objet)
+        liste.clear()
+
+    # Partie et vagues
+    etat.horloge.tick = tick
+    etat.horloge.temps = tick * etat.horloge.pas
+    etat.horloge.accumulateur = 0.0
+    etat.graine = graine if avec_graine else None
+    etat.argent = argent
+    etat.vie_base = vie_base
+    etat.vague_actuelle = vague
+    etat.monstres_par_vague = monstres_par_vague
+    etat.kills_total = kills
+    etat.delai_entre_monstres = delai
+    etat.derniere_apparition = derniere_apparition
+    etat.monstres_envoyes = envoyes
+    etat.monstres_vivants = vivants
+    etat.vague_en_cours = vague_en_cours
+    etat.game_over = game_over
+    etat.priorite_tours = PRIORITES[priorite]
+    etat.impacts_planifies = impacts_planifies
+    etat.sons = []
+    etat.rng.setstate((3, tuple(etat_mt.tolist()), gauss if avec_gauss else None))
+
+    # Monstres
+    liste_monstres = etat.liste_monstres
+    acquerir = etat.pool_monstres.acquerir
+    for sprite, vitesse, vie_max, vie, progres, x, y, drapeaux in monstres.tolist():
+        monstre = acquerir(etat.chemin, chaines[sprite], vitesse, vie_max)
+        monstre.vie = vie
+        monstre.progres = progres
+        monstre.x = x
+        monstre.y = y
+        monstre.actif = bool(drapeaux & ACTIF)
+        monstre.arrive = bool(drapeaux & ARRIVE)
+        monstre.recompense_donnee = bool(drapeaux & RECOMPENSE_DONNEE)
+        liste_monstres.append(monstre)
+
+    def cible(indice):
+        return liste_monstres[indice] if indice >= 0 else None
+
+    # Tours (leurs intervalles de portée sont recalculés sur le chemin)
+    etat.liste_tours.clear()
+    for sprite, x, y, portee, degats, cadence, dernier_tir, degats_infliges, indice, priorite_tour in tours.tolist():
+        tour = Tour(x, y, chaines[sprite], portee, degats, cadence, etat.chemin, PRIORITES[priorite_tour])
+        tour.dernier_tir = dernier_tir
+        tour.degats_infliges = degats_infliges
+        tour.cible = cible(indice)
+        etat.liste_tours.append(tour)
+    etat.placement.reconstruire(etat.liste_tours)
+    etat.version_tours += 1
+
+    # Héros
+    hero = etat.hero
+    hero.x = hero_x
+    hero.y = hero_y
+    hero.vie = hero_vie
+    hero.vie_max = hero_vie_max
+    hero.dernier_tir = hero_dernier_tir
+    hero.degats_infliges = hero_degats
+    hero.actif = hero_actif
+    hero.cible = cible(hero_cible)
+
+    # Projectiles (les impacts planifiés retournent dans le tas, dans l'ordre des tirs)
+    etat.impacts.clear()
+    acquerir = etat.pool_projectiles.acquerir
+    for (x, y, indice, sprite, degats, vitesse, source, actif,
+         tick_depart, tick_impact, impact_x, impact_y) in projectiles.tolist():
+        if source == SOURCE_HERO:
+            tireur = hero
+        else:
+            tireur = etat.liste_tours[source] if source >= 0 else None
+        projectile = acquerir(x, y, cible(indice), chaines[sprite], degats, vitesse, tireur)
+        if not actif or projectile.cible is None:
+            # Monstre disparu de la partie : le projectile est perdu
+            etat.pool_projectiles.liberer(projectile)
+            continue
+        if tick_impact != SANS_IMPACT:
+            projectile.tick_depart = tick_depart
+            projectile.tick_impact = tick_impact
+            projectile.impact_x = impact_x
+            projectile.impact_y = impact_y
+            etat.ajouter_impact(projectile)
+        etat.liste_projectiles.append(projectile)
+
+    # Effets et textes flottants
+    acquerir = etat.pool_effets.acquerir
+    for x, y, sprite, duree, temps_creation, actif in effets.tolist():
+        effet = acquerir(x, y, chaines[sprite], temps_creation, duree)
+        effet.actif = bool(actif)
+        etat.liste_effets.append(effet)
+    acquerir = etat.pool_textes.acquerir
+    for x, y, texte, couleur, taille, vitesse_y, duree, temps_creation, actif in textes.tolist():
+        texte_flottant = acquerir(x, y, chaines[texte], temps_creation, tuple(couleur), taille, duree)
+        texte_flottant.vitesse_y = vitesse_y
+        texte_flottant.actif = bool(actif)
+        etat.liste_textes_flottants.append(texte_flottant)
+
+    # Particules : les tableaux gardent leur capacité, seules les particules vivantes sont copiées
+    particules = etat.particules
+    for destination in particules.tableaux:
+        destination[:nb_particules] = tableau(destination.dtype, nb_particules)
+    particules.nombre = nb_particules
+    generateur = particules.rng.bit_generator.state
+    generateur['state'] = {'state': int.from_bytes(etat_pcg, "little"), 'inc': int.from_bytes(inc_pcg, "little")}
+    generateur['has_uint32'] = has_uint32
+    generateur['uinteger'] = uinteger
+    particules.rng.bit_generator.state = generateur
+
+    # Index reconstruits comme à la fin d'un tick
+    etat.grille_monstres.reconstruire(liste_monstres)
+    etat.index_chemin.reconstruire(liste_monstres)
+
+    # Recharges, apparitions et fins d'effets replanifiées d'après leurs dates
+    etat.replanifier()
+
+
+def charger(etat, chemin=SAUVEGARDE_RAPIDE):
+    """Recharge dans `etat` la partie sauvegardée dans ce fichier"""
+    restaurer(etat, lire(chemin))
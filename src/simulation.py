@@ -0,0 +1,940 @@
+import heapq
+import math
+import random
+from operator import attrgetter
+
+import numpy as np
+
+from carte import charger_carte_logique, creer_chemin_manuel, obtenir_points_speciaux
+from chemin import Chemin
+from ciblage import IndexChemin, PRIORITES, intervalles_portee
+from grille_spatiale import GrilleSpatiale
+from horloge import HorlogeSimulation
+from particules import SystemeParticules, COULEUR_ROUGE
+from placement import GrilleOccupation
+from planificateur import Planificateur
+from pool import Pool, compacter
+
+# ========================================
+# CONSTANTES DU JEU
+# ========================================
+
+LARGEUR = 1280
+HAUTEUR = 960
+
+# Prix des tours
+PRIX_TOUR_CANON = 50
+PRIX_TOUR_LASER = 100
+
+# Caractéristiques des tours : (sprite, portée, dégâts, cadence)
+TYPES_TOURS = {
+    'canon': ('tour_canon', 150, 25, 1.0),
+    'laser': ('tour_laser', 200, 15, 0.5),
+}
+
+# Limite maximale de particules actives
+MAX_PARTICULES = 4096
+
+# Vitesses en pixels par seconde, durées en secondes de simulation
+DEGATS_CONTACT_PAR_SECONDE = 30  # Dégâts infligés au héros par un monstre au contact
+PARTICULES_CONTACT_PAR_SECONDE = 6  # Fréquence moyenne des gerbes de particules au contact
+RAYON_IMPACT = 10  # Distance à laquelle un projectile touche sa cible
+
+# Événements du planificateur : (genre, objet)
+TOUR_PRETE = 0  # La tour a fini de recharger
+APPARITION = 1  # Prochain monstre de la vague (objet : numéro de l'apparition attendue)
+FIN_EFFET = 2
+FIN_TEXTE = 3
+
+# ========================================
+# CLASSE MONSTRE
+# ========================================
+
+class Monstre:
+    """Représente un monstre ennemi"""
+
+    __slots__ = ('chemin', 'sprite', 'vitesse', 'vie_max', 'vie', 'x', 'y',
+                 'progres', 'actif', 'arrive', 'recompense_donnee', 'impacts_prevus')
+
+    portee_contact = 50  # Distance à laquelle le monstre blesse le héros
+
+    def __init__(self, chemin, sprite, vitesse=120, vie=100):
+        self.initialiser(chemin, sprite, vitesse, vie)
+
+    def initialiser(self, chemin, sprite, vitesse=120, vie=100):
+        """(Ré)initialise le monstre, à la création ou à la sortie du pool"""
+        self.chemin = chemin  # Chemin compilé (longueurs cumulées)
+        self.sprite = sprite  # Nom du sprite (résolu par le rendu)
+        self.vitesse = vitesse  # Pixels par seconde
+        self.vie_max = vie
+        self.vie = vie
+        self.progres = 0.0  # Distance parcourue depuis l'entrée (pixels)
+        self.x, self.y = chemin.points[0]
+        self.actif = True
+        self.arrive = False
+        self.recompense_donnee = False
+        self.impacts_prevus = []  # (numéro, projectile) des impacts planifiés sur ce monstre
+
+    def avancer(self, dt):
+        """Fait progresser le monstre sur le chemin pendant dt secondes, sans recalculer sa position"""
+        if not self.actif or self.arrive:
+            return
+
+        self.progres += self.vitesse * dt
+        if self.progres >= self.chemin.longueur:
+            self.progres = self.chemin.longueur
+            self.x, self.y = self.chemin.points[-1]
+            self.arrive = True
+            self.actif = False
+
+    def prendre_degats(self, degats, etat):
+        """Inflige des dégâts au monstre"""
+        self.vie -= degats
+        if self.vie <= 0:
+            self.vie = 0
+            if self.actif:
+                etat.monstres_vivants -= 1
+            self.actif = False
+        etat.sons.append('degats')
+
+    def attaquer_hero(self, hero, etat):
+        """Attaque le héros s'il est proche"""
+        if not self.actif or not hero.actif:
+            return False
+
+        dx = hero.x - self.x
+        dy = hero.y - self.y
+
+        # Si le héros est très proche
+        if dx * dx + dy * dy < self.portee_contact * self.portee_contact:
+            dt = etat.horloge.pas
+            hero.prendre_degats(DEGATS_CONTACT_PAR_SECONDE * dt)
+
+            # Créer quelques particules rouges (10% de chance par pas à 60 FPS)
+            if etat.rng.random() < PARTICULES_CONTACT_PAR_SECONDE * dt:
+                etat.particules.emettre(hero.x, hero.y, 3, couleur=COULEUR_ROUGE)
+
+            return True
+        return False
+
+# ========================================
+# CLASSE PROJECTILE
+# ========================================
+
+class Projectile:
+    """Représente un projectile tiré par une tour"""
+
+    __slots__ = ('x', 'y', 'cible', 'sprite', 'degats', 'vitesse', 'actif', 'source',
+                 'tick_depart', 'tick_impact', 'impact_x', 'impact_y', 'numero')
+
+    def __init__(self, x, y, cible, sprite, degats, vitesse=480, source=None):
+        self.initialiser(x, y, cible, sprite, degats, vitesse, source)
+
+    def initialiser(self, x, y, cible, sprite, degats, vitesse=480, source=None):
+        """(Ré)initialise le projectile, à la création ou à la sortie du pool"""
+        self.x = x
+        self.y = y
+        self.cible = cible
+        self.sprite = sprite
+        self.degats = degats
+        self.vitesse = vitesse  # Pixels par seconde
+        self.actif = True
+        self.source = source  # Tour ou héros qui a tiré (statistiques de dégâts)
+
+        # Impact planifié (mode EtatJeu.impacts_planifies) : x, y restent le point de départ
+        self.tick_depart = 0
+        self.tick_impact = None  # None : le projectile poursuit sa cible tick par tick
+        self.impact_x = x
+        self.impact_y = y
+        self.numero = 0  # Numéro de l'impact planifié (un impact d'un projectile recyclé est ignoré)
+
+    def position_affichee(self, tick):
+        """Position à dessiner : la position courante, ou l'interpolation vers le point d'impact prévu"""
+        if self.tick_impact is None:
+            return self.x, self.y
+        duree = self.tick_impact - self.tick_depart
+        avancement = min((tick - self.tick_depart) / duree, 1.0) if duree > 0 else 1.0
+        return self.x + (self.impact_x - self.x) * avancement, self.y + (self.impact_y - self.y) * avancement
+
+    def toucher(self, etat):
+        """Inflige les dégâts à la cible, avec texte flottant et particules d'impact"""
+        # Créer un texte flottant pour les dégâts
+        texte_degats = etat.pool_textes.acquerir(
+            self.cible.x,
+            self.cible.y - 20,
+            f"-{self.degats}",
+            etat.temps,
+            (255, 100, 100)
+        )
+        etat.ajouter_texte(texte_degats)
+
+        # Créer quelques particules d'impact
+        etat.particules.emettre(self.cible.x, self.cible.y, 5)
+
+        # Infliger les dégâts (seuls ceux qui entament la vie comptent pour le tireur)
+        vie_avant = self.cible.vie
+        self.cible.prendre_degats(self.degats, etat)
+        if self.source is not None:
+            self.source.degats_infliges += vie_avant - self.cible.vie
+        self.actif = False
+
+    def deplacer(self, etat):
+        """Déplace le projectile vers sa cible"""
+        if not self.actif or not self.cible.actif:
+            self.actif = False
+            return
+
+        dx = self.cible.x - self.x
+        dy = self.cible.y - self.y
+        distance = (dx**2 + dy**2)**0.5
+
+        if distance < RAYON_IMPACT:
+            self.toucher(etat)
+            return
+
+        pas = self.vitesse * etat.horloge.pas
+        self.x += (dx / distance) * pas
+        self.y += (dy / distance) * pas
+
+# ========================================
+# CLASSE EFFET VISUEL
+# ========================================
+
+class Effet:
+    """Représente un effet visuel temporaire (explosion, etc.)"""
+
+    __slots__ = ('x', 'y', 'sprite', 'duree', 'temps_creation', 'actif')
+
+    def __init__(self, x, y, sprite, temps, duree=0.3):
+        self.initialiser(x, y, sprite, temps, duree)
+
+    def initialiser(self, x, y, sprite, temps, duree=0.3):
+        """(Ré)initialise l'effet, à la création ou à la sortie du pool"""
+        self.x = x
+        self.y = y
+        self.sprite = sprite
+        self.duree = duree  # Durée en secondes
+        self.temps_creation = temps
+        self.actif = True  # Passe à False à son échéance, posée dans le planificateur
+
+    def opacite(self, temps):
+        """Opacité à dessiner (fade out progressif jusqu'à la fin de l'effet)"""
+        progression = min((temps - self.temps_creation) / self.duree, 1.0)
+        return int(255 * (1 - progression))
+
+# ========================================
+# CLASSE TEXTE FLOTTANT
+# ========================================
+
+class TexteFlottant:
+    """Représente un texte qui monte et disparaît (dégâts, argent, etc.)"""
+
+    __slots__ = ('x', 'y', 'texte', 'couleur', 'taille', 'vitesse_y', 'duree', 'temps_creation', 'actif')
+
+    def __init__(self, x, y, texte, temps, couleur=(255, 0, 0), taille=28, duree=1.0):
+        self.initialiser(x, y, texte, temps, couleur, taille, duree)
+
+    def initialiser(self, x, y, texte, temps, couleur=(255, 0, 0), taille=28, duree=1.0):
+        """(Ré)initialise le texte, à la création ou à la sortie du pool"""
+        self.x = x
+        self.y = y
+        self.texte = texte
+        self.couleur = couleur
+        self.taille = taille  # Taille de police, le rendu crée la surface
+        self.vitesse_y = -120  # Monte vers le haut (pixels par seconde)
+        self.duree = duree
+        self.temps_creation = temps
+        self.actif = True  # Passe à False à son échéance, posée dans le planificateur
+
+    def position_affichee(self, temps):
+        """Position à dessiner : le texte monte depuis son point de création"""
+        return self.x, self.y + self.vitesse_y * (temps - self.temps_creation)
+
+    def opacite(self, temps):
+        """Opacité à dessiner (fade out)"""
+        progression = min((temps - self.temps_creation) / self.duree, 1.0)
+        return int(255 * (1 - progression))
+
+# ========================================
+# CLASSE TOUR
+# ========================================
+
+class Tour:
+    """Représente une tour défensive"""
+
+    def __init__(self, x, y, sprite, portee=150, degats=25, cadence=1.0, chemin=None, priorite='proche'):
+        self.x = x
+        self.y = y
+        self.sprite = sprite
+        self.portee = portee
+        self.degats = degats
+        self.cadence = cadence
+        self.dernier_tir = -math.inf
+        self.cible = None
+        self.degats_infliges = 0
+        self.priorite = priorite  # 'proche', 'premier', 'dernier' ou 'fort'
+        self.numero = 0  # Rang dans EtatJeu.liste_tours : les tours prêtes au même tick tirent dans cet ordre
+
+        # La tour ne bouge pas : les parties du chemin dans sa portée sont calculées une fois
+        self.intervalles = intervalles_portee(chemin, x, y, portee) if chemin is not None else []
+
+    def trouver_cible(self, index_chemin):
+        """Trouve la cible prioritaire parmi les monstres du chemin dans la portée"""
+        return index_chemin.cibler(self.intervalles, self.priorite, self.x, self.y)
+
+    def tirer(self, etat):
+        """Tire sur la cible si possible ; retourne True si le tir est parti"""
+        if self.cible and self.cible.actif:
+            projectile = etat.pool_projectiles.acquerir(
+                self.x, self.y,
+                self.cible,
+                'projectile',
+                self.degats,
+                source=self
+            )
+            etat.lancer_projectile(projectile)
+            self.dernier_tir = etat.temps
+            etat.sons.append('tir')
+            return True
+        return False
+
+    def mettre_a_jour(self, etat):
+        """Met à jour la tour rechargée (le planificateur la réveille) ; retourne True si elle a tiré"""
+        self.cible = self.trouver_cible(etat.index_chemin)
+        if self.cible:
+            return self.tirer(etat)
+        return False
+
+# ========================================
+# CLASSE HÉROS
+# ========================================
+
+class Hero:
+    """Représente le héros contrôlable par le joueur"""
+
+    def __init__(self, x, y, sprite):
+        self.x = x
+        self.y = y
+        self.sprite = sprite
+        self.vitesse = 240  # Vitesse de déplacement (pixels par seconde)
+
+        # Combat
+        self.vie_max = 100
+        self.vie = 100
+        self.portee = 120  # Portée d'attaque
+        self.degats = 20
+        self.cadence = 0.8  # Temps entre chaque tir
+        self.dernier_tir = -math.inf
+        self.cible = None
+        self.degats_infliges = 0
+
+        # État
+        self.actif = True
+
+    def deplacer(self, direction, dt):
+        """Déplace le héros dans la direction demandée ((-1, 0, 1) sur chaque axe)"""
+        if not self.actif:
+            return
+
+        direction_x, direction_y = direction
+        self.x += direction_x * self.vitesse * dt
+        self.y += direction_y * self.vitesse * dt
+
+        # Limiter aux bords de l'écran
+        self.x = max(32, min(LARGEUR - 32, self.x))
+        self.y = max(32, min(HAUTEUR - 32, self.y))
+
+    def trouver_cible(self, grille_monstres):
+        """Trouve le monstre le plus proche dans la portée"""
+        return grille_monstres.plus_proche(self.x, self.y, self.portee)
+
+    def attaquer(self, etat):
+        """Tire sur la cible si possible"""
+        if etat.temps - self.dernier_tir >= self.cadence:
+            if self.cible and self.cible.actif:
+                # Créer un projectile spécial pour le héros
+                projectile = etat.pool_projectiles.acquerir(
+                    self.x, self.y,
+                    self.cible,
+                    'projectile',
+                    self.degats,
+                    vitesse=600,  # Plus rapide que les tours
+                    source=self
+                )
+                etat.lancer_projectile(projectile)
+                self.dernier_tir = etat.temps
+
+    def mettre_a_jour(self, direction, etat):
+        """Met à jour le héros (déplacement + attaque)"""
+        if not self.actif:
+            return
+
+        self.deplacer(direction, etat.horloge.pas)
+        self.cible = self.trouver_cible(etat.grille_monstres)
+
+        if self.cible:
+            self.attaquer(etat)
+
+    def prendre_degats(self, degats):
+        """Le héros prend des dégâts"""
+        self.vie -= degats
+        if self.vie <= 0:
+            self.vie = 0
+            self.actif = False
+
+# ========================================
+# ÉTAT DU JEU
+# ========================================
+
+class EtatJeu:
+    """Simulation complète d'une partie, sans fenêtre, sans son et sans limite de FPS"""
+
+    def __init__(self, carte_tmx=None, graine=None, verbeux=False, horloge=None, impacts_planifies=False):
+        # Horloge à pas fixe : tous les minuteurs et déplacements s'y réfèrent
+        self.horloge = horloge if horloge is not None else HorlogeSimulation()
+        if carte_tmx is None:
+            carte_tmx = charger_carte_logique()
+        self.points = obtenir_points_speciaux(carte_tmx)
+        self.chemin_monstres = creer_chemin_manuel(carte_tmx)
+        self.chemin = Chemin(self.chemin_monstres)
+        # Positions interdites aux tours (couche chemin, tracé, tours posées), au pixel près
+        self.placement = GrilleOccupation(LARGEUR, HAUTEUR, self.chemin_monstres, carte_tmx)
+        self.verbeux = verbeux
+        self.graine = graine
+        self.chrono = None  # Chronometre des phases de avancer() (None : aucune mesure)
+        self.enregistreur = None  # Enregistreur de rejeu des entrées du joueur (None : rien n'est noté)
+        # Impacts calculés au tir au lieu de faire poursuivre la cible à chaque projectile
+        self.impacts_planifies = impacts_planifies
+
+        # Réserves d'entités recyclées (créées et détruites en permanence pendant les vagues)
+        self.pool_monstres = Pool(Monstre)
+        self.pool_projectiles = Pool(Projectile)
+        self.pool_effets = Pool(Effet)
+        self.pool_textes = Pool(TexteFlottant)
+
+        # Incrémenté à chaque changement de la liste des tours (les calques qui en dépendent s'y comparent)
+        self.version_tours = 0
+
+        self.reinitialiser()
+
+    @property
+    def temps(self):
+        """Temps de simulation écoulé (secondes)"""
+        return self.horloge.temps
+
+    @property
+    def tick(self):
+        """Nombre de pas de simulation effectués"""
+        return self.horloge.tick
+
+    def journal(self, message):
+        """Affiche un message de suivi en mode verbeux"""
+        if self.verbeux:
+            print(message)
+
+    def reinitialiser(self):
+        """Remet la partie à zéro"""
+        self.rng = random.Random(self.graine)
+        self.horloge.reinitialiser()
+
+        # Listes des entités
+        self.liste_monstres = []
+        self.liste_tours = []
+        self.placement.reconstruire(self.liste_tours)
+        self.version_tours += 1
+        self.liste_projectiles = []
+        self.impacts = []  # Tas des impacts planifiés : (tick, numéro, projectile)
+        self.numero_impact = 0
+        self.liste_effets = []  # Liste des effets visuels
+        # Particules d'explosion, en tableaux NumPy (graine dérivée de celle de la partie)
+        self.particules = SystemeParticules(MAX_PARTICULES, graine=self.rng.getrandbits(32))
+        self.liste_textes_flottants = []  # Liste des textes flottants
+
+        # Recharges des tours, apparitions, fins des effets et des textes, rangées par tick
+        self.planificateur = Planificateur()
+        self.tours_pretes = []  # Tours rechargées qui attendent une cible
+        self.numero_apparition = 0  # Une apparition planifiée avant un redémarrage de vague est ignorée
+
+        # Index spatial des monstres, reconstruit une fois par tick après leur déplacement
+        self.grille_monstres = GrilleSpatiale(taille_cellule=128)
+        # Monstres triés par progression sur le chemin, pour le ciblage des tours
+        self.index_chemin = IndexChemin()
+        # Priorité de ciblage des tours (changée pour toutes les tours à la fois)
+        self.priorite_tours = 'proche'
+
+        # Sons déclenchés pendant le dernier tick ('tir', 'explosion', 'degats')
+        self.sons = []
+
+        # Ressources du joueur
+        self.argent = 200
+        self.vie_base = 20
+
+        # Système de vagues
+        self.vague_actuelle = 1
+        self.monstres_par_vague = 5
+        self.delai_entre_monstres = 1.5
+        self.derniere_apparition = 0
+        self.monstres_envoyes = 0
+        self.monstres_vivants = 0  # Tenu à jour aux apparitions, morts et arrivées
+        self.vague_en_cours = False
+
+        # État du jeu
+        self.game_over = False
+        self.kills_total = 0  # Compteur de monstres tués
+
+        # Créer le héros au centre de la carte
+        self.hero = Hero(LARGEUR // 2, HAUTEUR // 2, 'hero')
+
+    # ----------------------------------------
+    # Planification
+    # ----------------------------------------
+
+    def tick_echeance(self, debut, duree):
+        """Premier tick où `temps - debut >= duree` (le test que faisaient les minuteurs à chaque tick)"""
+        if debut == -math.inf:
+            return self.tick
+        pas = self.horloge.pas
+        tick = max(math.floor((debut + duree) / pas) - 1, 0)
+        while tick * pas - debut < duree:
+            tick += 1
+        return tick
+
+    def planifier_apparition(self):
+        """Planifie le prochain monstre de la vague, `delai_entre_monstres` après le précédent"""
+        self.numero_apparition += 1
+        echeance = self.tick_echeance(self.derniere_apparition, self.delai_entre_monstres)
+        self.planificateur.planifier(echeance, (APPARITION, self.numero_apparition))
+
+    def armer_tour(self, tour):
+        """Réveille la tour quand sa cadence est écoulée depuis son dernier tir"""
+        echeance = self.tick_echeance(tour.dernier_tir, tour.cadence)
+        self.planificateur.planifier(echeance, (TOUR_PRETE, tour))
+
+    def ajouter_tour(self, tour):
+        """Ajoute une tour à la partie"""
+        tour.numero = len(self.liste_tours)
+        self.liste_tours.append(tour)
+        self.version_tours += 1
+        self.armer_tour(tour)
+
+    def ajouter_effet(self, effet):
+        """Ajoute un effet visuel et planifie sa fin"""
+        self.liste_effets.append(effet)
+        echeance = self.tick_echeance(effet.temps_creation, effet.duree)
+        self.planificateur.planifier(echeance, (FIN_EFFET, effet))
+
+    def ajouter_texte(self, texte):
+        """Ajoute un texte flottant et planifie sa fin"""
+        self.liste_textes_flottants.append(texte)
+        echeance = self.tick_echeance(texte.temps_creation, texte.duree)
+        self.planificateur.planifier(echeance, (FIN_TEXTE, texte))
+
+    def replanifier(self):
+        """Reconstruit tous les événements d'après l'état de la partie (sauvegarde rechargée)"""
+        self.planificateur = Planificateur(self.tick)
+        self.tours_pretes = []
+        for numero, tour in enumerate(self.liste_tours):
+            tour.numero = numero
+            self.armer_tour(tour)
+        if self.vague_en_cours and self.monstres_envoyes < self.monstres_par_vague:
+            self.planifier_apparition()
+
+        effets, self.liste_effets = self.liste_effets, []
+        for effet in effets:
+            self.ajouter_effet(effet)
+        textes, self.liste_textes_flottants = self.liste_textes_flottants, []
+        for texte in textes:
+            self.ajouter_texte(texte)
+
+    # ----------------------------------------
+    # Vagues
+    # ----------------------------------------
+
+    def demarrer_vague(self):
+        """Démarre une nouvelle vague"""
+        if self.enregistreur is not None:
+            self.enregistreur.noter_vague(self.tick)
+        self.vague_en_cours = True
+        self.monstres_envoyes = 0
+        self.derniere_apparition = self.temps
+        self.planifier_apparition()
+        self.journal(f"🌊 Vague {self.vague_actuelle} démarre ! ({self.monstres_par_vague} monstres)")
+
+        # Message visuel au centre de l'écran, plus gros et plus long
+        texte_vague_debut = self.pool_textes.acquerir(
+            LARGEUR // 2,
+            HAUTEUR // 3,
+            f"VAGUE {self.vague_actuelle}",
+            self.temps,
+            (255, 255, 100),
+            taille=64,
+            duree=2.0
+        )
+        self.ajouter_texte(texte_vague_debut)
+
+    def generer_monstre(self):
+        """Génère le monstre dont l'apparition arrive à échéance, puis planifie le suivant"""
+        vague_actuelle = self.vague_actuelle
+
+        # Progression plus douce de la difficulté
+        if vague_actuelle <= 3:
+            # Vagues 1-3 : Faciles
+            sprite = 'monstre_1'
+            vitesse = 120
+            vie = 80 + (vague_actuelle * 10)  # 90, 100, 110
+        elif vague_actuelle <= 6:
+            # Vagues 4-6 : Mélange
+            if self.monstres_envoyes % 2 == 0:
+                sprite = 'monstre_1'
+                vitesse = 150
+                vie = 100 + (vague_actuelle * 8)
+            else:
+                sprite = 'monstre_2'
+                vitesse = 210
+                vie = 80 + (vague_actuelle * 8)
+        else:
+            # Vagues 7+ : Difficiles
+            if self.monstres_envoyes % 3 == 0:
+                # Boss occasionnel
+                sprite = 'monstre_2'
+                vitesse = 180
+                vie = 200 + (vague_actuelle * 15)
+            else:
+                sprite = 'monstre_1'
+                vitesse = 120 + (vague_actuelle * 6)
+                vie = 120 + (vague_actuelle * 10)
+
+        nouveau_monstre = self.pool_monstres.acquerir(self.chemin, sprite, vitesse, vie)
+        self.liste_monstres.append(nouveau_monstre)
+        self.grille_monstres.inserer(nouveau_monstre)
+
+        self.monstres_envoyes += 1
+        self.monstres_vivants += 1
+        self.derniere_apparition = self.temps
+        if self.monstres_envoyes < self.monstres_par_vague:
+            self.planifier_apparition()
+        self.journal(f"  Monstre {self.monstres_envoyes}/{self.monstres_par_vague} envoyé")
+
+    def verifier_fin_vague(self):
+        """Vérifie si la vague est terminée"""
+        if self.monstres_envoyes >= self.monstres_par_vague:
+            if self.monstres_vivants == 0:
+                self.vague_en_cours = False
+
+                # Message de victoire
+                texte_victoire = self.pool_textes.acquerir(
+                    LARGEUR // 2,
+                    HAUTEUR // 3,
+                    "VAGUE TERMINÉE !",
+                    self.temps,
+                    (100, 255, 100),
+                    taille=56,
+                    duree=2.0
+                )
+                self.ajouter_texte(texte_victoire)
+
+                self.vague_actuelle += 1
+
+                if self.vague_actuelle <= 5:
+                    self.monstres_par_vague += 2
+                else:
+                    self.monstres_par_vague += 1
+
+                self.journal(f"✅ Vague terminée ! Prochaine vague : {self.vague_actuelle}")
+                return True
+        return False
+
+    # ----------------------------------------
+    # Tours
+    # ----------------------------------------
+
+    def placer_tour(self, x, y, type_tour):
+        """Place une tour aux coordonnées données"""
+        if self.enregistreur is not None:
+            self.enregistreur.noter_tour(self.tick, x, y, type_tour)
+        prix = PRIX_TOUR_CANON if type_tour == 'canon' else PRIX_TOUR_LASER
+
+        if self.argent < prix:
+            self.journal(f"❌ Pas assez d'argent ! (besoin: {prix}, disponible: {self.argent})")
+            return False
+
+        sprite, portee, degats, cadence = TYPES_TOURS[type_tour]
+        nouvelle_tour = Tour(x, y, sprite, portee, degats, cadence, self.chemin, self.priorite_tours)
+        self.ajouter_tour(nouvelle_tour)
+        self.placement.ajouter_tour(x, y)
+
+        self.argent -= prix
+        self.journal(f"✅ Tour {type_tour} placée ! Argent restant: {self.argent}")
+        return True
+
+    # ----------------------------------------
+    # Projectiles
+    # ----------------------------------------
+
+    def lancer_projectile(self, projectile):
+        """Ajoute un projectile qui vient d'être tiré (et planifie son impact dans ce mode)"""
+        self.liste_projectiles.append(projectile)
+        if self.impacts_planifies:
+            self.planifier_impact(projectile)
+
+    def planifier_impact(self, projectile):
+        """Calcule une fois le tick où le projectile rattrape sa cible, d'après sa progression sur le chemin"""
+        cible = projectile.cible
+        pas = self.horloge.pas
+        temps = self.chemin.interception(cible.progres, cible.vitesse, projectile.x, projectile.y,
+                                         projectile.vitesse, RAYON_IMPACT)
+        if temps is None:
+            # La cible sort avant d'être rattrapée : le projectile disparaîtra avec elle
+            temps = self.chemin.distance_sortie(cible.progres) / cible.vitesse + pas
+        ticks = math.ceil(temps / pas - 1e-9)
+
+        projectile.tick_depart = self.tick
+        projectile.tick_impact = self.tick + ticks
+        projectile.impact_x, projectile.impact_y = self.chemin.position(cible.progres + cible.vitesse * ticks * pas)
+        self.ajouter_impact(projectile)
+
+    def ajouter_impact(self, projectile):
+        """Range l'impact déjà calculé du projectile dans le tas"""
+        self.numero_impact += 1
+        projectile.numero = self.numero_impact
+        heapq.heappush(self.impacts, (projectile.tick_impact, projectile.numero, projectile))
+        projectile.cible.impacts_prevus.append((projectile.numero, projectile))
+
+    def abandonner_impacts(self, monstre):
+        """Fait disparaître les projectiles encore en vol vers un monstre qui quitte la partie ; retourne True s'il y en avait"""
+        perdus = False
+        for numero, projectile in monstre.impacts_prevus:
+            # Un projectile déjà arrivé a pu être recyclé pour un autre tir : son numéro a changé
+            if projectile.numero == numero and projectile.actif:
+                projectile.actif = False
+                perdus = True
+        monstre.impacts_prevus.clear()
+        return perdus
+
+    def resoudre_impacts(self):
+        """Applique les impacts arrivés à échéance, sans déplacer aucun projectile ; retourne True s'il y en avait
+
+        Les projectiles dont la cible meurt ou sort sont retirés avec elle (abandonner_impacts).
+        """
+        impacts = self.impacts
+        tick = self.tick
+        termines = False
+        while impacts and impacts[0][0] <= tick:
+            _, numero, projectile = heapq.heappop(impacts)
+            if projectile.numero == numero and projectile.actif:
+                if projectile.cible is not None and projectile.cible.actif:
+                    projectile.toucher(self)
+                projectile.actif = False
+                termines = True
+        return termines
+
+    def changer_priorite(self):
+        """Passe à la priorité de ciblage suivante, pour toutes les tours"""
+        if self.enregistreur is not None:
+            self.enregistreur.noter_priorite(self.tick)
+        self.priorite_tours = PRIORITES[(PRIORITES.index(self.priorite_tours) + 1) % len(PRIORITES)]
+        for tour in self.liste_tours:
+            tour.priorite = self.priorite_tours
+        return self.priorite_tours
+
+    def verifier_position_valide(self, x, y):
+        """Vérifie si on peut placer une tour à cette position (une lecture dans la grille d'occupation)"""
+        return self.placement.valide(x, y)
+
+    # ----------------------------------------
+    # Boucle de simulation
+    # ----------------------------------------
+
+    def recompenser(self, monstre):
+        """Donne l'argent d'un monstre tué et crée son explosion"""
+        # Récompense variable selon le monstre
+        if monstre.sprite == 'monstre_2':
+            recompense = 15  # Monstre rapide vaut plus
+        else:
+            recompense = 10
+
+        # Bonus si vague avancée
+        if self.vague_actuelle > 5:
+            recompense += 5
+
+        self.argent += recompense
+        self.kills_total += 1
+        monstre.recompense_donnee = True
+        self.journal(f"💰 +{recompense}$ (Total: {self.argent}) | Kills: {self.kills_total}")
+
+        # Créer une explosion
+        explosion = self.pool_effets.acquerir(monstre.x, monstre.y, 'explosion', self.temps, duree=0.4)
+        self.ajouter_effet(explosion)
+        self.sons.append('explosion')
+
+        # Gerbe de particules (tronquée si le système est plein)
+        self.particules.emettre(monstre.x, monstre.y, self.rng.randint(15, 25))
+
+        # Texte flottant avec la vraie récompense
+        texte_argent = self.pool_textes.acquerir(
+            monstre.x,
+            monstre.y,
+            f"+{recompense}$",
+            self.temps,
+            (255, 215, 0)
+        )
+        self.ajouter_texte(texte_argent)
+
+    def deplacer_monstres(self, dt):
+        """Fait progresser tous les monstres, puis calcule leurs positions en une passe vectorisée"""
+        en_route = []
+        for monstre in self.liste_monstres:
+            monstre.avancer(dt)
+            if monstre.actif:
+                en_route.append(monstre)
+        if not en_route:
+            return
+
+        progres = np.fromiter((monstre.progres for monstre in en_route), float, len(en_route))
+        xs, ys = self.chemin.positions(progres)
+        for monstre, x, y in zip(en_route, xs.tolist(), ys.tolist()):
+            monstre.x = x
+            monstre.y = y
+
+    def avancer(self, direction=(0, 0)):
+        """Fait avancer la simulation d'un tick (direction : déplacement demandé pour le héros)"""
+        self.sons = []
+
+        if self.game_over:
+            return
+
+        if self.enregistreur is not None:
+            self.enregistreur.noter_pas(self, direction)
+
+        self.horloge.avancer()
+        dt = self.horloge.pas
+
+        # Chronomètre optionnel (benchmarks, profileur) : une marque à la fin de chaque phase
+        chrono = self.chrono
+        if chrono is not None:
+            chrono.reprendre()
+
+        # Événements arrivés à échéance : seules les entités concernées sont touchées ce tick
+        apparition = False
+        effets_finis = False
+        textes_finis = False
+        for genre, objet in self.planificateur.echeances(self.tick):
+            if genre == TOUR_PRETE:
+                self.tours_pretes.append(objet)
+            elif genre == APPARITION:
+                apparition = apparition or objet == self.numero_apparition
+            elif genre == FIN_EFFET:
+                objet.actif = False
+                effets_finis = True
+            else:
+                objet.actif = False
+                textes_finis = True
+
+        # Gestion des vagues
+        if self.vague_en_cours:
+            if apparition and self.monstres_envoyes < self.monstres_par_vague:
+                self.generer_monstre()
+            self.verifier_fin_vague()
+        if chrono is not None:
+            chrono.marquer('vagues')
+
+        # Mettre à jour le héros
+        hero = self.hero
+        hero.mettre_a_jour(direction, self)
+        if chrono is not None:
+            chrono.marquer('hero')
+
+        # Déplacer les monstres
+        self.deplacer_monstres(dt)
+
+        # Les positions ne bougent plus jusqu'au prochain tick : on indexe les monstres
+        self.grille_monstres.reconstruire(self.liste_monstres)
+        self.index_chemin.reconstruire(self.liste_monstres)
+        monstres_au_contact = set()
+        if hero.actif:
+            monstres_au_contact = set(self.grille_monstres.dans_rayon(hero.x, hero.y, Monstre.portee_contact))
+
+        projectiles_perdus = False
+        for monstre in self.liste_monstres:
+            # Attaquer le héros s'il est proche
+            if monstre in monstres_au_contact:
+                monstre.attaquer_hero(hero, self)
+
+            # Si le monstre arrive à la sortie
+            if monstre.arrive and not monstre.recompense_donnee:
+                self.monstres_vivants -= 1
+                self.vie_base -= 1
+                monstre.recompense_donnee = True
+                self.journal(f"💔 Un monstre est passé ! Vie restante: {self.vie_base}")
+                if monstre.impacts_prevus:
+                    projectiles_perdus |= self.abandonner_impacts(monstre)
+
+            # Si le monstre meurt, donner l'argent ET créer une explosion
+            if not monstre.actif and monstre.vie <= 0 and not monstre.recompense_donnee:
+                self.recompenser(monstre)
+                if monstre.impacts_prevus:
+                    projectiles_perdus |= self.abandonner_impacts(monstre)
+
+        # Nettoyer les monstres qui ne sont plus utiles (sur place, rendus au pool).
+        # Un monstre rendu reste inactif jusqu'au prochain tick : les projectiles qui le poursuivaient
+        # le voient mort plus bas et disparaissent avant qu'il ne puisse être recyclé ; ceux dont
+        # l'impact était planifié viennent d'être retirés.
+        compacter(self.liste_monstres, lambda m: m.actif or not m.recompense_donnee, self.pool_monstres)
+        if chrono is not None:
+            chrono.marquer('monstres')
+
+        # Mettre à jour les tours rechargées, dans l'ordre de la liste ; celles qui tirent se rendorment
+        if self.tours_pretes:
+            self.tours_pretes.sort(key=attrgetter('numero'))
+            sans_cible = []
+            for tour in self.tours_pretes:
+                if tour.mettre_a_jour(self):
+                    self.armer_tour(tour)
+                else:
+                    sans_cible.append(tour)
+            self.tours_pretes = sans_cible
+        if chrono is not None:
+            chrono.marquer('tours')
+
+        # Déplacer les projectiles (ou seulement appliquer les impacts prévus pour ce tick)
+        if self.impacts_planifies:
+            projectiles_finis = self.resoudre_impacts() or projectiles_perdus
+        else:
+            for projectile in self.liste_projectiles:
+                projectile.deplacer(self)
+            projectiles_finis = True
+
+        # Nettoyer les projectiles inactifs
+        if projectiles_finis:
+            compacter(self.liste_projectiles, lambda p: p.actif, self.pool_projectiles)
+        if chrono is not None:
+            chrono.marquer('projectiles')
+
+        # Nettoyer les effets terminés (leur fondu est calculé au dessin)
+        if effets_finis:
+            compacter(self.liste_effets, lambda e: e.actif, self.pool_effets)
+        if chrono is not None:
+            chrono.marquer('effets')
+
+        # Mettre à jour les particules (une seule passe vectorisée)
+        self.particules.mettre_a_jour(dt)
+        if chrono is not None:
+            chrono.marquer('particules')
+
+        # Nettoyer les textes terminés (leur montée et leur fondu sont calculés au dessin)
+        if textes_finis:
+            compacter(self.liste_textes_flottants, lambda t: t.actif, self.pool_textes)
+        if chrono is not None:
+            chrono.marquer('textes')
+
+        # Vérifier Game Over
+        if self.vie_base <= 0 or not hero.actif:
+            self.game_over = True
+            if not hero.actif:
+                self.journal("💀 Le héros est mort !")
+            else:
+                self.journal("💀 GAME OVER !")
+
+    def score_final(self):
+        """Score affiché à l'écran de Game Over"""
+        return (self.vague_actuelle - 1) * 100 + self.kills_total * 10 + len(self.liste_tours) * 5
@@ -0,0 +1,157 @@
+import math
+import os
+
+import pygame
+
+# ========================================
+# GESTIONNAIRE DE VOIX
+# ========================================
+
+# Groupe -> nombre de canaux du mixer réservés à ce groupe
+GROUPES = {
+    'tirs': 4,
+    'impacts': 4,
+    'explosions': 4,
+}
+
+# Nom -> (fichier dans assets/sounds, volume, groupe, voix simultanées max, intervalle min entre deux départs en s)
+SONS = {
+    'tir': ("footstep_carpet_001.ogg", 0.3, 'tirs', 3, 0.06),
+    'degats': ("impactSoft_heavy_001.ogg", 0.4, 'impacts', 3, 0.05),
+    'explosion': ("impactMetal_medium_003.ogg", 0.5, 'explosions', 4, 0.08),
+}
+
+# Des événements fusionnés sonnent plus fort, jusqu'à ce facteur du volume de base
+GAIN_FUSION = 0.25  # Par doublement du nombre d'événements fusionnés
+GAIN_FUSION_MAX = 2.0
+
+
+class GestionnaireSons:
+    """Joue les sons de la simulation sur des canaux réservés par groupe, sans saturer le mixer
+
+    Chaque son a un nombre de voix simultanées maximal et un intervalle minimal entre deux
+    départs. Les demandes qui arrivent pendant cet intervalle sont fusionnées en un seul départ,
+    plus fort ; celles qui ne trouvent pas de voix libre sont abandonnées.
+    """
+
+    def __init__(self, sons=SONS, groupes=GROUPES, dossier=os.path.join("assets", "sounds"), decodes=None):
+        # decodes : sons déjà décodés par lire_sons (sinon ils sont lus ici)
+        if decodes is None:
+            decodes = lire_sons(sons, dossier)
+        # Les premiers canaux sont réservés : pygame.mixer.Sound.play() ne les prendra jamais
+        total = sum(groupes.values())
+        pygame.mixer.set_num_channels(max(total, pygame.mixer.get_num_channels()))
+        pygame.mixer.set_reserved(total)
+
+        self.canaux = {}  # Groupe -> canaux du groupe
+        premier = 0
+        for groupe, nombre in groupes.items():
+            self.canaux[groupe] = [pygame.mixer.Channel(i) for i in range(premier, premier + nombre)]
+            premier += nombre
+
+        self.sons = {}
+        self.reglages = {}  # Nom -> (volume, groupe, voix max, intervalle)
+        for nom, (fichier, volume, groupe, voix_max, intervalle) in sons.items():
+            self.sons[nom] = decodes[nom]
+            self.reglages[nom] = (volume, groupe, voix_max, intervalle)
+
+        self.en_attente = dict.fromkeys(self.sons, 0)  # Demandes pas encore jouées
+        self.dernier_depart = dict.fromkeys(self.sons, -math.inf)
+
+        # Compteurs par son
+        self.demandes = dict.fromkeys(self.sons, 0)
+        self.joues = dict.fromkeys(self.sons, 0)
+        self.fusionnes = dict.fromkeys(self.sons, 0)
+        self.abandonnes = dict.fromkeys(self.sons, 0)
+
+    def voix_actives(self, nom):
+        """Nombre de canaux de son groupe qui jouent actuellement ce son"""
+        son = self.sons[nom]
+        groupe = self.reglages[nom][1]
+        return sum(1 for canal in self.canaux[groupe] if canal.get_busy() and canal.get_sound() is son)
+
+    def jouer(self, noms, maintenant):
+        """Reçoit les sons demandés depuis l'appel précédent et lance ceux dont l'intervalle est écoulé
+
+        À appeler une fois par frame (même sans nouvelle demande, pour vider les demandes en attente).
+        """
+        en_attente = self.en_attente
+        for nom in noms:
+            en_attente[nom] += 1
+            self.demandes[nom] += 1
+
+        for nom, nombre in en_attente.items():
+            if nombre == 0:
+                continue
+            volume, groupe, voix_max, intervalle = self.reglages[nom]
+
+            # Trop tôt : les demandes attendent et seront fusionnées avec les suivantes
+            if maintenant - self.dernier_depart[nom] < intervalle:
+                continue
+            en_attente[nom] = 0
+
+            canal = None
+            if self.voix_actives(nom) < voix_max:
+                canal = next((c for c in self.canaux[groupe] if not c.get_busy()), None)
+            if canal is None:
+                self.abandonnes[nom] += nombre
+                continue
+
+            # Plusieurs demandes en un seul départ, un peu plus fort
+            gain = min(1 + GAIN_FUSION * math.log2(nombre), GAIN_FUSION_MAX)
+            canal.set_volume(min(volume * gain, 1.0))
+            canal.play(self.sons[nom])
+            self.dernier_depart[nom] = maintenant
+            self.joues[nom] += 1
+            self.fusionnes[nom] += nombre - 1
+
+    def statistiques(self):
+        """Compteurs par son : demandes, départs, demandes fusionnées et abandonnées"""
+        return {
+            nom: {
+                'demandes': self.demandes[nom],
+                'joues': self.joues[nom],
+                'fusionnes': self.fusionnes[nom],
+                'abandonnes': self.abandonnes[nom],
+            }
+            for nom in self.sons
+        }
+
+
+def initialiser_mixer():
+    """Démarre le mixer (thread principal) ; False si le son n'est pas disponible"""
+    try:
+        pygame.mixer.init()
+        return True
+    except pygame.error:
+        return False
+
+
+def lire_sons(sons=SONS, dossier=os.path.join("assets", "sounds")):
+    """Décode les fichiers des sons, sans toucher aux canaux (possible hors du thread principal)
+
+    Le mixer doit déjà être initialisé. Retourne {nom: pygame.mixer.Sound}.
+    """
+    return {nom: pygame.mixer.Sound(os.path.join(dossier, fichier)) for nom, (fichier, *_) in sons.items()}
+
+
+def lire_sons_disponibles():
+    """lire_sons(), ou None si le mixer n'a pas démarré ou qu'un fichier manque"""
+    if not pygame.mixer.get_init():
+        return None
+    try:
+        return lire_sons()
+    except (pygame.error, FileNotFoundError):
+        return None
+
+
+def finaliser_sons(decodes):
+    """Gestionnaire des sons lus par lire_sons_disponibles (thread principal : réserve les canaux) ; None sans son"""
+    return GestionnaireSons(decodes=decodes) if decodes is not None else None
+
+
+def charger_sons():
+    """Initialise le mixer et charge les sons ; None si le son n'est pas disponible"""
+    if not initialiser_mixer():
+        return None
+    return finaliser_sons(lire_sons_disponibles())
@@ -0,0 +1,76 @@
+from collections import OrderedDict
+
+import pygame
+
+# ========================================
+# POLICES ET CACHE DE TEXTES
+# ========================================
+
+polices = {}
+
+
+def obtenir_police(taille):
+    """Retourne la police par défaut à la taille demandée (créée une seule fois)"""
+    police = polices.get(taille)
+    if police is None:
+        police = polices[taille] = pygame.font.Font(None, taille)
+    return police
+
+
+class CacheTextes:
+    """Cache LRU des surfaces de texte rendues, borné en nombre d'entrées et en mémoire"""
+
+    def __init__(self, capacite=512, octets_max=16 * 1024 * 1024):
+        self.capacite = capacite
+        self.octets_max = octets_max
+        self.surfaces = OrderedDict()  # (texte, taille, couleur, antialias) -> surface
+        self.octets = 0
+
+        # Compteurs pour régler la taille du cache
+        self.succes = 0
+        self.echecs = 0
+        self.evictions = 0
+
+    def rendre(self, texte, taille, couleur, antialias=True):
+        """Retourne la surface du texte, en la rendant seulement si elle n'est pas en cache"""
+        cle = (texte, taille, couleur, antialias)
+        surface = self.surfaces.get(cle)
+        if surface is not None:
+            self.surfaces.move_to_end(cle)
+            self.succes += 1
+            return surface
+
+        self.echecs += 1
+        surface = obtenir_police(taille).render(texte, antialias, couleur)
+        self.surfaces[cle] = surface
+        self.octets += self.poids(surface)
+
+        # Éviction des textes les moins récemment utilisés
+        while len(self.surfaces) > 1 and (len(self.surfaces) > self.capacite or self.octets > self.octets_max):
+            _, ancienne = self.surfaces.popitem(last=False)
+            self.octets -= self.poids(ancienne)
+            self.evictions += 1
+
+        return surface
+
+    @staticmethod
+    def poids(surface):
+        """Taille approximative en mémoire d'une surface (octets)"""
+        return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+    def vider(self):
+        """Vide le cache (les compteurs sont conservés)"""
+        self.surfaces.clear()
+        self.octets = 0
+
+    def statistiques(self):
+        """Compteurs du cache : succès, échecs, évictions, entrées et mémoire utilisée"""
+        total = self.succes + self.echecs
+        return {
+            'succes': self.succes,
+            'echecs': self.echecs,
+            'evictions': self.evictions,
+            'taux_succes': self.succes / total if total else 0.0,
+            'entrees': len(self.surfaces),
+            'octets': self.octets,
+        }
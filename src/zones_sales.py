@@ -0,0 +1,96 @@
+import numpy as np
+import pygame
+
+# ========================================
+# ZONES SALES (RENDU PARTIEL)
+# ========================================
+
+class ZonesSales:
+    """Grille de tuiles marquant les zones de l'écran à redessiner pendant la frame"""
+
+    def __init__(self, largeur, hauteur, taille_tuile=32):
+        self.largeur = largeur
+        self.hauteur = hauteur
+        self.taille_tuile = taille_tuile
+        self.colonnes = -(-largeur // taille_tuile)
+        self.lignes = -(-hauteur // taille_tuile)
+        self.masque = np.zeros((self.lignes, self.colonnes), dtype=bool)
+
+    def effacer(self):
+        """Aucune zone sale"""
+        self.masque[:] = False
+
+    def tuiles(self, rect):
+        """Plage de tuiles (colonnes, lignes) couverte par un rectangle, ou None s'il est hors écran"""
+        x0 = max(rect.left, 0)
+        y0 = max(rect.top, 0)
+        x1 = min(rect.right, self.largeur)
+        y1 = min(rect.bottom, self.hauteur)
+        if x0 >= x1 or y0 >= y1:
+            return None
+        t = self.taille_tuile
+        return x0 // t, (x1 - 1) // t + 1, y0 // t, (y1 - 1) // t + 1
+
+    def marquer(self, rect):
+        """Marque comme sales toutes les tuiles touchées par le rectangle"""
+        plage = self.tuiles(rect)
+        if plage is not None:
+            c0, c1, l0, l1 = plage
+            self.masque[l0:l1, c0:c1] = True
+
+    def marquer_boites(self, gauche, haut, droite, bas):
+        """Marque des boîtes plus petites qu'une tuile (tableaux NumPy, une boîte par élément)"""
+        if len(gauche) == 0:
+            return
+        t = self.taille_tuile
+        c0 = np.clip(gauche // t, 0, self.colonnes - 1).astype(np.intp)
+        c1 = np.clip((droite - 1) // t, 0, self.colonnes - 1).astype(np.intp)
+        l0 = np.clip(haut // t, 0, self.lignes - 1).astype(np.intp)
+        l1 = np.clip((bas - 1) // t, 0, self.lignes - 1).astype(np.intp)
+        # Une boîte plus petite qu'une tuile touche au plus ses quatre coins
+        self.masque[l0, c0] = True
+        self.masque[l0, c1] = True
+        self.masque[l1, c0] = True
+        self.masque[l1, c1] = True
+
+    def contient(self, rect):
+        """True si le rectangle est entièrement couvert par des tuiles sales"""
+        plage = self.tuiles(rect)
+        if plage is None:
+            return True
+        c0, c1, l0, l1 = plage
+        return bool(self.masque[l0:l1, c0:c1].all())
+
+    def proportion(self):
+        """Part de l'écran à redessiner (0 à 1)"""
+        return float(self.masque.mean())
+
+    def rectangles(self):
+        """Fusionne les tuiles sales en rectangles disjoints (segments par ligne, prolongés vers le bas)"""
+        t = self.taille_tuile
+        termines = []
+        ouverts = {}  # (colonne début, colonne fin) -> [ligne début, nombre de lignes]
+
+        for ligne in range(self.lignes):
+            rangee = self.masque[ligne]
+            segments = set()
+            if rangee.any():
+                bords = np.flatnonzero(np.diff(np.concatenate(([False], rangee, [False])).astype(np.int8)))
+                segments = set(zip(bords[0::2].tolist(), bords[1::2].tolist()))
+
+            for segment in list(ouverts):
+                if segment in segments:
+                    ouverts[segment][1] += 1
+                    segments.discard(segment)
+                else:
+                    termines.append((segment, ouverts.pop(segment)))
+            for segment in segments:
+                ouverts[segment] = [ligne, 1]
+
+        termines.extend(ouverts.items())
+
+        rects = []
+        for (c0, c1), (l0, hauteur) in termines:
+            rect = pygame.Rect(c0 * t, l0 * t, (c1 - c0) * t, hauteur * t)
+            rects.append(rect.clip(0, 0, self.largeur, self.hauteur))
+        return rects
@@ -0,0 +1,18 @@
+import os
+import sys
+
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+RACINE = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(RACINE, "src"))
+os.chdir(RACINE)  # Les ressources sont chargées avec des chemins relatifs à la racine
+
+
+@pytest.fixture(scope="session")
+def carte_tmx():
+    """Carte logique (sans images), chargée une seule fois pour tous les tests"""
+    from carte import charger_carte_logique
+    return charger_carte_logique()
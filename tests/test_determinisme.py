@@ -0,0 +1,120 @@
+import heapq
+import random
+
+import pytest
+
+from equilibrage import direction_vers, preparer_emplacements
+from planificateur import CASES, NIVEAUX, Planificateur
+from rejeu import Enregistreur, Rejeu, empreinte_etat, rejouer
+from sauvegarde import capturer, restaurer
+from simulation import EtatJeu
+
+# ========================================
+# PARTIE SCRIPTÉE
+# ========================================
+
+def poser_tour(etat, type_tour):
+    """Pose la tour sur l'emplacement libre qui couvre le plus de chemin ; retourne True si elle est payée"""
+    x, y = next(position for position in preparer_emplacements(etat)[0] if etat.verifier_position_valide(*position))
+    return etat.placer_tour(x, y, type_tour)
+
+
+@pytest.fixture(scope="module")
+def poste(carte_tmx):
+    """Poste de tir du héros, hors de portée de contact des monstres"""
+    return preparer_emplacements(EtatJeu(carte_tmx))[1]
+
+
+def jouer(etat, ticks, poste):
+    """Joueur scripté : relance les vagues et mène le héros à son poste de tir"""
+    for _ in range(ticks):
+        if not etat.vague_en_cours:
+            etat.demarrer_vague()
+        etat.avancer(direction_vers(etat.hero, poste))
+
+
+def nouvelle_partie(carte_tmx, impacts_planifies, enregistrer=False):
+    """Partie avec quelques tours des deux types, enregistrée si demandé"""
+    etat = EtatJeu(carte_tmx, graine=1234, impacts_planifies=impacts_planifies)
+    if enregistrer:
+        etat.enregistreur = Enregistreur(1234)
+    for type_tour in ('canon', 'canon', 'laser'):
+        assert poser_tour(etat, type_tour)
+    return etat
+
+# ========================================
+# REJEUX
+# ========================================
+
+@pytest.mark.parametrize("impacts_planifies", [False, True])
+def test_rejeu_identique_a_la_partie(carte_tmx, poste, impacts_planifies):
+    etat = nouvelle_partie(carte_tmx, impacts_planifies, enregistrer=True)
+    jouer(etat, 3000, poste)
+    # Entrées notées après le dernier tick (tour posée puis fenêtre fermée dans la même frame)
+    assert poser_tour(etat, 'canon')
+    etat.changer_priorite()
+
+    rejeu = Rejeu(etat.enregistreur.encoder(etat))
+    rejoue, divergence = rejouer(rejeu, carte_tmx)
+
+    assert divergence is None
+    assert empreinte_etat(rejoue) == empreinte_etat(etat)
+
+# ========================================
+# SAUVEGARDES
+# ========================================
+
+@pytest.mark.parametrize("impacts_planifies", [False, True])
+def test_sauvegarde_puis_reprise_identique(carte_tmx, poste, impacts_planifies):
+    etat = nouvelle_partie(carte_tmx, impacts_planifies)
+    jouer(etat, 2000, poste)
+    while not any(projectile.actif for projectile in etat.liste_projectiles):
+        jouer(etat, 1, poste)  # Sauvegarde avec des projectiles en vol (et des impacts planifiés)
+    corps = capturer(etat)
+    jouer(etat, 1500, poste)
+    attendue = empreinte_etat(etat)
+
+    # Dans une nouvelle partie
+    reprise = EtatJeu(carte_tmx)
+    restaurer(reprise, corps)
+    assert capturer(reprise) == corps
+    jouer(reprise, 1500, poste)
+    assert empreinte_etat(reprise) == attendue
+
+    # Dans la partie d'origine, qui a continué entre-temps
+    restaurer(etat, corps)
+    jouer(etat, 1500, poste)
+    assert empreinte_etat(etat) == attendue
+
+# ========================================
+# ROUE DE MINUTEURS
+# ========================================
+
+def test_planificateur_identique_a_un_tas():
+    rng = random.Random(7)
+    planificateur = Planificateur()
+    tas = []
+    numero = 0
+    tick = 0
+    horizon = CASES ** (NIVEAUX - 1) * 2  # Assez loin pour faire redescendre les trois niveaux supérieurs
+
+    while tick < horizon:
+        # Événements du passé (ramenés au tick suivant), proches et lointains
+        for _ in range(rng.randrange(4)):
+            echeance = tick + rng.choice((-5, 0, 1, rng.randrange(CASES), rng.randrange(horizon)))
+            planificateur.planifier(echeance, numero)
+            heapq.heappush(tas, (max(echeance, tick + 1), numero))
+            numero += 1
+
+        tick += rng.choice((1, 1, 7, CASES, 5000))
+        attendus = {}
+        while tas and tas[0][0] <= tick:
+            echeance, numero_echu = heapq.heappop(tas)
+            attendus[numero_echu] = echeance
+
+        # Mêmes événements, rendus par tick croissant (l'ordre au sein d'un même tick n'est pas garanti)
+        echus = planificateur.echeances(tick)
+        assert sorted(echus) == sorted(attendus)
+        ticks_echus = [attendus[numero_echu] for numero_echu in echus]
+        assert ticks_echus == sorted(ticks_echus)
+        assert len(planificateur) == len(tas)